@@ -0,0 +1,196 @@
+# backtesting/engine/event_feed.py
+"""
+Point-in-time replay of institutional data for backtests.
+
+Every dataset (FII/DII flows, block deals, bulk deals, OI changes) is read by
+a generator that yields MarketEvents in time order from local storage, and
+EventFeed merges them lazily with heapq.merge. A multi-year replay therefore
+holds one pending event per source in memory instead of every dataset.
+
+Events are stamped with the time the data became public rather than the
+trade date (see AVAILABLE_AT), so a strategy consuming the feed up to a
+decision time only sees what it could have known then.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from datetime import timedelta
+import csv
+import heapq
+import logging
+
+import pandas as pd
+
+from data.fii_dii_store import FiiDiiStore
+from data.block_deal_store import BlockDealStore
+
+logger = logging.getLogger(__name__)
+
+# Publication time of each dataset relative to the trade date (IST)
+AVAILABLE_AT = {
+    'block_deal': timedelta(hours=15, minutes=30),
+    'oi': timedelta(hours=16),
+    'bulk_deal': timedelta(hours=17),
+    'fii_dii': timedelta(hours=20),
+}
+
+
+class MarketEvent(NamedTuple):
+    ts: pd.Timestamp                 # when the data became public
+    kind: str                        # 'fii_dii', 'block_deal', 'bulk_deal', 'oi'
+    symbol: Optional[str]            # None for market-wide data
+    data: Dict[str, Any]
+
+
+def fii_dii_events(store: FiiDiiStore, start=None, end=None, segment: str = 'cash',
+                   available_at: Optional[timedelta] = None) -> Iterator[MarketEvent]:
+    """
+    FII/DII flow events from the columnar store, read straight off its
+    memory-mapped columns.
+    """
+    offset = AVAILABLE_AT['fii_dii'] if available_at is None else available_at
+    columns = store.range(start, end, segment)
+    for day, fii_net, dii_net in zip(columns['date'], columns['fii_net'], columns['dii_net']):
+        day = pd.Timestamp(day)
+        yield MarketEvent(day + offset, 'fii_dii', None, {
+            'date': day, 'segment': segment,
+            'fii_net': float(fii_net), 'dii_net': float(dii_net)})
+
+
+def block_deal_events(store: BlockDealStore, start=None, end=None,
+                      available_at: Optional[timedelta] = None) -> Iterator[MarketEvent]:
+    """Block-deal events from the block-deal store, one trading day at a time."""
+    offset = AVAILABLE_AT['block_deal'] if available_at is None else available_at
+    for deal in store.iter_by_date(start, end):
+        yield MarketEvent(deal['date'] + offset, 'block_deal', deal['symbol'], deal)
+
+
+def _coerce(value: str) -> Any:
+    try:
+        return float(value.replace(',', ''))
+    except (AttributeError, ValueError):
+        return value
+
+
+def csv_events(path: str, kind: str, date_column: str = 'date',
+               symbol_column: Optional[str] = 'symbol', date_format: Optional[str] = None,
+               available_at: Optional[timedelta] = None) -> Iterator[MarketEvent]:
+    """
+    Events from a date-sorted CSV file (e.g. NSE bulk-deal or OI-change
+    downloads), read row by row.
+
+    Args:
+        path (str): CSV file with a header row.
+        kind (str): Event kind, e.g. 'bulk_deal' or 'oi'.
+        date_column (str): Trade date column.
+        symbol_column (str, optional): Symbol column; None for market-wide data.
+        date_format (str, optional): strptime format of the dates; inferred if None.
+        available_at (timedelta, optional): Publication time after the trade
+            date; defaults to AVAILABLE_AT[kind].
+
+    Raises:
+        ValueError: If the file is not sorted by date; replaying it would
+            leak later rows ahead of earlier ones.
+    """
+    offset = AVAILABLE_AT.get(kind, timedelta(0)) if available_at is None else available_at
+    previous = None
+    with open(path, newline='') as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            day = pd.to_datetime(row[date_column].strip(), format=date_format)
+            if previous is not None and day < previous:
+                raise ValueError(f"{path}:{line}: rows must be sorted by {date_column}")
+            previous = day
+            data = {key: _coerce(value) for key, value in row.items()}
+            data[date_column] = day
+            symbol = row[symbol_column].strip() if symbol_column else None
+            yield MarketEvent(day + offset, kind, symbol, data)
+
+
+class EventFeed:
+    """
+    Time-ordered merge of event sources. Events with equal timestamps keep
+    the order of the sources passed in. Like its sources, a feed is consumed
+    once.
+    """
+
+    def __init__(self, sources: Iterable[Iterable[MarketEvent]]):
+        self._events = heapq.merge(*sources, key=lambda event: event.ts)
+        self._pending: Optional[MarketEvent] = None
+
+    def __iter__(self) -> Iterator[MarketEvent]:
+        return self
+
+    def __next__(self) -> MarketEvent:
+        if self._pending is not None:
+            event, self._pending = self._pending, None
+            return event
+        return next(self._events)
+
+    def advance(self, until: pd.Timestamp) -> List[MarketEvent]:
+        """
+        Consume and return every event public strictly before `until`.
+
+        Args:
+            until (pd.Timestamp): Decision time.
+
+        Returns:
+            list: Events in time order; later events stay in the feed.
+        """
+        events = []
+        for event in self:
+            if event.ts >= until:
+                self._pending = event
+                break
+            events.append(event)
+        return events
+
+
+def institutional_feed(start=None, end=None, fii_store: Optional[FiiDiiStore] = None,
+                       deal_store: Optional[BlockDealStore] = None,
+                       bulk_deals_csv: Optional[str] = None, oi_csv: Optional[str] = None,
+                       segment: str = 'cash',
+                       csv_options: Optional[Dict[str, Dict[str, Any]]] = None) -> EventFeed:
+    """
+    Feed over the local institutional datasets between `start` and `end`.
+
+    Args:
+        start, end (date-like, optional): Trade date bounds of the stores.
+        fii_store (FiiDiiStore, optional): Defaults to NSDL_CONFIG['store_path'].
+        deal_store (BlockDealStore, optional): Defaults to data/nse/block_deals.sqlite.
+        bulk_deals_csv (str, optional): Date-sorted bulk-deal CSV to include.
+        oi_csv (str, optional): Date-sorted OI-change CSV to include.
+        segment (str): FII/DII segment.
+        csv_options (dict, optional): Extra csv_events() arguments keyed by
+            'bulk_deal' / 'oi' (e.g. column names of NSE downloads).
+
+    Returns:
+        EventFeed: Merged feed.
+    """
+    if fii_store is None:
+        from config.nsdl_config import NSDL_CONFIG
+        fii_store = FiiDiiStore(NSDL_CONFIG['store_path'])
+    if deal_store is None:
+        deal_store = BlockDealStore()
+    csv_options = csv_options or {}
+    sources: List[Iterable[MarketEvent]] = [
+        fii_dii_events(fii_store, start, end, segment),
+        block_deal_events(deal_store, start, end),
+    ]
+    for kind, path in (('bulk_deal', bulk_deals_csv), ('oi', oi_csv)):
+        if path:
+            options = csv_options.get(kind, {})
+            events = csv_events(path, kind, **options)
+            sources.append(_bounded(events, start, end, options.get('date_column', 'date')))
+    return EventFeed(sources)
+
+
+def _bounded(events: Iterator[MarketEvent], start, end,
+             date_column: str) -> Iterator[MarketEvent]:
+    """Restrict a date-sorted CSV source to [start, end] trade dates."""
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+    for event in events:
+        day = event.data[date_column]
+        if start is not None and day < start:
+            continue
+        if end is not None and day > end:
+            return
+        yield event
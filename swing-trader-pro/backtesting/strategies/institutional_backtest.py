@@ -1,6 +1,9 @@
 # backtesting/strategies/institutional_backtest.py
+from typing import Any, Dict, List, Optional
+from collections import deque
+from datetime import timedelta
 import pandas as pd
-from strategies.institutional import InstitutionalFlowStrategy
+from backtesting.engine.event_feed import EventFeed, MarketEvent
 
 
 class InstitutionalBacktester:
@@ -42,3 +45,118 @@ class HedgingAdjuster:
             trade['pnl'] *= 0.7  # 30% penalty
             trade['holding_period'] *= 1.5
         return trade
+
+# method 3 final version
+
+
+# Decisions for a session are taken before its open, on data public by then
+MARKET_OPEN = timedelta(hours=9, minutes=15)
+
+
+class InstitutionalBacktester:
+    """
+    Backtests InstitutionalStrategy on daily bars against a point-in-time
+    replay of institutional data (backtesting/engine/event_feed.py).
+    """
+
+    def __init__(self, strategy=None, flow_window: int = 3, holding_days: int = 3):
+        """
+        Args:
+            strategy: Object with analyze(snapshot) -> signal dict or None.
+                Defaults to InstitutionalStrategy in simple flow mode.
+            flow_window (int): Sessions summed into fii_flows['net_3day'] and
+                kept in the recent block/bulk deal lists.
+            holding_days (int): Holding period for signals without
+                'validity_days'.
+        """
+        if strategy is None:
+            from strategies.institutional.fii_dii_flow import InstitutionalStrategy
+            strategy = InstitutionalStrategy(use_hedge_detection=False)
+        self.strategy = strategy
+        self.flow_window = flow_window
+        self.holding_days = holding_days
+
+    def backtest(self, historical_data: pd.DataFrame, feed: EventFeed,
+                 symbol: Optional[str] = None) -> pd.DataFrame:
+        """
+        Replay `feed` alongside daily bars: before each session's open the
+        strategy sees the institutional data published so far, and a signal
+        is entered at that open.
+
+        Args:
+            historical_data (pd.DataFrame): Daily bars with 'date', 'open',
+                'close'.
+            feed (EventFeed): Institutional events, e.g. institutional_feed().
+            symbol (str, optional): Instrument traded; selects its block/bulk
+                deals and OI changes. Market-wide data is always used.
+
+        Returns:
+            pd.DataFrame: One row per trade (entry/exit dates, pnl, pnl_pct,
+            reason).
+        """
+        bars = historical_data.sort_values('date').reset_index(drop=True)
+        dates = pd.to_datetime(bars['date'])
+        state = {
+            'fii_net': None,
+            'dii_net': None,
+            'flows': deque(maxlen=self.flow_window),
+            'deals': deque(),
+            'oi_changes': {},
+        }
+        results = []
+        for i in range(1, len(bars)):
+            session = dates.iloc[i].normalize()
+            for event in feed.advance(session + MARKET_OPEN):
+                self._apply(state, event, symbol)
+            # Deals stay visible for the last flow_window sessions
+            cutoff = dates.iloc[max(0, i - self.flow_window)].normalize()
+            while state['deals'] and state['deals'][0][0] < cutoff:
+                state['deals'].popleft()
+            if state['fii_net'] is None:
+                continue
+            signal = self.strategy.analyze(self._snapshot(state, bars.iloc[i - 1], symbol))
+            if signal:
+                results.append(self._simulate_trade(bars, i, signal))
+        return pd.DataFrame(results)
+
+    @staticmethod
+    def _apply(state: Dict[str, Any], event: MarketEvent, symbol: Optional[str]) -> None:
+        """Fold one event into the point-in-time state."""
+        if event.kind == 'fii_dii':
+            state['fii_net'] = event.data['fii_net']
+            state['dii_net'] = event.data['dii_net']
+            state['flows'].append(event.data['fii_net'])
+        elif event.symbol is not None and event.symbol != symbol:
+            return
+        elif event.kind in ('block_deal', 'bulk_deal'):
+            state['deals'].append((event.ts, event.kind, event.data))
+        elif event.kind == 'oi':
+            state['oi_changes'] = event.data
+
+    def _snapshot(self, state: Dict[str, Any], bar: pd.Series,
+                  symbol: Optional[str]) -> Dict[str, Any]:
+        return {
+            'symbol': symbol,
+            'date': bar['date'],
+            'close': bar['close'],
+            'fii_net': state['fii_net'],
+            'dii_net': state['dii_net'],
+            'fii_flows': {'net_3day': sum(state['flows'])},
+            'oi_changes': state['oi_changes'],
+            'block_deals': [data for _, kind, data in state['deals'] if kind == 'block_deal'],
+            'bulk_deals': [data for _, kind, data in state['deals'] if kind == 'bulk_deal'],
+        }
+
+    def _simulate_trade(self, bars: pd.DataFrame, entry_idx: int,
+                        signal: Dict[str, Any]) -> Dict[str, Any]:
+        holding = signal.get('validity_days', self.holding_days)
+        exit_idx = min(entry_idx + holding, len(bars) - 1)
+        entry_price = bars.iloc[entry_idx]['open']
+        exit_price = bars.iloc[exit_idx]['close']
+        return {
+            'entry_date': bars.iloc[entry_idx]['date'],
+            'exit_date': bars.iloc[exit_idx]['date'],
+            'pnl': exit_price - entry_price,
+            'pnl_pct': (exit_price - entry_price) / entry_price,
+            'reason': signal.get('reason'),
+        }
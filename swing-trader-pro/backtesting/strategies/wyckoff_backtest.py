@@ -1,7 +1,8 @@
 # backtesting/strategies/wyckoff_backtest.py
 from typing import List, Dict, Optional, Any
+import numpy as np
 import pandas as pd
-from strategies.wyckoff import WyckoffAccumulationStrategy
+from strategies.wyckoff.accumulation import WyckoffAccumulationStrategy
 
 
 class WyckoffBacktester:
@@ -81,17 +82,22 @@ class WyckoffBacktester:
 
         results: List[Dict[str, Any]] = []
 
-        for i in range(lookback, len(historical_data)):
-            window = historical_data.iloc[i - lookback:i]
-            signal = self.strategy.analyze(window)
-
-            if signal:
-                trade = self._simulate_trade(
-                    historical_data.iloc[i:],
-                    signal
-                )
-                if trade:
-                    results.append(trade)
+        # A window shorter than the analyzer's never produces a signal
+        if lookback < self.strategy.analyzer.window:
+            return pd.DataFrame(results)
+
+        # Signals for every bar in one pass; the signal for bar i is the one
+        # computed on the window ending at bar i-1.
+        signals = self.strategy.analyze_series(historical_data)
+        for i in np.flatnonzero(signals['signal'][lookback - 1:-1]) + lookback:
+            signal = {key: signals[key][i - 1]
+                      for key in ('entry', 'sl', 'target', 'score')}
+            trade = self._simulate_trade(
+                historical_data.iloc[i:],
+                signal
+            )
+            if trade:
+                results.append(trade)
 
         return pd.DataFrame(results)
 
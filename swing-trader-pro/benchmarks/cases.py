@@ -0,0 +1,142 @@
+# benchmarks/cases.py
+"""
+Benchmark cases for the hot paths of the daily cycle and backtests.
+
+Each case builds its inputs in `setup` (not timed) and returns a zero-argument
+callable that is timed by the harness. Cases import their targets lazily so a
+missing optional dependency (e.g. TA-Lib) skips the case instead of failing
+the whole run.
+"""
+from typing import Callable, Dict, Any, List
+import importlib
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+
+# Time-series cases replay every bar, so cap how many symbols they walk
+BACKTEST_MAX_SYMBOLS = 5
+MONTE_CARLO_SIMS_PER_SYMBOL = 20
+MONTE_CARLO_MAX_SIMS = 10000
+TRADES_PER_SYMBOL_YEAR = 24
+
+
+def _load(module_path: str, attr: str):
+    """Import `attr` from a module path (supports the numbered phase packages)."""
+    return getattr(importlib.import_module(module_path), attr)
+
+
+class BenchmarkCase:
+    """
+    A named benchmark with a setup step and the modules it depends on.
+    """
+
+    def __init__(self, name: str, setup: Callable[[int, int], Callable[[], Any]],
+                 description: str = ""):
+        """
+        Args:
+            name (str): Case name used in result keys.
+            setup (callable): Accepts (n_symbols, years) and returns the timed callable.
+            description (str): Human readable description.
+        """
+        self.name = name
+        self.setup = setup
+        self.description = description
+
+    def case_id(self, n_symbols: int, years: int) -> str:
+        return f"{self.name}[{n_symbols}x{years}y]"
+
+
+def _setup_quant_screen(n_symbols: int, years: int) -> Callable[[], Any]:
+    QuantitativeScreener = _load(
+        'phases.morning_screening.quant_screener', 'QuantitativeScreener')
+    panel = synthetic.generate_panel(n_symbols, years)
+    # Record arrays give both len() in bars and ndarray columns, which is
+    # what the screener indexes positionally.
+    records = {
+        symbol: np.rec.fromarrays(
+            [panel['close'][i], panel['volume'][i]], names='close,volume')
+        for i, symbol in enumerate(panel['symbols'])
+    }
+    screener = QuantitativeScreener(data_fetcher=records.get)
+    universe = panel['symbols']
+    return lambda: screener.screen(universe)
+
+
+def _setup_trend_classify(n_symbols: int, years: int) -> Callable[[], Any]:
+    TrendClassifier = _load(
+        'phases.2_signal_generation.trend_classifier', 'TrendClassifier')
+    panel = synthetic.generate_panel(n_symbols, years)
+    classifier = TrendClassifier()
+    inputs = [
+        {'symbol': symbol, 'close': panel['close'][i],
+            'volume': panel['volume'][i]}
+        for i, symbol in enumerate(panel['symbols'])
+    ]
+
+    def run():
+        return [classifier.classify(d) for d in inputs]
+    return run
+
+
+def _setup_trend_classify_many(n_symbols: int, years: int) -> Callable[[], Any]:
+    TrendClassifier = _load(
+        'phases.2_signal_generation.trend_classifier', 'TrendClassifier')
+    panel = synthetic.generate_panel(n_symbols, years)
+    classifier = TrendClassifier()
+
+    def run():
+        return classifier.classify_many(panel)
+    return run
+
+
+def _setup_wyckoff_backtest(n_symbols: int, years: int) -> Callable[[], Any]:
+    WyckoffBacktester = _load(
+        'backtesting.strategies.wyckoff_backtest', 'WyckoffBacktester')
+    panel = synthetic.generate_panel(
+        min(n_symbols, BACKTEST_MAX_SYMBOLS), years)
+    frames = [frame for _, frame in synthetic.iter_symbol_frames(panel)]
+    backtester = WyckoffBacktester()
+
+    def run():
+        return [backtester.backtest(frame) for frame in frames]
+    return run
+
+
+def _setup_monte_carlo(n_symbols: int, years: int) -> Callable[[], Any]:
+    MonteCarloSimulator = _load(
+        'backtesting.engine.monte_carlo', 'MonteCarloSimulator')
+    panel = synthetic.generate_panel(1, years)
+    returns = pd.Series(np.diff(np.log(panel['close'][0])))
+    simulator = MonteCarloSimulator(returns)
+    n_sims = min(n_symbols * MONTE_CARLO_SIMS_PER_SYMBOL, MONTE_CARLO_MAX_SIMS)
+    periods = years * synthetic.TRADING_DAYS_PER_YEAR
+    return lambda: simulator.run_simulation(
+        n_sims=n_sims, periods=periods, random_seed=1)
+
+
+def _setup_performance_analyze(n_symbols: int, years: int) -> Callable[[], Any]:
+    PerformanceAnalyzer = _load(
+        'phases.4_reporting.performance_analyzer', 'PerformanceAnalyzer')
+    trades = synthetic.generate_trades(
+        n_symbols * years * TRADES_PER_SYMBOL_YEAR, years)
+    analyzer = PerformanceAnalyzer()
+    return lambda: analyzer.analyze(trades)
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase('quant_screen', _setup_quant_screen,
+                  "QuantitativeScreener.screen over the universe"),
+    BenchmarkCase('trend_classify', _setup_trend_classify,
+                  "TrendClassifier.classify once per symbol"),
+    BenchmarkCase('trend_classify_many', _setup_trend_classify_many,
+                  "TrendClassifier.classify_many over the whole panel"),
+    BenchmarkCase('wyckoff_backtest', _setup_wyckoff_backtest,
+                  "WyckoffBacktester.backtest per symbol (capped symbols)"),
+    BenchmarkCase('monte_carlo', _setup_monte_carlo,
+                  "MonteCarloSimulator.run_simulation, sims scale with symbols"),
+    BenchmarkCase('performance_analyze', _setup_performance_analyze,
+                  "PerformanceAnalyzer.analyze over synthetic trades"),
+]
+
+CASES_BY_NAME: Dict[str, BenchmarkCase] = {case.name: case for case in CASES}
@@ -0,0 +1,210 @@
+# benchmarks/harness.py
+"""
+Measurement, persistence and regression checks for the benchmark suite.
+
+Every case runs in a freshly spawned interpreter so that peak RSS belongs to
+that case alone. Wall time is measured with tracing off; allocations are
+measured in a separate pass under tracemalloc because tracing distorts timing.
+"""
+from typing import Dict, Any, List, Optional
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIME_TOLERANCE = 0.15  # 15% slower than baseline is a regression
+DEFAULT_MEMORY_TOLERANCE = 0.20
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return peak / divisor
+
+
+def measure(case_name: str, n_symbols: int, years: int,
+            repeat: int = 5, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Measure one case in the current process.
+
+    Args:
+        case_name (str): Name of a case in benchmarks.cases.CASES_BY_NAME.
+        n_symbols (int): Universe size.
+        years (int): Years of history.
+        repeat (int): Timed repetitions.
+        warmup (int): Untimed repetitions before timing.
+
+    Returns:
+        dict: Metrics for the case, or a 'skipped' record if a dependency is missing.
+    """
+    from benchmarks.cases import CASES_BY_NAME
+
+    case = CASES_BY_NAME[case_name]
+    try:
+        run = case.setup(n_symbols, years)
+    except ImportError as e:
+        return {'status': 'skipped', 'reason': f"missing dependency: {e}"}
+
+    for _ in range(warmup):
+        run()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    run()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks_retained = sys.getallocatedblocks() - blocks_before
+
+    return {
+        'status': 'ok',
+        'repeat': repeat,
+        'wall_min_s': min(timings),
+        'wall_median_s': statistics.median(timings),
+        'wall_mean_s': statistics.fmean(timings),
+        'peak_rss_mb': round(_peak_rss_mb(), 2),
+        'alloc_peak_mb': round(alloc_peak / (1024 * 1024), 3),
+        'alloc_blocks_retained': blocks_retained,
+    }
+
+
+def _measure_in_child(queue, *args):
+    try:
+        queue.put(measure(*args))
+    except Exception as e:
+        queue.put({'status': 'error', 'reason': f"{type(e).__name__}: {e}"})
+
+
+def measure_isolated(case_name: str, n_symbols: int, years: int,
+                     repeat: int = 5, warmup: int = 1,
+                     timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run measure() in a spawned child process so peak RSS is per case.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure_in_child,
+                       args=(queue, case_name, n_symbols, years, repeat, warmup))
+    proc.start()
+    try:
+        result = queue.get(timeout=timeout)
+    except Exception:
+        proc.terminate()
+        result = {'status': 'error', 'reason': f"timed out after {timeout}s"}
+    proc.join()
+    return result
+
+
+def run_suite(case_names: List[str], grid: List[tuple], repeat: int = 5,
+              warmup: int = 1, isolate: bool = True,
+              timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run the selected cases across a (n_symbols, years) grid.
+
+    Returns:
+        dict: {'meta': {...}, 'results': {case_id: metrics}}
+    """
+    from benchmarks.cases import CASES_BY_NAME
+
+    results = {}
+    for name in case_names:
+        case = CASES_BY_NAME[name]
+        for n_symbols, years in grid:
+            case_id = case.case_id(n_symbols, years)
+            logger.info(f"Running {case_id}")
+            if isolate:
+                metrics = measure_isolated(
+                    name, n_symbols, years, repeat, warmup, timeout)
+            else:
+                metrics = measure(name, n_symbols, years, repeat, warmup)
+            metrics.update({'case': name, 'symbols': n_symbols, 'years': years})
+            results[case_id] = metrics
+            if metrics['status'] == 'ok':
+                logger.info(
+                    f"{case_id}: median {metrics['wall_median_s']:.4f}s, "
+                    f"peak RSS {metrics['peak_rss_mb']}MB")
+            else:
+                logger.warning(f"{case_id}: {metrics['status']} ({metrics['reason']})")
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def save_results(report: Dict[str, Any], path: str) -> str:
+    """Write a suite report as JSON, creating parent directories."""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any],
+            time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+            memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Compare a report against a baseline report.
+
+    Args:
+        report (dict): Current run from run_suite().
+        baseline (dict): Previous run to compare against.
+        time_tolerance (float): Allowed relative slowdown of median wall time.
+        memory_tolerance (float): Allowed relative growth of peak RSS.
+
+    Returns:
+        list: One entry per regressed metric with baseline, current and ratio.
+    """
+    regressions = []
+    base_results = baseline.get('results', {})
+    for case_id, current in report.get('results', {}).items():
+        base = base_results.get(case_id)
+        if not base or base.get('status') != 'ok' or current.get('status') != 'ok':
+            continue
+        checks = (
+            ('wall_median_s', time_tolerance),
+            ('peak_rss_mb', memory_tolerance),
+        )
+        for metric, tolerance in checks:
+            before, after = base.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    'case': case_id,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'ratio': round(ratio, 3),
+                })
+    return regressions
@@ -0,0 +1,115 @@
+# benchmarks/run_benchmarks.py
+"""
+Run the offline benchmark suite.
+
+Examples (from the swing-trader-pro directory):
+    python -m benchmarks.run_benchmarks --scale small
+    python -m benchmarks.run_benchmarks --symbols 50,500 --years 1,5 --case trend_classify
+    python -m benchmarks.run_benchmarks --scale small --save-baseline
+    python -m benchmarks.run_benchmarks --scale small --fail-on-regression
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+from benchmarks import harness, synthetic
+from benchmarks.cases import CASES_BY_NAME
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+logger = logging.getLogger("benchmarks")
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def build_grid(args):
+    """Resolve --scale / --symbols / --years into (n_symbols, years) pairs."""
+    if args.symbols or args.years:
+        symbols = args.symbols or [synthetic.SCALES['small'][0]]
+        years = args.years or [synthetic.SCALES['small'][1]]
+        return [(s, y) for s in symbols for y in years]
+    scales = synthetic.SCALES.keys() if args.scale == 'all' else [args.scale]
+    return [synthetic.SCALES[name] for name in scales]
+
+
+def main(argv=None):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s"
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Swing Trader Pro - offline hot path benchmarks")
+    parser.add_argument("--scale", choices=list(synthetic.SCALES) + ['all'],
+                        default='small', help="Preset universe size/history")
+    parser.add_argument("--symbols", type=_int_list,
+                        help="Comma separated universe sizes (overrides --scale)")
+    parser.add_argument("--years", type=_int_list,
+                        help="Comma separated history lengths in years")
+    parser.add_argument("--case", action='append', choices=list(CASES_BY_NAME),
+                        help="Case to run (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Per-case timeout in seconds")
+    parser.add_argument("--no-isolate", action='store_true',
+                        help="Run in-process (peak RSS becomes cumulative)")
+    parser.add_argument("--output", help="Results JSON path")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action='store_true',
+                        help="Write this run as the new baseline")
+    parser.add_argument("--time-tolerance", type=float,
+                        default=harness.DEFAULT_TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float,
+                        default=harness.DEFAULT_MEMORY_TOLERANCE)
+    parser.add_argument("--fail-on-regression", action='store_true')
+    args = parser.parse_args(argv)
+    if (args.fail_on_regression and not args.save_baseline
+            and not os.path.exists(args.baseline)):
+        parser.error(f"--fail-on-regression needs a baseline; {args.baseline} "
+                     f"does not exist (create one with --save-baseline)")
+
+    report = harness.run_suite(
+        case_names=args.case or list(CASES_BY_NAME),
+        grid=build_grid(args),
+        repeat=args.repeat,
+        warmup=args.warmup,
+        isolate=not args.no_isolate,
+        timeout=args.timeout,
+    )
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    harness.save_results(report, output)
+    logger.info(f"Results written to {output}")
+
+    if args.save_baseline:
+        harness.save_results(report, args.baseline)
+        logger.info(f"Baseline updated at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        logger.info("No baseline found; skipping regression check.")
+        return 0
+
+    regressions = harness.compare(
+        report, harness.load_results(args.baseline),
+        args.time_tolerance, args.memory_tolerance)
+    for r in regressions:
+        logger.warning(
+            f"REGRESSION {r['case']} {r['metric']}: "
+            f"{r['baseline']} -> {r['current']} (x{r['ratio']})")
+    if not regressions:
+        logger.info("No regressions against baseline.")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
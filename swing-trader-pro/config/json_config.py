@@ -0,0 +1,24 @@
+# config/json_config.py
+"""
+Loader for the JSON files in config/, which carry a '// config/<name>' path
+header that plain json.load rejects.
+"""
+import json
+import os
+
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_json_config(name: str) -> dict:
+    """
+    Parse config/<name>, skipping '//' comment lines.
+
+    Args:
+        name (str): File name, e.g. 'hedge_constraints.json'.
+
+    Returns:
+        dict: The parsed config.
+    """
+    with open(os.path.join(CONFIG_DIR, name)) as f:
+        return json.loads(''.join(
+            line for line in f if not line.lstrip().startswith('//')))
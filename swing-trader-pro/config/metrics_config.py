@@ -0,0 +1,21 @@
+# config/metrics_config.py
+"""
+Metrics/instrumentation configuration.
+
+Instrumentation is off by default; enable it with SWING_METRICS_ENABLED=1.
+"""
+import os
+
+METRICS_CONFIG = {
+    "enabled": os.getenv("SWING_METRICS_ENABLED", "0").lower() in ("1", "true", "yes"),
+    # Prometheus textfile export, rewritten after every scheduled job
+    "textfile_path": os.getenv(
+        "SWING_METRICS_TEXTFILE",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                     "logs", "metrics.prom")
+    ),
+    # Set to a port (e.g. 9108) to also serve /metrics over HTTP
+    "http_port": int(os.getenv("SWING_METRICS_PORT", "0")) or None,
+    # How many slowest symbols/sources to log after each signal run
+    "top_n": 10,
+}
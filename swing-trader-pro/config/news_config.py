@@ -0,0 +1,77 @@
+# config/news_config.py
+"""
+Fetch settings for NewsAnalyzer.analyze_many.
+
+Per-source values can also be set on the source's entry in
+news_sources.json ("timeout", "max_concurrency"), which take precedence.
+"""
+import os
+
+NEWS_FETCH_CONFIG = {
+    # Hard stop for a whole fan-out; sources still pending are reported as missing
+    "deadline_seconds": float(os.getenv("SWING_NEWS_DEADLINE_SECONDS", "600")),
+    # analyze_bulk downloads each RSS feed at most once per this many seconds
+    "feed_ttl_seconds": 900,
+    # Defaults for sources without their own settings
+    "default_timeout": 5.0,
+    "default_max_concurrency": 4,
+    "sources": {
+        "moneycontrol": {"timeout": 5.0, "max_concurrency": 4},
+        "economic_times": {"timeout": 5.0, "max_concurrency": 4},
+        # Rate-limited API, keep it narrow
+        "twitter_finance": {"timeout": 5.0, "max_concurrency": 2},
+    },
+}
+
+# Sentiment score cache shared by every NewsAnalyzer call (core/sentiment_cache.py)
+SENTIMENT_CACHE_CONFIG = {
+    "enabled": os.getenv("SWING_SENTIMENT_CACHE", "1").lower() in ("1", "true", "yes"),
+    "path": os.getenv(
+        "SWING_SENTIMENT_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                     "cache", "sentiment.sqlite")
+    ),
+    "ttl_seconds": 7 * 86400,
+    "max_memory": 50000,
+    # Simhash bits within which two headlines count as the same story
+    "max_distance": 3,
+}
+
+# Sentiment scorer for NewsAnalyzer (core/sentiment_backends.py). Backends:
+# "textblob", "vader", "onnx", or "cascade" (primary on everything, fallback
+# only where |primary score| < ambiguous_below). Everything runs offline on CPU.
+SENTIMENT_BACKEND_CONFIG = {
+    "backend": os.getenv("SWING_SENTIMENT_BACKEND", "textblob"),
+    "cascade": {
+        "primary": "vader",
+        "fallback": "onnx",
+        "ambiguous_below": 0.05,
+    },
+    "vader": {
+        # Optional JSON {word: valence} with finance terms (e.g. from Loughran-McDonald)
+        "lexicon_path": os.getenv("SWING_VADER_LEXICON") or None,
+    },
+    "onnx": {
+        "model_path": os.getenv("SWING_SENTIMENT_ONNX_MODEL", "models/finbert.onnx"),
+        "tokenizer_path": os.getenv("SWING_SENTIMENT_TOKENIZER", "models/tokenizer.json"),
+        # Logit order of the exported model (ProsusAI/finbert order by default)
+        "labels": ["positive", "negative", "neutral"],
+        "batch_size": 32,
+        "max_length": 64,
+    },
+}
+
+# Per-symbol sentiment history (core/sentiment_store.py). When enabled, the
+# analyze* methods record each fresh score and return the time-decayed rolling
+# score; they answer from the store without fetching while the last
+# observation is younger than refresh_minutes.
+SENTIMENT_TIMELINE_CONFIG = {
+    "enabled": os.getenv("SWING_SENTIMENT_TIMELINE", "1").lower() in ("1", "true", "yes"),
+    "path": os.getenv(
+        "SWING_SENTIMENT_TIMELINE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                     "data", "sentiment")
+    ),
+    "half_life_hours": 24.0,
+    "refresh_minutes": 60,
+}
@@ -0,0 +1,26 @@
+# config/nsdl_config.py
+"""
+NSDL FII/DII history settings (data_providers/nsdl_fetcher.py,
+data/fii_dii_store.py).
+"""
+import os
+
+NSDL_CONFIG = {
+    # Columnar FII/DII store, one sub-directory per segment
+    "store_path": os.getenv(
+        "SWING_NSDL_STORE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "nsdl")
+    ),
+    # Archive pages by segment; {start}/{end} are filled with dd-mm-YYYY dates.
+    # Point SWING_NSDL_ARCHIVE_BASE at a local fixture server for tests.
+    "archive_urls": {
+        "cash": "{base}/fii_dii_archive.php?from={start}&to={end}",
+        "derivatives": "{base}/fii_fno_archive.php?from={start}&to={end}",
+    },
+    "archive_base": os.getenv(
+        "SWING_NSDL_ARCHIVE_BASE", "https://www.nsdl.co.in/emi/ismr"),
+    # Days covered by one archive request during a backfill
+    "page_days": 31,
+    # Pause between archive requests, to stay polite to NSDL
+    "page_interval_seconds": 1.0,
+}
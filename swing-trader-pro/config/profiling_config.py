@@ -0,0 +1,27 @@
+# config/profiling_config.py
+"""
+Profiling configuration for scheduled PhaseManager jobs.
+
+Modes:
+    "off"      - never profile.
+    "slow"     - start a sampling profiler only once a job has run longer than
+                 `slow_threshold_seconds`; fast jobs pay nothing.
+    "sample"   - sample selected jobs from the start of every run.
+    "cprofile" - run selected jobs under cProfile (deterministic, higher overhead).
+"""
+import os
+
+PROFILING_CONFIG = {
+    "mode": os.getenv("SWING_PROFILE_MODE", "slow"),
+    # Job function names to profile; empty list means every job
+    "jobs": [j for j in os.getenv("SWING_PROFILE_JOBS", "").split(",") if j],
+    "slow_threshold_seconds": float(os.getenv("SWING_PROFILE_SLOW_SECONDS", "120")),
+    "sample_interval_seconds": 0.01,
+    "output_dir": os.getenv(
+        "SWING_PROFILE_DIR",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                     "logs", "profiles")
+    ),
+    # Keep only the newest N profiles per job
+    "max_files_per_job": 10,
+}
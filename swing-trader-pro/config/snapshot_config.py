@@ -0,0 +1,15 @@
+# config/snapshot_config.py
+"""
+Point-in-time snapshots of DataPipeline outputs (core/snapshot_store.py).
+"""
+import os
+
+SNAPSHOT_CONFIG = {
+    "enabled": os.getenv("SWING_SNAPSHOTS", "1").lower() in ("1", "true", "yes"),
+    "path": os.getenv(
+        "SWING_SNAPSHOT_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "snapshots")
+    ),
+    # gzip level: 1 is fastest, 9 smallest
+    "compresslevel": 6,
+}
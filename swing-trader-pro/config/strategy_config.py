@@ -0,0 +1,22 @@
+# config/strategy_config.py
+"""
+Strategy registry settings (core/strategy_registry.py).
+
+Set SWING_STRATEGIES to a comma-separated list (e.g. "quant,wyckoff") to
+enable only those strategies; by default every registered strategy is enabled.
+
+Orders from PhaseManager.generate_signals need a composite score of at least
+`min_score` and are sized to risk `risk_per_trade` of `capital` between entry
+and stop loss; with no capital configured no orders are sent.
+"""
+import os
+
+STRATEGY_CONFIG = {
+    "enabled": [name.strip() for name in os.getenv("SWING_STRATEGIES", "").split(",")
+                if name.strip()] or None,
+    # Installed packages can add strategies under this entry-point group
+    "entry_point_group": "swing_trader_pro.strategies",
+    "min_score": float(os.getenv("SWING_MIN_SCORE", "5.0")),
+    "capital": float(os.getenv("SWING_CAPITAL", "0")),
+    "risk_per_trade": float(os.getenv("SWING_RISK_PER_TRADE", "0.02")),
+}
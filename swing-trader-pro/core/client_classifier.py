@@ -0,0 +1,99 @@
+# core/client_classifier.py
+"""
+Classify block/bulk deal counterparties (client names) as FII, DII, promoter
+or other.
+
+Every alias in config/client_aliases.json is compiled into one Aho-Corasick
+automaton (core/symbol_matcher.py), so a client name is scanned once however
+long the alias list gets. Deal files repeat the same few hundred clients
+across tens of thousands of rows, so whole columns are classified by
+factorizing them and scanning only the unique names, and results are
+memoized across calls.
+"""
+from typing import Dict, Iterable, List, Optional
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.symbol_matcher import SymbolMatcher, load_aliases
+
+logger = logging.getLogger(__name__)
+
+CLIENT_ALIASES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "config", "client_aliases.json")
+
+OTHER = 'OTHER'
+
+
+class ClientClassifier:
+    """
+    Client name -> category ('FII', 'DII', 'PROMOTER', ... or 'OTHER').
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, List[str]]] = None,
+                 max_cached: int = 200000):
+        """
+        Args:
+            aliases (dict, optional): Category -> name fragments matched as
+                whole words, case-insensitively; each category also matches
+                its own label (e.g. "FII"). Defaults to
+                config/client_aliases.json.
+            max_cached (int): Memoized names kept before the memo is reset.
+        """
+        if aliases is None:
+            aliases = load_aliases(CLIENT_ALIASES_PATH)
+        # Category order breaks ties between equally long matches
+        self.categories = list(aliases)
+        self._priority = {category: i for i, category in enumerate(self.categories)}
+        self._matcher = SymbolMatcher(self.categories, aliases)
+        self.max_cached = max_cached
+        self._memo: Dict[str, str] = {}
+
+    def classify_name(self, name: str) -> str:
+        """
+        Category of one client name. The longest matching alias wins, so
+        "Government Pension Fund Global" beats the generic "Pension Fund".
+        """
+        category = self._memo.get(name)
+        if category is not None:
+            return category
+        best = None
+        for found, start, end in self._matcher.find(name):
+            key = (end - start, -self._priority[found])
+            if best is None or key > best[0]:
+                best = (key, found)
+        category = best[1] if best else OTHER
+        if len(self._memo) >= self.max_cached:
+            self._memo.clear()
+        self._memo[name] = category
+        return category
+
+    def classify(self, names: Iterable[str]) -> pd.Series:
+        """
+        Categories for a column of client names, scanning each distinct name
+        once.
+
+        Args:
+            names (iterable): Client names (a Series keeps its index); missing
+                names classify as 'OTHER'.
+
+        Returns:
+            pd.Series: Category per name.
+        """
+        names = names if isinstance(names, pd.Series) else pd.Series(list(names), dtype=object)
+        codes, uniques = pd.factorize(names.fillna('').astype(str))
+        labels = np.array([self.classify_name(name) for name in uniques], dtype=object)
+        return pd.Series(labels[codes], index=names.index, dtype=object)
+
+
+_default_classifier: Optional[ClientClassifier] = None
+
+
+def default_classifier() -> ClientClassifier:
+    """Process-wide ClientClassifier over config/client_aliases.json, built once."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = ClientClassifier()
+    return _default_classifier
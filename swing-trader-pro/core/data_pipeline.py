@@ -1,8 +1,14 @@
 # core/data_pipeline.py
+from typing import Optional
 from datetime import datetime
 import logging
+import time
 from data_providers import NSEFetcher, NSDLFetcher, BlockDealFetcher
 from brokers.data_integration import BrokerDataFetcher
+from core.metrics import REGISTRY as METRICS, timed, payload_size
+from core.snapshot_store import SnapshotStore
+from data_providers.base_fetcher import trading_date
+from config.snapshot_config import SNAPSHOT_CONFIG
 from data_providers import (
     NSEFetcher,
     NSDLFetcher,
@@ -140,6 +146,9 @@ class DataPipeline:
 
 logger = logging.getLogger(__name__)
 
+# Datasets get_institutional_data() returns besides 'timestamp'
+INSTITUTIONAL_SOURCES = ('ohlc', 'fii_flows', 'block_deals', 'derivatives_oi', 'sector_flows')
+
 
 class DataPipeline:
     """
@@ -147,13 +156,25 @@ class DataPipeline:
     logging, fallback logic, and modular fetchers.
     """
 
-    def __init__(self, broker_api=None):
+    def __init__(self, broker_api=None, snapshots: Optional[SnapshotStore] = None):
+        """
+        Args:
+            broker_api (dict, optional): BrokerDataFetcher arguments.
+            snapshots (SnapshotStore, optional): Where each complete
+                get_institutional_data() result is persisted; defaults to
+                SNAPSHOT_CONFIG['path'] unless SNAPSHOT_CONFIG['enabled'] is off.
+        """
         # Initialize fetchers
         self.nse = NSEFetcher()
         self.nsdl = NSDLFetcher()
         self.block = BlockDealFetcher()
         self._last_fetch_time = {}
 
+        if snapshots is None and SNAPSHOT_CONFIG['enabled']:
+            snapshots = SnapshotStore(SNAPSHOT_CONFIG['path'],
+                                      SNAPSHOT_CONFIG['compresslevel'])
+        self.snapshots = snapshots
+
         # Broker integration (optional)
         self.broker = BrokerDataFetcher(**broker_api) if broker_api else None
 
@@ -168,25 +189,67 @@ class DataPipeline:
         }
 
     # --- Main Institutional Data Fetch ---
-    def get_institutional_data(self, symbol, days=30):
+    def get_institutional_data(self, symbol, days=30, sources=None):
         """
         Fetches and combines all institutional data sources with error handling and broker support.
+
+        Args:
+            symbol (str): Trading symbol.
+            days (int): OHLC history in days.
+            sources (iterable, optional): Subset of INSTITUTIONAL_SOURCES to
+                fetch; all by default. Only complete results are snapshotted.
         """
+        fetchers = {
+            'ohlc': lambda: self._get_with_fallback(self.nse.get_ohlc, symbol),
+            'fii_flows': lambda: self._get_with_fallback(self.nsdl.get_fii_dii_activity),
+            'block_deals': lambda: self._get_with_fallback(self.block.get_recent_block_deals),
+            'derivatives_oi': lambda: self._get_with_fallback(self._get_derivatives_data, symbol),
+            'sector_flows': lambda: self._get_with_fallback(self.nsdl.get_sector_flows),
+        }
+        sources = INSTITUTIONAL_SOURCES if sources is None else tuple(sources)
         try:
-            data = {
-                'timestamp': datetime.now(),
-                'ohlc': self._get_with_fallback(self.nse.get_ohlc, symbol),
-                'fii_flows': self._get_with_fallback(self.nsdl.get_fii_dii_activity),
-                'block_deals': self._get_with_fallback(self.block.get_recent_block_deals),
-                'derivatives_oi': self._get_with_fallback(self._get_derivatives_data, symbol),
-                'sector_flows': self._get_with_fallback(self.nsdl.get_sector_flows)
-            }
+            with timed('swing_symbol_seconds', stage='fetch', symbol=symbol):
+                data = {'timestamp': datetime.now()}
+                for source in sources:
+                    data[source] = fetchers[source]()
             self._validate_completeness(data)
+            if set(sources) >= set(INSTITUTIONAL_SOURCES):
+                self._save_snapshot(symbol, data)
             return data
         except Exception as e:
             logger.critical(f"Data pipeline failed: {str(e)}")
             return self._load_full_fallback(symbol)
 
+    def get_institutional_data_asof(self, symbol, when=None):
+        """
+        The institutional data the pipeline returned for `symbol` as of a
+        past moment, read from its snapshots without any fetching.
+
+        Args:
+            symbol (str): Trading symbol.
+            when (datetime or date, optional): Point in time (a date means
+                that day's close of business); defaults to now.
+
+        Returns:
+            dict or None: The latest snapshot taken at or before `when`.
+        """
+        if self.snapshots is None:
+            return None
+        return self.snapshots.asof(symbol, when)
+
+    # --- Helper: Snapshots ---
+    def _save_snapshot(self, symbol, data):
+        """
+        Persist a complete result as an immutable snapshot; failures are
+        logged and never break the live path.
+        """
+        if self.snapshots is None:
+            return
+        try:
+            self.snapshots.put(symbol, data)
+        except Exception as e:
+            logger.error(f"Snapshot of {symbol} failed: {e}")
+
     # --- Helper: Derivatives Data ---
     def _get_derivatives_data(self, symbol):
         """
@@ -202,17 +265,25 @@ class DataPipeline:
     # --- Helper: Fallback Wrapper ---
     def _get_with_fallback(self, fetcher_method, *args):
         """
-        Wrapper for fetcher methods with logging and timing.
+        Wrapper for fetcher methods with logging, timing and fetch metrics.
         """
-        start = datetime.now()
+        source = fetcher_method.__name__
+        start = time.perf_counter()
         try:
             data = fetcher_method(*args)
-            elapsed = (datetime.now() - start).total_seconds()
-            logger.info(f"Fetched {fetcher_method.__name__} in {elapsed:.2f}s")
+            elapsed = time.perf_counter() - start
+            logger.info(f"Fetched {source} in {elapsed:.2f}s")
+            METRICS.observe('swing_fetch_seconds', elapsed, source=source)
+            rows = payload_size(data)
+            if rows is not None:
+                METRICS.observe('swing_fetch_rows', rows, source=source)
             return data
         except Exception as e:
+            METRICS.observe('swing_fetch_seconds',
+                            time.perf_counter() - start, source=source)
+            METRICS.inc('swing_fetch_failures_total', source=source)
             logger.warning(
-                f"Using fallback for {fetcher_method.__name__}: {e}")
+                f"Using fallback for {source}: {e}")
             return None
 
     # --- Helper: Data Completeness Validation ---
@@ -228,8 +299,21 @@ class DataPipeline:
     def _load_full_fallback(self, symbol):
         """
         Loads fallback data (could be from cache, disk, or minimal API).
+
+        The latest snapshot is only used if it was taken on the current
+        trading date; older data is never passed off as live.
         """
         logger.error(f"Loading fallback data for {symbol}")
+        if self.snapshots is not None:
+            try:
+                ts = self.snapshots.asof_time(symbol)
+                if ts is not None and ts.date() >= trading_date():
+                    logger.warning(f"Using snapshot of {symbol} from {ts}")
+                    return self.snapshots.load(symbol, ts)
+                if ts is not None:
+                    logger.warning(f"Latest snapshot of {symbol} ({ts}) is stale, not used")
+            except Exception as e:
+                logger.error(f"Snapshot fallback for {symbol} failed: {e}")
         return {
             'timestamp': datetime.now(),
             'ohlc': None,
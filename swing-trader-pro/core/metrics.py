@@ -0,0 +1,400 @@
+# core/metrics.py
+"""
+Lightweight in-process metrics registry for the daily cycle.
+
+Usage:
+    from core.metrics import REGISTRY, timed
+
+    with timed('swing_job_seconds', job='run_screening'):
+        ...
+
+    @timed('swing_fetch_seconds', source='nsdl')
+    def fetch(...):
+        ...
+
+    REGISTRY.inc('swing_http_cache_total', result='hit')
+
+When the registry is disabled, `timed` does a single attribute check and
+`inc`/`observe` return immediately, so instrumentation can stay in hot paths.
+Metrics are exported in the Prometheus text exposition format, either to a
+file (node_exporter textfile collector) or over a small HTTP endpoint.
+"""
+from typing import Dict, Any, Optional, Tuple, List, Sequence
+import functools
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of counters, gauges, summaries and histograms keyed by
+    metric name and label set.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled (bool): Whether recording is active.
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> label key -> [count, sum, max]
+        self._summaries: Dict[str, Dict[LabelKey, List[float]]] = {}
+        # name -> label key -> [bucket counts..., count, sum]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+
+    # --- Declaration ---
+    def declare(self, name: str, kind: str, help_text: str = "",
+                buckets: Optional[Sequence[float]] = None) -> None:
+        """
+        Declare a metric's type and help text.
+
+        Args:
+            name (str): Metric name.
+            kind (str): 'counter', 'gauge', 'summary' or 'histogram'.
+            help_text (str): HELP line for the exporter.
+            buckets (sequence, optional): Upper bounds for histograms.
+        """
+        if kind not in ('counter', 'gauge', 'summary', 'histogram'):
+            raise ValueError(f"Unknown metric kind: {kind}")
+        meta = {'kind': kind, 'help': help_text}
+        if kind == 'histogram':
+            meta['buckets'] = tuple(sorted(buckets or DEFAULT_LATENCY_BUCKETS))
+        with self._lock:
+            self._meta[name] = meta
+
+    def _kind(self, name: str, default: str) -> str:
+        meta = self._meta.get(name)
+        return meta['kind'] if meta else default
+
+    # --- Recording ---
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Set a gauge to an absolute value."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """
+        Record an observation. Histograms get bucketed counts; anything not
+        declared as a histogram is kept as a summary (count, sum, max).
+        """
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            if self._kind(name, 'summary') == 'histogram':
+                buckets = self._meta[name]['buckets']
+                series = self._histograms.setdefault(name, {})
+                state = series.get(key)
+                if state is None:
+                    state = series[key] = [0.0] * (len(buckets) + 2)
+                for i, bound in enumerate(buckets):
+                    if value <= bound:
+                        state[i] += 1
+                state[-2] += 1
+                state[-1] += value
+            else:
+                series = self._summaries.setdefault(name, {})
+                state = series.get(key)
+                if state is None:
+                    series[key] = [1.0, value, value]
+                else:
+                    state[0] += 1
+                    state[1] += value
+                    if value > state[2]:
+                        state[2] = value
+
+    def reset(self) -> None:
+        """Drop all recorded values (declarations are kept)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+            self._histograms.clear()
+
+    # --- Queries ---
+    def counter_value(self, name: str, **labels) -> float:
+        return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def top(self, name: str, by: str, n: int = 10, **match) -> List[Tuple[str, float]]:
+        """
+        Rank label values by total observed time/value for a summary,
+        histogram or counter. Useful to find which symbols or sources
+        dominate a stage budget.
+
+        Args:
+            name (str): Metric name.
+            by (str): Label to group by (e.g. 'symbol', 'source').
+            n (int): Number of entries to return.
+            **match: Only include series whose labels equal these values.
+
+        Returns:
+            list: (label value, total) sorted descending.
+        """
+        totals: Dict[str, float] = {}
+        with self._lock:
+            if name in self._summaries:
+                items = ((k, s[1]) for k, s in self._summaries[name].items())
+            elif name in self._histograms:
+                items = ((k, s[-1]) for k, s in self._histograms[name].items())
+            else:
+                items = self._counters.get(name, {}).items()
+            for key, total in items:
+                labels = dict(key)
+                if any(labels.get(k) != str(v) for k, v in match.items()):
+                    continue
+                label = labels.get(by)
+                if label is not None:
+                    totals[label] = totals.get(label, 0.0) + total
+        return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def ratio(self, name: str, label: str, numerator: str) -> Optional[float]:
+        """
+        Share of a counter whose `label` equals `numerator`, e.g. the cache
+        hit ratio of swing_http_cache_total{result=hit|miss}.
+        """
+        hits = total = 0.0
+        for key, value in self._counters.get(name, {}).items():
+            total += value
+            if dict(key).get(label) == numerator:
+                hits += value
+        return hits / total if total else None
+
+    # --- Export ---
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            def header(name, kind):
+                help_text = self._meta.get(name, {}).get('help')
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            for name in sorted(self._counters):
+                header(name, 'counter')
+                for key, value in self._counters[name].items():
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self._gauges):
+                header(name, 'gauge')
+                for key, value in self._gauges[name].items():
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self._summaries):
+                header(name, 'summary')
+                series = self._summaries[name]
+                for key, (count, total, _) in series.items():
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_count{labels} {count:g}")
+                    lines.append(f"{name}_sum{labels} {total:.6f}")
+                # Max is exported as its own gauge family to stay parseable
+                lines.append(f"# TYPE {name}_max gauge")
+                for key, (_, _, peak) in series.items():
+                    lines.append(f"{name}_max{_format_labels(key)} {peak:.6f}")
+            for name in sorted(self._histograms):
+                header(name, 'histogram')
+                buckets = self._meta[name]['buckets']
+                for key, state in self._histograms[name].items():
+                    for bound, count in zip(buckets, state):
+                        lines.append(
+                            f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {count:g}")
+                    lines.append(
+                        f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-2]:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-2]:g}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-1]:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Atomically write the exposition text to `path` (suitable for the
+        node_exporter textfile collector).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def start_http_server(self, port: int, addr: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """
+        Serve /metrics on a daemon thread.
+
+        Returns:
+            ThreadingHTTPServer: The running server (call shutdown() to stop).
+        """
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header(
+                    'Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("metrics endpoint: " + format % args)
+
+        server = ThreadingHTTPServer((addr, port), _Handler)
+        thread = threading.Thread(
+            target=server.serve_forever, name="metrics-http", daemon=True)
+        thread.start()
+        logger.info(f"Metrics endpoint listening on {addr}:{port}/metrics")
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+REGISTRY.declare('swing_job_seconds', 'histogram',
+                 "Wall time of scheduled PhaseManager jobs")
+REGISTRY.declare('swing_symbol_seconds', 'summary',
+                 "Per-symbol processing time within a stage")
+REGISTRY.declare('swing_fetch_seconds', 'histogram',
+                 "Latency of data source fetches")
+REGISTRY.declare('swing_fetch_rows', 'summary',
+                 "Rows/items returned by data source fetches")
+REGISTRY.declare('swing_fetch_failures_total', 'counter',
+                 "Data source fetches that fell back")
+REGISTRY.declare('swing_http_cache_total', 'counter',
+                 "HTTP responses by requests-cache result (hit/miss)")
+REGISTRY.declare('swing_http_retries_total', 'counter',
+                 "HTTP request retries scheduled by tenacity")
+REGISTRY.declare('swing_http_response_bytes', 'summary',
+                 "HTTP response body sizes")
+REGISTRY.declare('swing_order_latency_seconds', 'histogram',
+                 "Time from the start of a signal run to each order reaching the broker")
+REGISTRY.declare('swing_order_failures_total', 'counter',
+                 "Orders the broker adapter failed to place")
+
+
+class timed:
+    """
+    Context manager and decorator that records elapsed seconds into a
+    summary/histogram. Does nothing but a flag check when disabled.
+    """
+
+    __slots__ = ('name', 'labels', 'registry', '_start')
+
+    def __init__(self, name: str, registry: Optional[MetricsRegistry] = None, **labels):
+        self.name = name
+        self.labels = labels
+        self.registry = registry or REGISTRY
+        self._start = None
+
+    def __enter__(self):
+        if self.registry.enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start is not None:
+            self.registry.observe(
+                self.name, time.perf_counter() - self._start, **self.labels)
+            self._start = None
+        return False
+
+    def __call__(self, func):
+        name, labels, registry = self.name, self.labels, self.registry
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            with timed(name, registry, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def payload_size(data: Any) -> Optional[int]:
+    """Best-effort row/item count of a fetch result (DataFrame, list, dict)."""
+    if data is None:
+        return None
+    try:
+        return len(data)
+    except TypeError:
+        return None
+
+
+def configure_metrics(config: Optional[Dict[str, Any]] = None) -> MetricsRegistry:
+    """
+    Enable/disable the global registry and start exporters from config.
+
+    Args:
+        config (dict, optional): Overrides for config.metrics_config.METRICS_CONFIG.
+
+    Returns:
+        MetricsRegistry: The global registry.
+    """
+    from config.metrics_config import METRICS_CONFIG
+
+    settings = dict(METRICS_CONFIG)
+    settings.update(config or {})
+    REGISTRY.enabled = bool(settings.get('enabled'))
+    if REGISTRY.enabled and settings.get('http_port'):
+        try:
+            REGISTRY.start_http_server(int(settings['http_port']))
+        except OSError as e:
+            logger.error(f"Could not start metrics endpoint: {e}")
+    return REGISTRY
+
+
+def export_textfile(path: Optional[str] = None) -> None:
+    """Write the textfile export if metrics are enabled and a path is configured."""
+    if not REGISTRY.enabled:
+        return
+    if path is None:
+        from config.metrics_config import METRICS_CONFIG
+        path = METRICS_CONFIG.get('textfile_path')
+    if not path:
+        return
+    try:
+        REGISTRY.write_textfile(path)
+    except OSError as e:
+        logger.error(f"Failed to write metrics textfile {path}: {e}")
@@ -1,14 +1,24 @@
 # core/phase_manager.py
 from config.logging_config import configure_logging, get_logger
 from brokers.broker_adapter import BrokerAdapter
+from config.metrics_config import METRICS_CONFIG
+from config.strategy_config import STRATEGY_CONFIG
+from core.metrics import REGISTRY as METRICS, timed, configure_metrics, export_textfile
+from core.profiling import JobProfiler
+from core.rolling_correlation import RollingCorrelation
+from core.signal_stream import SignalStream, strategy_orders
+from core.strategy_registry import StrategySpec
+from data.oi_chain_store import default_oi_store
+from data_providers.nsdl_fetcher import fii_flow_summary
 import logging
 import schedule
+import threading
 import time
 from datetime import datetime, timedelta
 import random
+import pandas as pd
 from phases import (
     MorningScreening,
-    SignalGenerator,
     DynamicMonitor,
     ReportingEngine
 )
@@ -161,6 +171,17 @@ class PhaseManager:
 configure_logging()
 logger = get_logger(__name__)
 
+# phases/2_signal_generation is not a valid package name for a plain import
+STRATEGY_ROUTER = StrategySpec('phases.2_signal_generation.strategy_router:StrategyRouter')
+
+# symbol_data feature -> DataPipeline.get_institutional_data() source it is built
+# from; 'symbol' needs nothing and 'oi_changes' comes from the OI store
+FEATURE_SOURCES = {'close': 'ohlc', 'volume': 'ohlc', 'fii_flows': 'fii_flows'}
+
+# Option chains are polled during market hours so the OI store tracks changes
+OPTION_CHAIN_INTERVAL_MINUTES = 15
+MARKET_OPEN, MARKET_CLOSE = "09:15", "15:30"
+
 
 class PhaseManager:
     """
@@ -168,17 +189,45 @@ class PhaseManager:
     monitoring, trade execution, and reporting.
     """
 
-    def __init__(self, broker_settings):
+    def __init__(self, broker_settings, pipeline=None, oi_store=None):
         """
         Args:
             broker_settings (dict): Broker credentials/settings, must include 'broker' key.
+            pipeline (DataPipeline, optional): Market data source; built on
+                first use by default.
+            oi_store (OIChainStore, optional): OI chains read by the strategy
+                router; defaults to the process-wide store.
         """
         self.broker_settings = broker_settings
         self.screening = MorningScreening()
-        self.signal = SignalGenerator()
+        self._pipeline = pipeline
+        self._pipeline_lock = threading.Lock()
+        self.oi_store = oi_store or default_oi_store()
+        # Return correlations of the screened universe for pair-trade hedges,
+        # refreshed from each cycle's closes
+        self.pair_engine = RollingCorrelation()
+        self._closes = {}  # symbol -> this cycle's close series
+        self._pair_bar = None  # date of the last bar in pair_engine
+        self._chain_fetched = {}  # underlying -> monotonic time of the last fetch
+        self._features = None  # router's required_features(), read on first use
+        self.router = STRATEGY_ROUTER.load()(
+            oi_store=self.oi_store, pair_engine=self.pair_engine)
+        self._strategy_orders = strategy_orders(
+            self.router, min_score=STRATEGY_CONFIG['min_score'])
         self.monitor = DynamicMonitor()
         self.reporting = ReportingEngine()
         self.active_symbols = []  # Ensure always initialized
+        self.profiler = JobProfiler()
+        configure_metrics()
+
+    @property
+    def pipeline(self):
+        if self._pipeline is None:
+            with self._pipeline_lock:
+                if self._pipeline is None:
+                    from core.data_pipeline import DataPipeline
+                    self._pipeline = DataPipeline()
+        return self._pipeline
 
     def execute_daily_cycle(self):
         """Orchestrate the complete trading day workflow"""
@@ -188,6 +237,10 @@ class PhaseManager:
         # Signal generation at 9:15 AM
         schedule.every().day.at("09:15").do(self.safe_run, self.generate_signals)
 
+        # Option chains (NIFTY and the screened universe) through the session
+        schedule.every(OPTION_CHAIN_INTERVAL_MINUTES).minutes.do(
+            self.safe_run, self.poll_option_chains)
+
         # Random monitoring checks
         self.schedule_random_checks()
 
@@ -203,12 +256,18 @@ class PhaseManager:
             logger.info("PhaseManager stopped by user.")
 
     def safe_run(self, func, *args, **kwargs):
-        """Wrapper to safely run scheduled jobs with error handling."""
+        """
+        Wrapper to safely run scheduled jobs with error handling, timing and
+        optional profiling (see config/profiling_config.py).
+        """
         try:
-            func(*args, **kwargs)
+            with timed('swing_job_seconds', job=func.__name__):
+                self.profiler.run(func, *args, **kwargs)
         except Exception as e:
             logger.exception(
                 f"Exception in scheduled job {func.__name__}: {e}")
+        finally:
+            export_textfile()
 
     def run_screening(self):
         """Execute morning screening phase"""
@@ -221,33 +280,143 @@ class PhaseManager:
             self.active_symbols = []
 
     def generate_signals(self):
-        """Generate trading signals from screened symbols"""
+        """
+        Run the StrategyRouter over the screened symbols, streaming each
+        order to the broker as soon as its symbol is done (see
+        core/signal_stream.py). Only the NIFTY option chain and the sector
+        flows are refreshed up front; each symbol's own chain is fetched as
+        it is analysed.
+        """
         if not self.active_symbols:
             logger.warning("No active symbols to generate signals for.")
             return
-        for symbol in self.active_symbols:
-            try:
-                signal = self.signal.generate(symbol)
-                if signal:
-                    self.execute_trade(signal)
-            except Exception as e:
-                logger.exception(f"Error generating signal for {symbol}: {e}")
-
-    def execute_trade(self, signal):
-        """Execute trade through broker API"""
+        self.refresh_option_chain('NIFTY')
         try:
-            broker = self.get_broker_adapter()
-            broker.place_gtt_order(
-                symbol=signal['symbol'],
-                entry=signal['entry'],
-                sl=signal['sl'],
-                target=signal['target'],
-                quantity=signal['quantity']
-            )
-            logger.info(f"Trade executed for {signal['symbol']}")
+            self.router.update_sector_flows(self.pipeline.nsdl.get_sector_flows())
         except Exception as e:
-            logger.exception(
-                f"Trade execution failed for {signal.get('symbol', 'UNKNOWN')}: {e}")
+            logger.warning(f"Sector flows unavailable, sector hedges not checked: {e}")
+        self._closes = {}
+        SignalStream(self._generate_signal, self.execute_trade).run(self.active_symbols)
+        self._update_pair_engine()
+        self._log_slowest_symbols('signals')
+
+    def _update_pair_engine(self):
+        """
+        Feed this cycle's closes to the pair engine: refit when the universe
+        changed (or on the first cycle), otherwise add the bars since the
+        last cycle. The next cycle's hedge checks see the result.
+        """
+        if not self._closes:
+            return
+        closes = pd.DataFrame(self._closes).sort_index().sort_index(axis=1)
+        last_bar = closes.index[-1]
+        if self._pair_bar is None or list(self.pair_engine.symbols) != list(closes.columns):
+            self.pair_engine.fit(closes)
+        elif last_bar > self._pair_bar:
+            for _, bar in closes.loc[closes.index > self._pair_bar].iterrows():
+                self.pair_engine.update(bar)
+        else:
+            return
+        self._pair_bar = last_bar
+        logger.info(f"Pair engine at {last_bar} over {len(closes.columns)} symbols")
+
+    def _generate_signal(self, symbol):
+        """Sized order for one symbol, or None (runs on the signal worker thread)."""
+        with timed('swing_symbol_seconds', stage='signals', symbol=symbol):
+            self.refresh_option_chain(symbol)
+            order = self._strategy_orders(self._symbol_data(symbol))
+        return self._size_order(order) if order else None
+
+    def poll_option_chains(self):
+        """Refresh option chains if the market is open (scheduled job)."""
+        now = datetime.now()
+        if now.weekday() >= 5 or not MARKET_OPEN <= f"{now:%H:%M}" <= MARKET_CLOSE:
+            return
+        self.refresh_option_chains()
+
+    def refresh_option_chains(self):
+        """Ingest the NIFTY and screened symbols' option chains into the OI store."""
+        for underlying in ['NIFTY'] + [s for s in self.active_symbols if s != 'NIFTY']:
+            self.refresh_option_chain(underlying)
+
+    def refresh_option_chain(self, underlying):
+        """
+        Ingest one option chain into the OI store, unless it was fetched in
+        the last polling interval (so the poller and signal generation do not
+        fetch the same chain twice).
+        """
+        fetched = self._chain_fetched.get(underlying)
+        if fetched is not None and time.monotonic() - fetched < OPTION_CHAIN_INTERVAL_MINUTES * 60:
+            return
+        self._chain_fetched[underlying] = time.monotonic()
+        self.pipeline.nse.get_option_chain(underlying)
+
+    def _symbol_data(self, symbol):
+        """
+        symbol_data for the StrategyRouter from the DataPipeline's
+        institutional data, fetching only what the enabled strategies read
+        (StrategyRouter.required_features()).
+        """
+        if self._features is None:
+            self._features = self.router.required_features()
+        features = self._features
+        data = self.pipeline.get_institutional_data(
+            symbol, sources=sorted({FEATURE_SOURCES[f] for f in features if f in FEATURE_SOURCES}))
+        symbol_data = {'symbol': symbol}
+        if 'fii_flows' in features:
+            symbol_data['fii_flows'] = fii_flow_summary(
+                data.get('fii_flows'), self.pipeline.nsdl.store.tail(1, 'derivatives'))
+        ohlc = data.get('ohlc')
+        if ohlc is not None and len(ohlc):
+            self._closes[symbol] = ohlc['Close']
+            for feature, column in (('close', 'Close'), ('volume', 'Volume')):
+                if feature in features:
+                    symbol_data[feature] = ohlc[column].to_numpy(float)
+        return symbol_data
+
+    def _size_order(self, order):
+        """
+        Add a quantity risking STRATEGY_CONFIG['risk_per_trade'] of the
+        capital between entry and stop loss; None if nothing can be bought.
+        """
+        risk_per_share = abs(order['entry'] - order['sl'])
+        quantity = 0
+        if risk_per_share > 0:
+            quantity = int(STRATEGY_CONFIG['capital'] * STRATEGY_CONFIG['risk_per_trade']
+                           / risk_per_share)
+        if quantity <= 0:
+            logger.warning(f"No position size for {order['symbol']} "
+                           f"(capital {STRATEGY_CONFIG['capital']}, risk per share {risk_per_share})")
+            return None
+        return {**order, 'quantity': quantity}
+
+    def _log_slowest_symbols(self, stage):
+        """Log the symbols that consumed most of a stage's time budget (cumulative)."""
+        if not METRICS.enabled:
+            return
+        slowest = METRICS.top(
+            'swing_symbol_seconds', by='symbol', n=METRICS_CONFIG['top_n'], stage=stage)
+        if slowest:
+            summary = ", ".join(f"{s}={t:.2f}s" for s, t in slowest)
+            logger.info(f"Slowest symbols in {stage} (cumulative): {summary}")
+
+    def execute_trade(self, signal):
+        """
+        Execute trade through broker API.
+
+        Raises:
+            Exception: Whatever the broker adapter raised; SignalStream logs
+                it and counts the order as failed.
+        """
+        broker = self.get_broker_adapter()
+        broker.place_gtt_order(
+            symbol=signal['symbol'],
+            entry=signal['entry'],
+            sl=signal['sl'],
+            target=signal['target'],
+            quantity=signal['quantity']
+        )
+        logger.info(f"Trade executed for {signal['symbol']}")
 
     def get_broker_adapter(self):
         """
@@ -300,9 +469,14 @@ class PhaseManager:
             logger.exception(f"Error during monitoring: {e}")
 
     def generate_reports(self):
-        """Generate end-of-day reports"""
+        """Generate end-of-day reports and save the OI session close"""
         try:
             self.reporting.generate_daily_report()
             logger.info("End-of-day report generated.")
         except Exception as e:
             logger.exception(f"Error generating report: {e}")
+        try:
+            self.oi_store.close_day()
+            logger.info("OI session close saved.")
+        except Exception as e:
+            logger.exception(f"Error saving OI session close: {e}")
@@ -0,0 +1,224 @@
+# core/profiling.py
+"""
+Optional profiling for scheduled jobs.
+
+JobProfiler wraps a job call and, depending on config, either samples the
+job's thread stacks (collapsed-stack output, ready for flamegraph.pl or
+speedscope) or runs it under cProfile (pstats output). In "slow" mode the
+sampler is only started once the job exceeds a time threshold, so normal
+mornings run unprofiled and slow mornings still leave evidence on disk.
+"""
+from typing import Dict, Any, Optional, Callable
+import cProfile
+import glob
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'slow', 'sample', 'cprofile')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack at a fixed interval from a daemon thread
+    and aggregates identical stacks.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.01):
+        """
+        Args:
+            thread_id (int): Ident of the thread to sample.
+            interval (float): Seconds between samples.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="job-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Render stacks in Brendan Gregg's collapsed format (root;...;leaf count)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class _SlowJobTrigger:
+    """
+    Arms a timer that starts a SamplingProfiler on the job thread once the
+    job has been running for `threshold` seconds.
+    """
+
+    def __init__(self, thread_id: int, threshold: float, interval: float):
+        self.thread_id = thread_id
+        self.threshold = threshold
+        self.interval = interval
+        self.sampler: Optional[SamplingProfiler] = None
+        self._done = False
+        self._lock = threading.Lock()
+        self._timer = threading.Timer(threshold, self._fire)
+        self._timer.daemon = True
+
+    def arm(self) -> None:
+        self._timer.start()
+
+    def _fire(self) -> None:
+        with self._lock:
+            if self._done:
+                return
+            self.sampler = SamplingProfiler(self.thread_id, self.interval)
+            self.sampler.start()
+
+    def disarm(self) -> Optional[SamplingProfiler]:
+        with self._lock:
+            self._done = True
+            self._timer.cancel()
+            sampler = self.sampler
+        if sampler is not None:
+            sampler.stop()
+        return sampler
+
+
+class JobProfiler:
+    """
+    Config-gated profiler applied around scheduled jobs.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config (dict, optional): Overrides for config.profiling_config.PROFILING_CONFIG.
+        """
+        from config.profiling_config import PROFILING_CONFIG
+
+        self.config = dict(PROFILING_CONFIG)
+        self.config.update(config or {})
+        self.mode = self.config.get('mode', 'off')
+        if self.mode not in MODES:
+            logger.warning(f"Unknown profiling mode '{self.mode}', disabling.")
+            self.mode = 'off'
+        self.jobs = set(self.config.get('jobs') or [])
+        self.output_dir = self.config['output_dir']
+        self.max_files = int(self.config.get('max_files_per_job', 10))
+
+    def is_enabled_for(self, job_name: str) -> bool:
+        return self.mode != 'off' and (not self.jobs or job_name in self.jobs)
+
+    def run(self, func: Callable, *args, **kwargs):
+        """
+        Run `func` under the configured profiling mode and return its result.
+        Profiling failures never affect the job itself.
+        """
+        job_name = getattr(func, '__name__', 'job')
+        if not self.is_enabled_for(job_name):
+            return func(*args, **kwargs)
+        if self.mode == 'cprofile':
+            return self._run_cprofile(job_name, func, *args, **kwargs)
+        return self._run_sampled(job_name, func, *args, **kwargs)
+
+    def _run_sampled(self, job_name: str, func: Callable, *args, **kwargs):
+        interval = float(self.config.get('sample_interval_seconds', 0.01))
+        thread_id = threading.get_ident()
+        start = time.perf_counter()
+        if self.mode == 'slow':
+            trigger = _SlowJobTrigger(
+                thread_id, float(self.config['slow_threshold_seconds']), interval)
+            trigger.arm()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sampler = trigger.disarm()
+                if sampler is not None:
+                    elapsed = time.perf_counter() - start
+                    logger.warning(
+                        f"Job {job_name} took {elapsed:.1f}s (threshold "
+                        f"{trigger.threshold:g}s); writing profile.")
+                    self._write(job_name, 'collapsed', sampler.collapsed())
+
+        sampler = SamplingProfiler(thread_id, interval)
+        sampler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.stop()
+            self._write(job_name, 'collapsed', sampler.collapsed())
+
+    def _run_cprofile(self, job_name: str, func: Callable, *args, **kwargs):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            path = self._output_path(job_name, 'prof')
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                profiler.dump_stats(path)
+                logger.info(f"Wrote cProfile stats for {job_name} to {path}")
+                self._rotate(job_name, 'prof')
+            except OSError as e:
+                logger.error(f"Failed to write profile for {job_name}: {e}")
+
+    def _output_path(self, job_name: str, ext: str) -> str:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        return os.path.join(self.output_dir, f"{job_name}_{stamp}.{ext}")
+
+    def _write(self, job_name: str, ext: str, content: str) -> Optional[str]:
+        if not content:
+            return None
+        path = self._output_path(job_name, ext)
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(content)
+            logger.info(f"Wrote profile for {job_name} to {path}")
+            self._rotate(job_name, ext)
+            return path
+        except OSError as e:
+            logger.error(f"Failed to write profile for {job_name}: {e}")
+            return None
+
+    def _rotate(self, job_name: str, ext: str) -> None:
+        """Delete all but the newest `max_files` profiles for a job."""
+        files = sorted(glob.glob(os.path.join(
+            self.output_dir, f"{glob.escape(job_name)}_*.{ext}")))
+        for old in files[:-self.max_files] if self.max_files > 0 else []:
+            try:
+                os.remove(old)
+            except OSError as e:
+                logger.warning(f"Could not remove old profile {old}: {e}")
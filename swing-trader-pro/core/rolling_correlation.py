@@ -0,0 +1,198 @@
+# core/rolling_correlation.py
+"""
+Rolling return correlations across a symbol universe, for pair discovery.
+
+The engine keeps the last `window` daily returns of every symbol in a ring
+buffer together with their running means and co-moment matrix. Each new bar
+updates those with Welford-style add/remove steps (two rank-1 updates, O(N^2))
+instead of recomputing O(window * N^2) from scratch. The full co-moment matrix
+is rebuilt with blocked matmuls when the engine is fitted and every
+`resync_every` bars, which also bounds floating-point drift.
+
+The k most correlated partners of every symbol are indexed with
+argpartition after each change, so a pair check is an O(k) lookup.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RollingCorrelation:
+    """
+    Windowed correlation matrix of returns with a top-k partner index.
+    """
+
+    def __init__(self, window: int = 60, top_k: int = 5, min_corr: float = 0.8,
+                 block_size: int = 256, resync_every: Optional[int] = None):
+        """
+        Args:
+            window (int): Returns per symbol in the rolling window.
+            top_k (int): Partners indexed per symbol.
+            min_corr (float): Minimum correlation for a partner.
+            block_size (int): Symbols per block in full recomputations.
+            resync_every (int, optional): Bars between full recomputations;
+                defaults to `window`.
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self.top_k = top_k
+        self.min_corr = min_corr
+        self.block_size = block_size
+        self.resync_every = resync_every or window
+        self.symbols = pd.Index([])
+        self._returns = np.zeros((window, 0))   # ring buffer, one row per bar
+        self._pos = 0
+        self._count = 0
+        self._mean = np.zeros(0)
+        self._comoment = np.zeros((0, 0))
+        self._last_prices = np.zeros(0)
+        self._since_resync = 0
+        self._partners: Optional[Dict[str, List[Tuple[str, float]]]] = None
+
+    def fit(self, prices: pd.DataFrame) -> 'RollingCorrelation':
+        """
+        Set the universe and fill the window from price history.
+
+        Args:
+            prices (pd.DataFrame): Closes indexed by date, one column per symbol.
+
+        Returns:
+            RollingCorrelation: self.
+        """
+        prices = prices.sort_index().ffill()
+        returns = prices.pct_change().iloc[1:].tail(self.window)
+        self.symbols = pd.Index(prices.columns)
+        n = len(self.symbols)
+        self._returns = np.zeros((self.window, n))
+        self._count = len(returns)
+        self._returns[:self._count] = returns.fillna(0.0).to_numpy(float)
+        self._pos = self._count % self.window
+        self._last_prices = prices.iloc[-1].to_numpy(float) if len(prices) else np.full(n, np.nan)
+        self._resync()
+        return self
+
+    def update(self, prices: pd.Series) -> None:
+        """
+        Add one bar of closes; the oldest return leaves the window once it is
+        full.
+
+        Args:
+            prices (pd.Series): Close per symbol. Symbols missing or NaN count
+                as unchanged.
+        """
+        current = prices.reindex(self.symbols).to_numpy(float)
+        current = np.where(np.isnan(current), self._last_prices, current)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = current / self._last_prices - 1.0
+        returns = np.where(np.isfinite(returns), returns, 0.0)
+        self._last_prices = current
+
+        if self._count == self.window:
+            self._remove(self._returns[self._pos])
+        self._returns[self._pos] = returns
+        self._pos = (self._pos + 1) % self.window
+        self._add(returns)
+
+        self._since_resync += 1
+        if self._since_resync >= self.resync_every:
+            self._resync()
+        self._partners = None
+
+    def _add(self, x: np.ndarray) -> None:
+        self._count += 1
+        dx = x - self._mean
+        self._mean += dx / self._count
+        self._comoment += np.outer(dx, x - self._mean)
+
+    def _remove(self, x: np.ndarray) -> None:
+        self._count -= 1
+        if self._count == 0:
+            self._mean[:] = 0.0
+            self._comoment[:] = 0.0
+            return
+        dx = x - self._mean
+        self._mean -= dx / self._count
+        self._comoment -= np.outer(dx, x - self._mean)
+
+    def _resync(self) -> None:
+        """Recompute means and co-moments from the window with blocked matmuls."""
+        window = self._returns[:self._count]
+        n = window.shape[1]
+        self._mean = window.mean(axis=0) if self._count else np.zeros(n)
+        centered = window - self._mean
+        comoment = np.empty((n, n))
+        b = self.block_size
+        for i in range(0, n, b):
+            for j in range(i, n, b):
+                block = centered[:, i:i + b].T @ centered[:, j:j + b]
+                comoment[i:i + b, j:j + b] = block
+                comoment[j:j + b, i:i + b] = block.T
+        self._comoment = comoment
+        self._since_resync = 0
+        self._partners = None
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Current correlation matrix.
+
+        Returns:
+            pd.DataFrame: Symbols x symbols; NaN for symbols whose returns
+            did not vary over the window.
+        """
+        return pd.DataFrame(self._correlation(), index=self.symbols, columns=self.symbols)
+
+    def _correlation(self) -> np.ndarray:
+        scale = np.sqrt(np.clip(np.diag(self._comoment), 0.0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self._comoment / np.outer(scale, scale)
+        corr[~np.isfinite(corr)] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    def partners(self, symbol: str) -> List[Tuple[str, float]]:
+        """
+        The symbol's most correlated partners.
+
+        Returns:
+            list: Up to top_k (symbol, correlation) pairs at or above
+            min_corr, most correlated first.
+        """
+        if self._partners is None:
+            self._partners = self._build_partners()
+        return self._partners.get(symbol, [])
+
+    def has_partners(self, symbols: Iterable[str]) -> np.ndarray:
+        """Whether each symbol has at least one indexed partner."""
+        if self._partners is None:
+            self._partners = self._build_partners()
+        return np.array([bool(self._partners.get(symbol)) for symbol in symbols], dtype=bool)
+
+    def is_pair(self, a: str, b: str) -> bool:
+        """Whether `b` is among `a`'s indexed partners."""
+        return any(partner == b for partner, _ in self.partners(a))
+
+    def _build_partners(self) -> Dict[str, List[Tuple[str, float]]]:
+        n = len(self.symbols)
+        if n < 2 or self._count < 2:
+            return {}
+        corr = self._correlation()
+        np.fill_diagonal(corr, -np.inf)
+        corr = np.where(np.isnan(corr), -np.inf, corr)
+        k = min(self.top_k, n - 1)
+        top = np.argpartition(corr, -k, axis=1)[:, -k:]
+        top_corr = np.take_along_axis(corr, top, axis=1)
+        order = np.argsort(-top_corr, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_corr = np.take_along_axis(top_corr, order, axis=1)
+
+        names = self.symbols.to_numpy()
+        partners = {}
+        for i, symbol in enumerate(names):
+            keep = top_corr[i] >= self.min_corr
+            partners[symbol] = list(zip(names[top[i][keep]].tolist(),
+                                        top_corr[i][keep].tolist()))
+        return partners
@@ -0,0 +1,201 @@
+# core/sentiment_backends.py
+"""
+Pluggable sentiment scoring backends.
+
+Every backend scores a batch of texts to floats in [-1, 1] via score_many().
+All of them run locally on CPU:
+
+    TextBlobBackend  - TextBlob pattern polarity (the original scorer).
+    VaderBackend     - VADER compound score, optionally with a finance lexicon.
+    OnnxBackend      - an exported transformer classifier (e.g. FinBERT) run
+                       with onnxruntime on CPU from local files.
+    CascadeBackend   - scores everything with a cheap backend and re-scores
+                       only the ambiguous (near-neutral) texts with an
+                       expensive one.
+
+Optional dependencies are imported when a backend is built; build_backend()
+falls back to TextBlob when a configured backend cannot be loaded.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from abc import ABC, abstractmethod
+import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentBackend(ABC):
+    """Interface: batch text -> polarity in [-1, 1]."""
+
+    #: Identifies the scorer, e.g. to namespace cached scores
+    name = "base"
+
+    @abstractmethod
+    def score_many(self, texts: Sequence[str]) -> List[float]:
+        """Polarity in [-1, 1] of each text, in order."""
+
+
+class TextBlobBackend(SentimentBackend):
+    name = "textblob"
+
+    def __init__(self):
+        from textblob import TextBlob
+        self._textblob = TextBlob
+
+    def score_many(self, texts: Sequence[str]) -> List[float]:
+        return [self._textblob(text).sentiment.polarity for text in texts]
+
+
+class VaderBackend(SentimentBackend):
+    name = "vader"
+
+    def __init__(self, lexicon_path: Optional[str] = None):
+        """
+        Args:
+            lexicon_path (str, optional): JSON file of {word: valence} merged
+                into VADER's lexicon (valences on VADER's -4..4 scale).
+        """
+        try:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        except ImportError:
+            from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        self._analyzer = SentimentIntensityAnalyzer()
+        if lexicon_path:
+            with open(lexicon_path) as f:
+                terms = json.load(f)
+            self._analyzer.lexicon.update(terms)
+            self.name = f"vader+{len(terms)}"
+            logger.info(f"VADER lexicon updated with {len(terms)} terms")
+
+    def score_many(self, texts: Sequence[str]) -> List[float]:
+        return [self._analyzer.polarity_scores(text)['compound'] for text in texts]
+
+
+class OnnxBackend(SentimentBackend):
+    """
+    Sequence classifier exported to ONNX, scored as P(positive) - P(negative).
+    """
+
+    def __init__(self, model_path: str, tokenizer_path: str,
+                 labels: Sequence[str] = ('positive', 'negative', 'neutral'),
+                 batch_size: int = 32, max_length: int = 64, threads: int = 0):
+        """
+        Args:
+            model_path (str): .onnx file with input_ids/attention_mask inputs
+                and logits as the first output.
+            tokenizer_path (str): tokenizer.json for the `tokenizers` library.
+            labels (sequence): Label of each logit column.
+            batch_size (int): Texts per inference call.
+            max_length (int): Token limit; headlines rarely need more.
+            threads (int): onnxruntime intra-op threads (0 = library default).
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self._session = ort.InferenceSession(
+            model_path, options, providers=['CPUExecutionProvider'])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._tokenizer.enable_truncation(max_length)
+        self._tokenizer.enable_padding()
+        labels = [label.lower() for label in labels]
+        self._pos = labels.index('positive')
+        self._neg = labels.index('negative')
+        self.batch_size = batch_size
+        self.name = f"onnx:{model_path}"
+
+    def score_many(self, texts: Sequence[str]) -> List[float]:
+        scores: List[float] = []
+        for start in range(0, len(texts), self.batch_size):
+            encodings = self._tokenizer.encode_batch(
+                list(texts[start:start + self.batch_size]))
+            feeds = {
+                'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+                'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            }
+            if 'token_type_ids' in self._input_names:
+                feeds['token_type_ids'] = np.array(
+                    [e.type_ids for e in encodings], dtype=np.int64)
+            logits = self._session.run(None, feeds)[0]
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            scores.extend((probs[:, self._pos] - probs[:, self._neg]).tolist())
+        return scores
+
+
+class CascadeBackend(SentimentBackend):
+    """
+    Cheap backend first; texts it scores within `ambiguous_below` of neutral
+    are re-scored by the expensive backend in one batch.
+    """
+
+    def __init__(self, primary: SentimentBackend, fallback: SentimentBackend,
+                 ambiguous_below: float = 0.05):
+        self.primary = primary
+        self.fallback = fallback
+        self.ambiguous_below = ambiguous_below
+        self.name = f"cascade:{primary.name}>{fallback.name}@{ambiguous_below:g}"
+
+    def score_many(self, texts: Sequence[str]) -> List[float]:
+        scores = self.primary.score_many(texts)
+        ambiguous = [i for i, score in enumerate(scores)
+                     if abs(score) < self.ambiguous_below]
+        if ambiguous:
+            rescored = self.fallback.score_many([texts[i] for i in ambiguous])
+            for i, score in zip(ambiguous, rescored):
+                scores[i] = score
+        return scores
+
+
+def _build_single(kind: str, config: Dict[str, Any]) -> SentimentBackend:
+    if kind == 'textblob':
+        return TextBlobBackend()
+    if kind == 'vader':
+        return VaderBackend(**config.get('vader', {}))
+    if kind == 'onnx':
+        return OnnxBackend(**config.get('onnx', {}))
+    raise ValueError(f"Unknown sentiment backend: {kind}")
+
+
+def build_backend(config: Optional[Dict[str, Any]] = None) -> SentimentBackend:
+    """
+    Build the backend described by config (see SENTIMENT_BACKEND_CONFIG).
+
+    Args:
+        config (dict, optional): Defaults to config.news_config.SENTIMENT_BACKEND_CONFIG.
+
+    Returns:
+        SentimentBackend: The configured backend. If it cannot be loaded (missing
+        package or model files) a cascade degrades to its primary, and anything
+        else degrades to TextBlob.
+    """
+    if config is None:
+        from config.news_config import SENTIMENT_BACKEND_CONFIG
+        config = SENTIMENT_BACKEND_CONFIG
+    kind = config.get('backend', 'textblob')
+
+    if kind == 'cascade':
+        cascade = config.get('cascade', {})
+        primary = build_backend({**config, 'backend': cascade.get('primary', 'vader')})
+        try:
+            fallback = _build_single(cascade.get('fallback', 'onnx'), config)
+        except Exception as e:
+            logger.warning(
+                f"Cascade fallback unavailable ({e}); using {primary.name} only")
+            return primary
+        return CascadeBackend(primary, fallback,
+                              cascade.get('ambiguous_below', 0.05))
+
+    try:
+        return _build_single(kind, config)
+    except Exception as e:
+        if kind == 'textblob':
+            raise
+        logger.warning(f"Sentiment backend '{kind}' unavailable ({e}); using textblob")
+        return TextBlobBackend()
@@ -0,0 +1,257 @@
+# core/sentiment_cache.py
+"""
+Cache of sentiment scores keyed by article text.
+
+Scores live in an in-memory LRU backed by a SQLite file with a TTL, so
+headlines seen by earlier runs (or for other symbols in the same run) are not
+scored again. Headlines differing only in punctuation or casing share a key;
+other near-identical text is matched through a 64-bit simhash and reuses the
+cached score.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and keep only word characters, single-spaced."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def simhash(normalized: str) -> int:
+    """
+    64-bit simhash over word unigrams and bigrams.
+
+    Args:
+        normalized (str): Output of normalize().
+
+    Returns:
+        int: Unsigned 64-bit fingerprint.
+    """
+    words = normalized.split()
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(
+            feature.encode(), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+class SentimentCache:
+    """
+    LRU + SQLite cache of text -> sentiment score with near-duplicate lookup.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 7 * 86400,
+                 max_memory: int = 50000, max_distance: int = 3,
+                 namespace: str = "default"):
+        """
+        Args:
+            path (str, optional): SQLite file; None keeps the cache in memory only.
+            ttl_seconds (float): Age after which a stored score is ignored.
+            max_memory (int): Entries kept in the in-memory LRU.
+            max_distance (int): Max simhash Hamming distance treated as the same
+                headline; 0 disables near-duplicate matching. Keep it small:
+                short headlines that differ in one word (e.g. "rises"/"falls")
+                can be only a few bits apart.
+            namespace (str): Scores from different scorers are kept apart by
+                namespace, so several caches can share one file.
+        """
+        self.namespace = namespace
+        self.ttl = ttl_seconds
+        self.max_memory = max_memory
+        self.max_distance = max(0, min(max_distance, 15))
+        # Pigeonhole: fingerprints within max_distance bits agree exactly on at
+        # least one of max_distance + 1 bands
+        self._n_bands = self.max_distance + 1
+        self._band_bits = 64 // self._n_bands
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[str, float]" = OrderedDict()
+        # band value -> {key: fingerprint}, for near-duplicate candidates
+        self._bands: List[Dict[int, Dict[str, int]]] = [
+            {} for _ in range(self._n_bands)]
+        # key -> (created, fingerprint) of every indexed score, oldest first
+        self._entries: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                "key TEXT PRIMARY KEY, simhash INTEGER, score REAL, created REAL)")
+            cutoff = time.time() - self.ttl
+            self._db.execute("DELETE FROM sentiment WHERE created < ?", (cutoff,))
+            self._db.commit()
+            # Fingerprints are small; load them so near-duplicates of stored
+            # headlines are found without a table scan
+            for key, fingerprint, created in self._db.execute(
+                    "SELECT key, simhash, created FROM sentiment "
+                    "WHERE substr(key, 1, ?) = ? ORDER BY created",
+                    (len(self.namespace) + 1, f"{self.namespace}:")):
+                self._index(key, fingerprint & ((1 << 64) - 1), created)
+        except sqlite3.Error as e:
+            logger.error(f"Sentiment cache disabled on disk ({path}): {e}")
+            self._db = None
+
+    def _index(self, key: str, fingerprint: int, created: float) -> None:
+        if key in self._entries:
+            self._forget(key, keep_score=True)
+        self._entries[key] = (created, fingerprint)
+        if self.max_distance <= 0:
+            return
+        for band, value in enumerate(self._band_values(fingerprint)):
+            self._bands[band].setdefault(value, {})[key] = fingerprint
+
+    def _forget(self, key: str, keep_score: bool = False) -> None:
+        """Drop `key` from the indexes (and the LRU unless keep_score)."""
+        entry = self._entries.pop(key, None)
+        if not keep_score:
+            self._lru.pop(key, None)
+        if entry is None or self.max_distance <= 0:
+            return
+        for band, value in enumerate(self._band_values(entry[1])):
+            bucket = self._bands[band].get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._bands[band][value]
+
+    def _expire(self, now: float) -> None:
+        """Forget every score older than the TTL (entries are oldest first)."""
+        while self._entries:
+            key, (created, _) = next(iter(self._entries.items()))
+            if now - created <= self.ttl:
+                break
+            self._forget(key)
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        return [fingerprint >> (band * self._band_bits) & mask
+                for band in range(self._n_bands)]
+
+    def _near_key(self, fingerprint: int, now: float) -> Optional[str]:
+        """Key of an unexpired fingerprint within max_distance bits, if any."""
+        if self.max_distance <= 0:
+            return None
+        for band, value in enumerate(self._band_values(fingerprint)):
+            for key, other in self._bands[band].get(value, {}).items():
+                if (bin(other ^ fingerprint).count('1') <= self.max_distance
+                        and now - self._entries[key][0] <= self.ttl):
+                    return key
+        return None
+
+    def _get(self, key: str, now: float) -> Optional[float]:
+        """Unexpired score stored under `key`, from memory or disk."""
+        entry = self._entries.get(key)
+        if entry is None or now - entry[0] > self.ttl:
+            return None
+        score = self._lru.get(key)
+        if score is not None:
+            self._lru.move_to_end(key)
+            return score
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT score FROM sentiment WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._remember(key, row[0])
+        return row[0]
+
+    def _remember(self, key: str, score: float) -> None:
+        self._lru[key] = score
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory:
+            evicted, _ = self._lru.popitem(last=False)
+            if self._db is None:
+                # Without a file the score is gone, so is its index entry
+                self._forget(evicted)
+
+    def score_many(self, texts: Sequence[str],
+                   scorer: Callable[[List[str]], List[float]]) -> List[float]:
+        """
+        Scores for `texts`, calling `scorer` only for text not seen before.
+
+        Args:
+            texts (sequence): Headlines/articles to score.
+            scorer (callable): Takes a list of texts, returns their scores.
+
+        Returns:
+            list: One score per input text, in order.
+        """
+        now = time.time()
+        results: List[Optional[float]] = [None] * len(texts)
+        # key -> (text, fingerprint, positions); duplicates within the batch score once
+        missing: "OrderedDict[str, Tuple[str, int, List[int]]]" = OrderedDict()
+        with self._lock:
+            self._expire(now)
+            for i, text in enumerate(texts):
+                normalized = normalize(text)
+                key = f"{self.namespace}:{hashlib.sha1(normalized.encode()).hexdigest()}"
+                if key in missing:
+                    missing[key][2].append(i)
+                    continue
+                score = self._get(key, now)
+                if score is not None:
+                    self.hits += 1
+                    results[i] = score
+                    continue
+                fingerprint = simhash(normalized)
+                near = self._near_key(fingerprint, now)
+                score = self._get(near, now) if near is not None else None
+                if score is not None:
+                    self.near_hits += 1
+                    results[i] = score
+                else:
+                    missing[key] = (text, fingerprint, [i])
+            self.misses += len(missing)
+
+        if missing:
+            scores = scorer([text for text, _, _ in missing.values()])
+            with self._lock:
+                rows = []
+                for (key, (_, fingerprint, positions)), score in zip(missing.items(), scores):
+                    for i in positions:
+                        results[i] = score
+                    self._remember(key, score)
+                    self._index(key, fingerprint, now)
+                    rows.append((key, _to_signed(fingerprint), score, now))
+                if self._db is not None:
+                    try:
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?)", rows)
+                        self._db.commit()
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to persist sentiment scores: {e}")
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
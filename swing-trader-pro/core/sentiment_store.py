@@ -0,0 +1,200 @@
+# core/sentiment_store.py
+"""
+Append-only per-symbol sentiment time series.
+
+Each symbol has a binary file of fixed-width records. Besides the raw
+observation every record carries the exponentially time-decayed aggregates
+(weighted sum and total weight) as of that observation, computed incrementally
+on append. That makes the current rolling score an O(1) read of the last
+record, and a historical as-of join a searchsorted over the timestamps plus one
+decay factor - no re-scoring and no replay of the history.
+"""
+from typing import Dict, Optional, Sequence, Union
+from datetime import datetime
+from urllib.parse import quote
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORD_DTYPE = np.dtype([
+    ('ts', '<f8'),          # unix seconds
+    ('score', '<f4'),       # observed sentiment, -1..1
+    ('weight', '<f4'),      # observation weight (e.g. article count)
+    ('agg_sum', '<f8'),     # decayed sum of score * weight as of ts
+    ('agg_weight', '<f8'),  # decayed sum of weight as of ts
+])
+
+Timestamp = Union[float, datetime]
+
+
+def _to_seconds(ts: Optional[Timestamp]) -> float:
+    """Unix seconds; naive datetimes are local time, as datetime.timestamp() reads them."""
+    if ts is None:
+        return time.time()
+    if isinstance(ts, datetime):
+        # pd.Timestamp.timestamp() reads naive times as UTC; go through datetime
+        if hasattr(ts, 'to_pydatetime'):
+            ts = ts.to_pydatetime()
+        return ts.timestamp()
+    return float(ts)
+
+
+class SentimentTimeline:
+    """
+    Per-symbol sentiment history with a time-decayed rolling score.
+    """
+
+    def __init__(self, root: str, half_life_hours: float = 24.0,
+                 min_weight: float = 0.05):
+        """
+        Args:
+            root (str): Directory holding one file per symbol.
+            half_life_hours (float): Half-life of an observation's influence.
+                Fixed per store, since aggregates are stored precomputed.
+            min_weight (float): Below this decayed weight the history is
+                considered stale and the score is None/NaN.
+        """
+        self.root = root
+        self.min_weight = min_weight
+        os.makedirs(root, exist_ok=True)
+        meta_path = os.path.join(root, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get('half_life_hours') != half_life_hours:
+                logger.warning(
+                    f"Sentiment store {root} was built with half-life "
+                    f"{meta.get('half_life_hours')}h; using it instead of {half_life_hours}h")
+            half_life_hours = meta['half_life_hours']
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump({'half_life_hours': half_life_hours,
+                           'record_dtype': RECORD_DTYPE.descr}, f)
+        self.half_life_hours = half_life_hours
+        self._decay = math.log(2) / (half_life_hours * 3600.0)
+        self._last: Dict[str, np.void] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.root, quote(symbol, safe='') + '.bin')
+
+    def _last_record(self, symbol: str) -> Optional[np.void]:
+        """Latest record of a symbol, read from the file tail once and then cached."""
+        record = self._last.get(symbol)
+        if record is not None:
+            return record
+        path = self._path(symbol)
+        if not os.path.exists(path) or os.path.getsize(path) < RECORD_DTYPE.itemsize:
+            return None
+        with open(path, 'rb') as f:
+            f.seek(-RECORD_DTYPE.itemsize, os.SEEK_END)
+            record = np.frombuffer(f.read(RECORD_DTYPE.itemsize), dtype=RECORD_DTYPE)[0]
+        self._last[symbol] = record
+        return record
+
+    def append(self, symbol: str, score: float, ts: Optional[Timestamp] = None,
+               weight: float = 1.0) -> None:
+        """
+        Record an observation.
+
+        Args:
+            symbol (str): Trading symbol.
+            score (float): Sentiment in [-1, 1].
+            ts (float or datetime, optional): Observation time; defaults to now.
+            weight (float): Observation weight.
+
+        Raises:
+            ValueError: If `ts` is older than the symbol's latest observation.
+        """
+        ts = _to_seconds(ts)
+        with self._lock:
+            last = self._last_record(symbol)
+            if last is None:
+                agg_sum, agg_weight = score * weight, weight
+            else:
+                if ts < last['ts']:
+                    raise ValueError(
+                        f"Out-of-order sentiment for {symbol}: {ts} < {last['ts']}")
+                factor = math.exp(-self._decay * (ts - last['ts']))
+                agg_sum = last['agg_sum'] * factor + score * weight
+                agg_weight = last['agg_weight'] * factor + weight
+            record = np.array([(ts, score, weight, agg_sum, agg_weight)],
+                              dtype=RECORD_DTYPE)
+            with open(self._path(symbol), 'ab') as f:
+                f.write(record.tobytes())
+            self._last[symbol] = record[0]
+
+    def score(self, symbol: str, at: Optional[Timestamp] = None) -> Optional[float]:
+        """
+        Current decayed sentiment of a symbol, O(1).
+
+        Args:
+            symbol (str): Trading symbol.
+            at (float or datetime, optional): Evaluation time (>= latest
+                observation); defaults to now.
+
+        Returns:
+            float or None: Recency-weighted mean sentiment, or None without
+            (recent enough) history.
+        """
+        with self._lock:
+            last = self._last_record(symbol)
+        if last is None:
+            return None
+        factor = math.exp(-self._decay * max(0.0, _to_seconds(at) - last['ts']))
+        if last['agg_weight'] * factor < self.min_weight:
+            return None
+        return float(last['agg_sum'] / last['agg_weight'])
+
+    def last_update(self, symbol: str) -> Optional[float]:
+        """Unix time of the latest observation, or None."""
+        with self._lock:
+            last = self._last_record(symbol)
+        return None if last is None else float(last['ts'])
+
+    def history(self, symbol: str) -> np.ndarray:
+        """
+        All records of a symbol as a read-only memory-mapped structured array
+        (fields: ts, score, weight, agg_sum, agg_weight).
+        """
+        path = self._path(symbol)
+        if not os.path.exists(path) or os.path.getsize(path) < RECORD_DTYPE.itemsize:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def asof(self, symbol: str, timestamps: Sequence[Timestamp]) -> np.ndarray:
+        """
+        Decayed sentiment as of each timestamp, e.g. to join onto backtest bars.
+
+        Args:
+            symbol (str): Trading symbol.
+            timestamps (sequence): Query times (floats, datetimes or a
+                DatetimeIndex); need not be sorted.
+
+        Returns:
+            np.ndarray: One float per timestamp, NaN before the first
+            observation or where the history has decayed below min_weight.
+        """
+        if hasattr(timestamps, 'to_pydatetime'):  # pandas DatetimeIndex/Series
+            timestamps = timestamps.to_pydatetime()
+        query = np.array([_to_seconds(t) for t in timestamps], dtype=float)
+        out = np.full(len(query), np.nan)
+        records = self.history(symbol)
+        if len(records) == 0 or len(query) == 0:
+            return out
+        idx = np.searchsorted(records['ts'], query, side='right') - 1
+        valid = idx >= 0
+        rec = records[idx[valid]]
+        weight = rec['agg_weight'] * np.exp(-self._decay * (query[valid] - rec['ts']))
+        values = np.where(weight >= self.min_weight,
+                          rec['agg_sum'] / rec['agg_weight'], np.nan)
+        out[valid] = values
+        return out
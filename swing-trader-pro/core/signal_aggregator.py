@@ -1,6 +1,9 @@
 # core/signal_aggregator.py
 from typing import Dict, Any
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 
 class SignalAggregator:
@@ -51,6 +54,11 @@ class SignalAggregator:
             },
             ...
         }
+
+    For whole universes use the columnar mode (aggregate_scores): each
+    strategy's scores arrive as an array aligned to one symbol index, the
+    composite is a single weight-vector x score-matrix product and top-K
+    selection uses argpartition.
     """
 
     def __init__(self):
@@ -59,6 +67,7 @@ class SignalAggregator:
             'wyckoff': 0.3,
             'quant': 0.3
         }
+        self._weight_vectors: Dict[Tuple[float, ...], np.ndarray] = {}
 
     def aggregate_signals(self, signals: Dict[str, Dict[str, dict]]) -> Dict[str, Any]:
         """
@@ -106,3 +115,109 @@ class SignalAggregator:
                 }
 
         return aggregated
+
+    def aggregate_symbol(self, signals: Dict[str, Optional[dict]]) -> Optional[Dict[str, Any]]:
+        """
+        Composite of one symbol's signals, for streaming use once all of its
+        strategies have reported; same result as aggregate_signals() gives
+        for that symbol.
+
+        Args:
+            signals: Strategy name -> signal dict (None if it had no signal).
+
+        Returns:
+            dict or None: {'composite_score', 'signals'}, or None if no
+            strategy produced a signal.
+        """
+        scored = [(strategy, signal) for strategy, signal in signals.items()
+                  if isinstance(signal, dict)]
+        if not scored:
+            return None
+        return {
+            'composite_score': sum(signal.get('score', 0) * self.strategy_weights.get(strategy, 0)
+                                   for strategy, signal in scored),
+            'signals': [signal for _, signal in scored]
+        }
+
+    def weight_vector(self, strategies: Sequence[str]) -> np.ndarray:
+        """
+        Weights of `strategies` in order (0 for unknown ones). The array is
+        cached by weight values, so changes to strategy_weights apply at once.
+        """
+        key = tuple(self.strategy_weights.get(strategy, 0) for strategy in strategies)
+        weights = self._weight_vectors.get(key)
+        if weights is None:
+            if len(self._weight_vectors) >= 64:
+                self._weight_vectors.clear()
+            weights = self._weight_vectors[key] = np.array(key, dtype=float)
+        return weights
+
+    def composite_scores(self, strategies: Sequence[str], scores: np.ndarray) -> np.ndarray:
+        """
+        Weighted composite of a dense score matrix.
+
+        Args:
+            strategies: Strategy name of each matrix row.
+            scores (np.ndarray): Strategies x symbols; NaN where a strategy
+                has no signal for a symbol.
+
+        Returns:
+            np.ndarray: Composite score per symbol; NaN for symbols no
+            strategy scored.
+        """
+        scores = np.asarray(scores, dtype=float)
+        # fmax/fmin skip NaN, so their sum is the matrix with NaN read as 0
+        # (several times faster than np.where on NaN-heavy arrays)
+        filled = np.fmax(scores, 0.0) + np.fmin(scores, 0.0)
+        composite = self.weight_vector(strategies) @ filled
+        composite[np.isnan(scores).all(axis=0)] = np.nan
+        return composite
+
+    @staticmethod
+    def top_k(composite: np.ndarray, k: int) -> np.ndarray:
+        """
+        Positions of the k highest composite scores, highest first, in
+        O(n + k log k); NaN scores are never selected.
+        """
+        values = np.where(np.isnan(composite), -np.inf, composite)
+        k = min(k, int(np.isfinite(values).sum()))
+        if k <= 0:
+            return np.array([], dtype=int)
+        top = np.argpartition(-values, k - 1)[:k]
+        return top[np.argsort(-values[top], kind='stable')]
+
+    def aggregate_scores(self, scores: Union[Dict[str, np.ndarray], pd.DataFrame],
+                         symbols: Optional[Sequence[str]] = None,
+                         top_k: Optional[int] = None) -> pd.Series:
+        """
+        Columnar aggregation of strategy scores aligned to a symbol index.
+
+        Args:
+            scores: Strategy name -> score array aligned to `symbols`, or a
+                DataFrame with one column per strategy indexed by symbol.
+                NaN means no signal.
+            symbols: Symbol of each array position (ignored for a DataFrame).
+            top_k (int, optional): Keep only the k best symbols.
+
+        Returns:
+            pd.Series: Composite score by symbol, highest first when top_k
+            is given, else in symbol order; symbols without any signal are
+            dropped.
+        """
+        if isinstance(scores, pd.DataFrame):
+            strategies, symbols = list(scores.columns), scores.index
+            matrix = scores.to_numpy(float).T
+        else:
+            strategies = list(scores)
+            if not strategies:
+                return pd.Series(dtype=float, name='composite_score')
+            matrix = np.vstack([np.asarray(scores[strategy], dtype=float)
+                                for strategy in strategies])
+        symbols = np.asarray(symbols if symbols is not None else np.arange(matrix.shape[1]))
+        composite = self.composite_scores(strategies, matrix)
+        if top_k is not None:
+            positions = self.top_k(composite, top_k)
+        else:
+            positions = np.flatnonzero(~np.isnan(composite))
+        return pd.Series(composite[positions], index=symbols[positions],
+                         name='composite_score')
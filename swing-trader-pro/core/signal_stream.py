@@ -0,0 +1,170 @@
+# core/signal_stream.py
+"""
+Streaming signal generation: per-symbol analysis -> bounded execution queue.
+
+Symbols are pulled from the input (a list or a lazy generator) by the
+signal workers. Each worker turns one symbol into at most one order and puts
+it on a bounded queue drained by a single executor thread, so the first
+orders reach the broker while later symbols are still being analysed
+instead of after the whole universe is done.
+
+Both queues are bounded: a slow broker blocks the workers, and busy workers
+block the reader of the input, so nothing piles up in memory.
+
+There is one signal worker by default. More workers call produce()
+concurrently, which is only safe once everything it touches (fetchers,
+caches, strategies) has been checked for shared mutable state.
+
+strategy_orders() builds the per-symbol step for StrategyRouter: strategy
+outputs are consumed from StrategyRouter.stream_signals() as they are
+produced, and the symbol is aggregated as soon as its last strategy reports.
+"""
+from typing import Any, Callable, Dict, Iterable, Optional
+import logging
+import queue
+import threading
+import time
+
+from core.metrics import REGISTRY as METRICS
+from core.signal_aggregator import SignalAggregator
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class SignalStream:
+    """
+    Worker threads producing orders into a bounded execution queue.
+    """
+
+    def __init__(self, produce: Callable[[Any], Optional[Dict[str, Any]]],
+                 execute: Callable[[Dict[str, Any]], Any],
+                 workers: int = 1, queue_size: int = 16):
+        """
+        Args:
+            produce: Turns one input item (a symbol or symbol_data dict) into
+                an order dict, or None for no trade. Called from every
+                worker thread at once, so it must be thread-safe when
+                `workers` > 1.
+            execute: Sends one order to the broker; called from a single
+                executor thread, in the order orders were produced. It must
+                raise when the order is not placed: only orders it returns
+                from count as executed and are timed.
+            workers (int): Signal worker threads. Defaults to 1, which
+                still overlaps analysis with order execution.
+            queue_size (int): Capacity of the input and execution queues.
+        """
+        self.produce = produce
+        self.execute = execute
+        self.workers = workers
+        self.queue_size = queue_size
+
+    def run(self, items: Iterable[Any]) -> Dict[str, int]:
+        """
+        Stream every item through produce() and execute(), returning when
+        the last order has been executed.
+
+        Args:
+            items (iterable): Input items, consumed lazily.
+
+        Returns:
+            dict: Counts of 'symbols', 'orders', 'executed' and 'failed'.
+        """
+        start = time.monotonic()
+        inputs: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        orders: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stats = {'symbols': 0, 'orders': 0, 'executed': 0, 'failed': 0}
+        lock = threading.Lock()
+
+        def work():
+            while True:
+                item = inputs.get()
+                if item is _DONE:
+                    return
+                try:
+                    order = self.produce(item)
+                except Exception as e:
+                    logger.exception(f"Error generating signal for {_label(item)}: {e}")
+                    order = None
+                with lock:
+                    stats['symbols'] += 1
+                    if order:
+                        stats['orders'] += 1
+                if order:
+                    orders.put(order)  # blocks while the executor is behind
+
+        def drain():
+            while True:
+                order = orders.get()
+                if order is _DONE:
+                    return
+                try:
+                    self.execute(order)
+                except Exception as e:
+                    stats['failed'] += 1
+                    METRICS.inc('swing_order_failures_total')
+                    logger.exception(f"Order execution failed for {order.get('symbol')}: {e}")
+                    continue
+                stats['executed'] += 1
+                METRICS.observe('swing_order_latency_seconds', time.monotonic() - start)
+                if stats['executed'] == 1:
+                    logger.info(f"First order ({order.get('symbol')}) sent "
+                                f"{time.monotonic() - start:.2f}s after start")
+
+        executor = threading.Thread(target=drain, name='signal-executor', daemon=True)
+        threads = [threading.Thread(target=work, name=f'signal-worker-{i}', daemon=True)
+                   for i in range(self.workers)]
+        executor.start()
+        for thread in threads:
+            thread.start()
+        try:
+            for item in items:
+                inputs.put(item)  # blocks while the workers are behind
+        finally:
+            for _ in threads:
+                inputs.put(_DONE)
+            for thread in threads:
+                thread.join()
+            orders.put(_DONE)
+            executor.join()
+        logger.info(f"Signal stream: {stats['symbols']} symbols, {stats['orders']} orders, "
+                    f"{stats['executed']} executed, {stats['failed']} failed "
+                    f"in {time.monotonic() - start:.2f}s")
+        return stats
+
+
+def _label(item: Any) -> Any:
+    return item.get('symbol') if isinstance(item, dict) else item
+
+
+def strategy_orders(router, aggregator: Optional[SignalAggregator] = None,
+                    min_score: float = 5.0) -> Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Per-symbol step for SignalStream over a StrategyRouter.
+
+    Args:
+        router: StrategyRouter (anything with stream_signals(symbol_data)).
+        aggregator (SignalAggregator, optional): Strategy weights.
+        min_score (float): Minimum composite score for an order.
+
+    Returns:
+        callable: symbol_data -> order or None. An order is the highest-scoring
+        strategy signal (entry, sl, target, ...) plus 'symbol',
+        'composite_score' and all of the symbol's 'signals'.
+    """
+    aggregator = aggregator or SignalAggregator()
+
+    def produce(symbol_data):
+        signals = {}
+        for strategy, signal in router.stream_signals(symbol_data):
+            signals[strategy] = signal
+        aggregated = aggregator.aggregate_symbol(signals)
+        if not aggregated or aggregated['composite_score'] < min_score:
+            return None
+        best = max(aggregated['signals'], key=lambda signal: signal.get('score', 0))
+        return {**best, 'symbol': symbol_data.get('symbol'),
+                'composite_score': aggregated['composite_score'],
+                'signals': aggregated['signals']}
+
+    return produce
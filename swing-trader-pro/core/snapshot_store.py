@@ -0,0 +1,209 @@
+# core/snapshot_store.py
+"""
+Immutable point-in-time snapshots of pipeline outputs.
+
+Every snapshot is one gzip-compressed pickle written once under a date
+partition (root/YYYY/MM/DD/<key>__<timestamp>.pkl.gz) and never modified, so
+a backtest or post-mortem reads exactly what the live system saw. As-of
+lookups bisect the sorted partition list and then the key's timestamps in
+one partition; listings of past days are cached since they cannot change.
+The partition tree is walked once; afterwards only the partitions from the
+day of that walk onwards, which other processes may still create, are
+checked for.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime, time as dtime, timedelta
+from urllib.parse import quote
+import bisect
+import gzip
+import logging
+import os
+import pickle
+import threading
+
+logger = logging.getLogger(__name__)
+
+_TS_FORMAT = "%Y%m%dT%H%M%S%f"
+_SUFFIX = ".pkl.gz"
+
+
+class SnapshotStore:
+    """
+    Date-partitioned, write-once snapshot files. Safe to share between threads.
+    """
+
+    def __init__(self, root: str, compresslevel: int = 6):
+        """
+        Args:
+            root (str): Directory of the date partitions.
+            compresslevel (int): gzip level (1 fastest .. 9 smallest).
+        """
+        self.root = root
+        self.compresslevel = compresslevel
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._days: Optional[List[date]] = None
+        self._scanned_on: Optional[date] = None  # day of the full partition walk
+        # Past partitions' listings: day -> key -> sorted timestamps
+        self._listings: Dict[date, Dict[str, List[datetime]]] = {}
+
+    def _partition(self, day: date) -> str:
+        return os.path.join(self.root, f"{day:%Y}", f"{day:%m}", f"{day:%d}")
+
+    def _path(self, key: str, ts: datetime) -> str:
+        return os.path.join(self._partition(ts.date()),
+                            f"{quote(key, safe='')}__{ts.strftime(_TS_FORMAT)}{_SUFFIX}")
+
+    def put(self, key: str, payload: Dict[str, Any],
+            ts: Optional[datetime] = None) -> str:
+        """
+        Persist a snapshot.
+
+        Args:
+            key (str): What the snapshot describes, e.g. a symbol.
+            payload (dict): Picklable data; its 'timestamp' is used when `ts`
+                is not given.
+            ts (datetime, optional): Snapshot time; defaults to the payload's
+                'timestamp' or now.
+
+        Returns:
+            str: Path of the snapshot file.
+
+        Raises:
+            FileExistsError: If a snapshot for `key` at `ts` already exists;
+                snapshots are never overwritten.
+        """
+        ts = ts or payload.get('timestamp') or datetime.now()
+        path = self._path(key, ts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = gzip.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL),
+                             compresslevel=self.compresslevel)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        try:
+            # link() fails instead of replacing an existing snapshot
+            os.link(tmp_path, path)
+        finally:
+            os.remove(tmp_path)
+        os.chmod(path, 0o444)
+        with self._lock:
+            if self._days is not None and ts.date() not in self._days:
+                bisect.insort(self._days, ts.date())
+            listing = self._listings.get(ts.date())
+            if listing is not None:
+                bisect.insort(listing.setdefault(quote(key, safe=''), []), ts)
+        return path
+
+    def _all_days(self, until: Optional[date] = None) -> List[date]:
+        """
+        Sorted partition days. If `until` is past the cached ones, the
+        partitions from the day of the full walk up to `until` (and today)
+        are looked up directly.
+        """
+        with self._lock:
+            if self._days is None:
+                days = []
+                for year in _subdirs(self.root):
+                    for month in _subdirs(os.path.join(self.root, year)):
+                        for day in _subdirs(os.path.join(self.root, year, month)):
+                            try:
+                                days.append(date(int(year), int(month), int(day)))
+                            except ValueError:
+                                continue
+                self._days = sorted(days)
+                self._scanned_on = date.today()
+            elif until is not None and (not self._days or self._days[-1] < until):
+                day = self._scanned_on
+                if self._days and self._days[-1] >= day:
+                    day = self._days[-1] + timedelta(days=1)
+                while day <= min(until, date.today()):
+                    if os.path.isdir(self._partition(day)):
+                        self._days.append(day)
+                    day += timedelta(days=1)
+            return self._days
+
+    def _timestamps(self, key: str, day: date) -> List[datetime]:
+        """Sorted snapshot times of `key` on `day`."""
+        with self._lock:
+            listing = self._listings.get(day)
+        if listing is None:
+            listing = {}
+            try:
+                names = os.listdir(self._partition(day))
+            except FileNotFoundError:
+                names = []
+            for name in names:
+                if not name.endswith(_SUFFIX):
+                    continue
+                quoted, _, stamp = name[:-len(_SUFFIX)].rpartition('__')
+                try:
+                    listing.setdefault(quoted, []).append(datetime.strptime(stamp, _TS_FORMAT))
+                except ValueError:
+                    continue
+            for stamps in listing.values():
+                stamps.sort()
+            # Today's partition can still grow from other processes
+            if day < date.today():
+                with self._lock:
+                    self._listings[day] = listing
+        return listing.get(quote(key, safe=''), [])
+
+    def load(self, key: str, ts: datetime) -> Dict[str, Any]:
+        """Read the snapshot of `key` taken at exactly `ts`."""
+        with open(self._path(key, ts), 'rb') as f:
+            return pickle.loads(gzip.decompress(f.read()))
+
+    def asof(self, key: str, when: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        The latest snapshot of `key` taken at or before `when`.
+
+        Args:
+            key (str): Snapshot key, e.g. a symbol.
+            when (datetime or date, optional): Point in time; a date means
+                the end of that day. Defaults to now.
+
+        Returns:
+            dict or None: Snapshot payload, or None if there is none that old.
+        """
+        ts = self.asof_time(key, when)
+        return None if ts is None else self.load(key, ts)
+
+    def asof_time(self, key: str, when: Optional[datetime] = None) -> Optional[datetime]:
+        """Time of the snapshot asof() would return, or None."""
+        if when is None:
+            when = datetime.now()
+        elif not isinstance(when, datetime):
+            when = datetime.combine(when, dtime.max)
+        days = self._all_days(until=when.date())
+        i = bisect.bisect_right(days, when.date())
+        while i > 0:
+            i -= 1
+            stamps = self._timestamps(key, days[i])
+            j = bisect.bisect_right(stamps, when)
+            if j:
+                return stamps[j - 1]
+        return None
+
+    def history(self, key: str, start: Optional[date] = None,
+                end: Optional[date] = None) -> Iterator[Tuple[datetime, Dict[str, Any]]]:
+        """
+        Snapshots of `key` between two dates (inclusive), oldest first, loaded
+        one at a time.
+
+        Yields:
+            tuple: (snapshot time, payload).
+        """
+        days = self._all_days()
+        lo = 0 if start is None else bisect.bisect_left(days, start)
+        hi = len(days) if end is None else bisect.bisect_right(days, end)
+        for day in days[lo:hi]:
+            for ts in self._timestamps(key, day):
+                yield ts, self.load(key, ts)
+
+
+def _subdirs(path: str) -> List[str]:
+    try:
+        return [entry.name for entry in os.scandir(path) if entry.is_dir()]
+    except FileNotFoundError:
+        return []
@@ -0,0 +1,170 @@
+# core/strategy_registry.py
+"""
+Lazy registry of trading strategies.
+
+A strategy is registered by name as a "module:Class" spec together with the
+symbol_data features it reads (e.g. 'close', 'fii_flows'). Nothing is
+imported until a strategy is first used, so a job that runs one strategy does
+not pay for TA-Lib, textblob or the other strategies' modules at startup, and
+the features of the enabled strategies are known without importing any of
+them.
+
+Besides the built-in strategies, installed packages can contribute
+strategies through the 'swing_trader_pro.strategies' entry-point group:
+
+    [project.entry-points."swing_trader_pro.strategies"]
+    breakout = "my_pkg.breakout:BreakoutStrategy"
+
+A plugin class declares its features in a FEATURES attribute, which is read
+when the plugin is loaded.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set
+from importlib import import_module, metadata
+import logging
+import threading
+
+from config.strategy_config import STRATEGY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class StrategySpec:
+    """
+    Where to find a strategy and what it needs.
+    """
+
+    def __init__(self, target: str, features: Optional[Iterable[str]] = None,
+                 kwargs: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            target (str): "package.module:ClassName".
+            features (iterable, optional): symbol_data keys the strategy reads;
+                None means read the class's FEATURES attribute on load.
+            kwargs (dict, optional): Constructor arguments.
+        """
+        self.target = target
+        self.features = None if features is None else frozenset(features)
+        self.kwargs = kwargs or {}
+
+    def load(self) -> type:
+        module_name, _, attr = self.target.partition(':')
+        obj = import_module(module_name)
+        for part in attr.split('.'):
+            obj = getattr(obj, part)
+        return obj
+
+
+BUILTIN_STRATEGIES = {
+    'institutional': StrategySpec(
+        'strategies.institutional.fii_dii_flow:InstitutionalStrategy',
+        features=('symbol', 'close', 'fii_flows', 'oi_changes')),
+    'wyckoff': StrategySpec(
+        'strategies.wyckoff.accumulation:WyckoffAccumulationStrategy',
+        features=('close', 'volume')),
+    'quant': StrategySpec(
+        'strategies.quantitative.trend_momentum:TrendMomentumStrategy',
+        features=('close',)),
+}
+
+
+class StrategyRegistry:
+    """
+    Name -> strategy instance, imported and built on first use. Safe to
+    share between threads.
+    """
+
+    def __init__(self, specs: Optional[Dict[str, StrategySpec]] = None,
+                 enabled: Optional[Iterable[str]] = None,
+                 entry_point_group: Optional[str] = STRATEGY_CONFIG['entry_point_group']):
+        """
+        Args:
+            specs (dict, optional): Name -> StrategySpec; defaults to
+                BUILTIN_STRATEGIES.
+            enabled (iterable, optional): Names to enable; all if None.
+                Defaults to STRATEGY_CONFIG['enabled'].
+            entry_point_group (str, optional): Entry-point group scanned for
+                plugin strategies; None disables plugins.
+        """
+        self.specs: Dict[str, StrategySpec] = dict(BUILTIN_STRATEGIES if specs is None else specs)
+        if entry_point_group:
+            self._discover(entry_point_group)
+        if enabled is None:
+            enabled = STRATEGY_CONFIG['enabled']
+        if enabled is None:
+            self.enabled = list(self.specs)
+        else:
+            self.enabled = [name for name in enabled if name in self.specs]
+            unknown = set(enabled) - set(self.specs)
+            if unknown:
+                logger.warning(f"Unknown strategies ignored: {sorted(unknown)}")
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _discover(self, group: str) -> None:
+        """Register plugin strategies from installed packages' entry points."""
+        try:
+            entry_points = metadata.entry_points(group=group)
+        except Exception as e:
+            logger.warning(f"Could not read '{group}' entry points: {e}")
+            return
+        for entry_point in entry_points:
+            if entry_point.name in self.specs:
+                logger.warning(f"Plugin strategy '{entry_point.name}' shadows a built-in one")
+            self.specs[entry_point.name] = StrategySpec(entry_point.value)
+
+    def register(self, name: str, target: str, features: Optional[Iterable[str]] = None,
+                 enabled: bool = True, **kwargs) -> None:
+        """
+        Register (or replace) a strategy without importing it.
+
+        Args:
+            name (str): Strategy name used by the router and aggregator weights.
+            target (str): "package.module:ClassName".
+            features (iterable, optional): symbol_data keys it reads.
+            enabled (bool): Enable it right away.
+            **kwargs: Constructor arguments.
+        """
+        with self._lock:
+            self.specs[name] = StrategySpec(target, features, kwargs)
+            self._instances.pop(name, None)
+            if enabled and name not in self.enabled:
+                self.enabled.append(name)
+
+    def get(self, name: str) -> Any:
+        """
+        The strategy instance, importing and building it on first use.
+
+        Raises:
+            KeyError: If no strategy of that name is registered.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                spec = self.specs[name]
+                cls = spec.load()
+                if spec.features is None:
+                    spec.features = frozenset(getattr(cls, 'FEATURES', ()))
+                instance = self._instances[name] = cls(**spec.kwargs)
+                logger.debug(f"Loaded strategy '{name}' from {spec.target}")
+            return instance
+
+    def features(self, names: Optional[Iterable[str]] = None) -> Set[str]:
+        """
+        symbol_data features the given (default: enabled) strategies read,
+        so data loaders can skip computing the rest. Plugins without
+        declared features are loaded to read their FEATURES.
+        """
+        needed: Set[str] = set()
+        for name in self.enabled if names is None else names:
+            spec = self.specs[name]
+            if spec.features is None:
+                self.get(name)
+            needed |= spec.features
+        return needed
+
+    def loaded(self) -> List[str]:
+        """Names of the strategies instantiated so far."""
+        return list(self._instances)
@@ -0,0 +1,168 @@
+# core/symbol_matcher.py
+"""
+Multi-pattern symbol matcher for free text (news headlines, feed summaries).
+
+Every symbol, company name and alias is compiled into one Aho-Corasick
+automaton, so a document is scanned once regardless of how many symbols are
+tracked. Matching is case-insensitive and only counts whole words, so "ITC"
+does not match inside "switch". Names of untracked symbols are compiled too:
+a match inside a longer one is dropped, so "SBI" in "SBI Life" is not read as
+SBIN even when SBILIFE is not tracked.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import deque
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+ALIASES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "config", "symbol_aliases.json")
+
+
+def load_aliases(path: str = ALIASES_PATH) -> Dict[str, List[str]]:
+    """
+    Load symbol -> [company name, aliases...] from JSON.
+
+    Returns:
+        dict: Empty if the file is missing or invalid.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load symbol aliases from {path}: {e}")
+        return {}
+
+
+class SymbolMatcher:
+    """
+    Aho-Corasick automaton over symbol names and aliases.
+    """
+
+    def __init__(self, symbols: Iterable[str],
+                 aliases: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            symbols (iterable): Symbols to match; each matches its own ticker.
+            aliases (dict, optional): Symbol -> extra names (company name,
+                short forms). Defaults to config/symbol_aliases.json.
+        """
+        if aliases is None:
+            aliases = load_aliases()
+        self.symbols = list(dict.fromkeys(symbols))
+        self._tracked = set(self.symbols)
+        # Node 0 is the root; per node: transitions, failure link, outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple]] = [[]]
+        for symbol in list(dict.fromkeys(self.symbols + list(aliases))):
+            patterns = list(aliases.get(symbol, []))
+            if symbol in self._tracked:
+                patterns.insert(0, symbol)
+            for pattern in patterns:
+                self._add(pattern.lower(), symbol)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, symbol: str) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append((len(pattern), symbol))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                # Inherit matches that end at the failure state
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def match(self, text: str) -> Set[str]:
+        """
+        Find the symbols mentioned in `text`.
+
+        Args:
+            text (str): Headline or article text.
+
+        Returns:
+            set: Matched symbols.
+        """
+        return {symbol for symbol, _, _ in self.find(text)}
+
+    def find(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """
+        Every whole-word occurrence of a tracked symbol's name in `text` that
+        is not part of a longer matched name.
+
+        Args:
+            text (str): Text to scan.
+
+        Yields:
+            tuple: (symbol, start, end) with `text[start:end]` the matched
+            name or alias, in order of `start`.
+        """
+        # Earliest start first, longest first on ties: a match ending within
+        # the reach of an earlier one is nested in it, unless it is that span
+        matches = sorted(self._scan(text), key=lambda m: (m[1], -m[2]))
+        reach, span = -1, None
+        for symbol, start, end in matches:
+            if end > reach:
+                reach, span = end, (start, end)
+            elif (start, end) != span:
+                continue
+            if symbol in self._tracked:
+                yield symbol, start, end
+
+    def _scan(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Raw whole-word matches of every compiled pattern, in order of end."""
+        text = text.lower()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, symbol in self._out[node]:
+                start = i - length + 1
+                # Whole words only
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if i + 1 < len(text) and text[i + 1].isalnum():
+                    continue
+                yield symbol, start, i + 1
+
+    def index(self, articles: Iterable[Dict[str, str]],
+              fields: Iterable[str] = ('title', 'summary')) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Build an inverted index symbol -> articles that mention it.
+
+        Args:
+            articles (iterable): Article dicts.
+            fields (iterable): Article fields to scan.
+
+        Returns:
+            dict: Every tracked symbol mapped to its (possibly empty) article list.
+        """
+        fields = tuple(fields)
+        by_symbol: Dict[str, List[Dict[str, str]]] = {
+            symbol: [] for symbol in self.symbols}
+        for article in articles:
+            text = " ".join(article.get(field) or '' for field in fields)
+            for symbol in self.match(text):
+                by_symbol[symbol].append(article)
+        return by_symbol
@@ -0,0 +1,168 @@
+# data/block_deal_store.py
+"""
+Persistent, deduplicated store of NSE block deals.
+
+Deals live in one SQLite table whose primary key starts with (symbol, date),
+and the table is clustered on that key (WITHOUT ROWID). A query for a symbol
+over a date range is therefore one B-tree seek plus a scan of the matching
+rows, and re-ingesting an overlapping API response adds nothing twice.
+"""
+from typing import Any, Dict, Iterator, Optional, Union
+from datetime import date, datetime
+import logging
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BLOCK_DEAL_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "nse", "block_deals.sqlite")
+
+# Stored columns (DataFrame and SQLite names match)
+COLUMNS = ['symbol', 'date', 'clientName', 'client_type', 'side', 'qty',
+           'price', 'is_fii']
+
+Day = Union[date, datetime, str, pd.Timestamp]
+
+
+class BlockDealStore:
+    """
+    Block deals indexed by (symbol, date). Safe to share between threads.
+    """
+
+    def __init__(self, path: str = BLOCK_DEAL_STORE_PATH):
+        """
+        Args:
+            path (str): SQLite file; ':memory:' keeps the store in memory.
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS block_deals ("
+            "symbol TEXT NOT NULL, date TEXT NOT NULL, clientName TEXT NOT NULL, "
+            "side TEXT NOT NULL, qty REAL NOT NULL, price REAL NOT NULL, "
+            "is_fii INTEGER NOT NULL, client_type TEXT NOT NULL DEFAULT 'OTHER', "
+            "PRIMARY KEY (symbol, date, clientName, side, qty, price)) WITHOUT ROWID")
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(block_deals)")}
+        if 'client_type' not in existing:
+            self._db.execute("ALTER TABLE block_deals ADD COLUMN "
+                             "client_type TEXT NOT NULL DEFAULT 'OTHER'")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS block_deals_date ON block_deals (date)")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def add(self, deals: pd.DataFrame) -> int:
+        """
+        Store parsed deals (see BlockDealFetcher.parse_deals), skipping ones
+        already present.
+
+        Args:
+            deals (pd.DataFrame): Columns symbol, date, clientName,
+                client_type, side, qty, price, is_fii.
+
+        Returns:
+            int: Number of new deals stored.
+        """
+        if deals.empty:
+            return 0
+        rows = deals[COLUMNS].assign(
+            date=deals['date'].dt.strftime('%Y-%m-%d'),
+            is_fii=deals['is_fii'].astype(int),
+        )
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany(
+                f"INSERT OR IGNORE INTO block_deals ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows.itertuples(index=False, name=None))
+            self._db.commit()
+            added = self._db.total_changes - before
+        if added:
+            logger.info(f"Stored {added} new block deal(s)")
+        return added
+
+    def query(self, symbol: Optional[str] = None, start: Optional[Day] = None,
+              end: Optional[Day] = None, fii_only: bool = False,
+              client_type: Optional[str] = None) -> pd.DataFrame:
+        """
+        Stored deals, optionally for one symbol and an inclusive date range.
+
+        Args:
+            symbol (str, optional): Trading symbol; all symbols if None.
+            start, end (date-like, optional): Date bounds; open if None.
+            fii_only (bool): Only deals by FII clients.
+            client_type (str, optional): Only deals by this client category
+                (see core/client_classifier.py).
+
+        Returns:
+            pd.DataFrame: Columns symbol, date, clientName, client_type, side,
+            qty, price, is_fii, ordered by symbol and date.
+        """
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        if fii_only:
+            clauses.append("is_fii = 1")
+        if client_type is not None:
+            clauses.append("client_type = ?")
+            params.append(client_type)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            deals = pd.read_sql_query(
+                f"SELECT {', '.join(COLUMNS)} FROM block_deals{where} "
+                f"ORDER BY symbol, date", self._db, params=params)
+        deals['date'] = pd.to_datetime(deals['date'])
+        deals['is_fii'] = deals['is_fii'].astype(bool)
+        return deals
+
+    def iter_by_date(self, start: Optional[Day] = None,
+                     end: Optional[Day] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stored deals in date order, read one trading day per query so a long
+        history is never loaded at once (e.g. for a backtest replay).
+
+        Args:
+            start, end (date-like, optional): Inclusive date bounds.
+
+        Yields:
+            dict: One deal (keys as in COLUMNS, 'date' a pd.Timestamp).
+        """
+        day = None if start is None else pd.Timestamp(start).strftime('%Y-%m-%d')
+        last = None if end is None else pd.Timestamp(end).strftime('%Y-%m-%d')
+        op = '>='
+        while True:
+            with self._lock:
+                if day is None:
+                    day = self._db.execute("SELECT min(date) FROM block_deals").fetchone()[0]
+                else:
+                    day = self._db.execute(
+                        f"SELECT min(date) FROM block_deals WHERE date {op} ?",
+                        (day,)).fetchone()[0]
+                if day is None or (last is not None and day > last):
+                    return
+                rows = self._db.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM block_deals WHERE date = ? "
+                    f"ORDER BY symbol", (day,)).fetchall()
+            op = '>'
+            timestamp = pd.Timestamp(day)
+            for row in rows:
+                deal = dict(zip(COLUMNS, row))
+                deal['date'] = timestamp
+                deal['is_fii'] = bool(deal['is_fii'])
+                yield deal
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,222 @@
+# data/fii_dii_store.py
+"""
+Local columnar store of daily FII/DII net investment.
+
+Each segment (e.g. 'cash', 'derivatives') is a directory holding one raw
+binary file per column - date (datetime64[D]), fii_net and dii_net (float64) -
+kept sorted by date. New trading days are appended to the end of every
+column, so a daily refresh writes a few dozen bytes, and reads are
+memory-mapped: a date-range query is two binary searches and returns slices
+of the mapped columns without copying, which keeps multi-year backtests cheap.
+
+Out-of-order rows (a backfill) rewrite the segment: every column is written
+to a .tmp file, a commit marker is created once all of them are on disk, and
+only then are the files renamed into place. If the process dies during the
+renames the next access finishes them, so a crash leaves either the old or
+the new columns, never a mix.
+"""
+from typing import Dict, Iterable, Optional, Tuple, Union
+from datetime import date, datetime
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FII_DII_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "nsdl")
+
+# Column name -> on-disk dtype. 'date' is written last on append, so a torn
+# write leaves it the shortest column and the row is ignored.
+COLUMNS = {
+    'fii_net': np.dtype('<f8'),
+    'dii_net': np.dtype('<f8'),
+    'date': np.dtype('<M8[D]'),
+}
+
+Day = Union[date, datetime, str, np.datetime64]
+
+
+def to_day(value: Day) -> np.datetime64:
+    """Date-like value -> numpy day."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, 'D')
+
+
+class FiiDiiStore:
+    """
+    Date-sorted FII/DII columns per segment. Safe to share between threads.
+    """
+
+    def __init__(self, root: str = FII_DII_STORE_PATH):
+        """
+        Args:
+            root (str): Directory holding one sub-directory per segment.
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.RLock()
+
+    def _path(self, segment: str, column: str) -> str:
+        return os.path.join(self.root, segment, f"{column}.bin")
+
+    def _marker(self, segment: str) -> str:
+        return os.path.join(self.root, segment, "rewrite.commit")
+
+    def _lengths(self, segment: str) -> Dict[str, int]:
+        lengths = {}
+        for column, dtype in COLUMNS.items():
+            path = self._path(segment, column)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths[column] = size // dtype.itemsize
+        return lengths
+
+    def columns(self, segment: str = 'cash') -> Dict[str, np.ndarray]:
+        """
+        All stored days of a segment, oldest first.
+
+        Returns:
+            dict: Column name -> read-only memory-mapped array ('date' as
+            datetime64[D], 'fii_net', 'dii_net'), all of the same length.
+        """
+        with self._lock:
+            self._recover(segment)
+            count = min(self._lengths(segment).values())
+        if count == 0:
+            return {column: np.empty(0, dtype=dtype)
+                    for column, dtype in COLUMNS.items()}
+        return {column: np.memmap(self._path(segment, column), dtype=dtype,
+                                  mode='r', shape=(count,))
+                for column, dtype in COLUMNS.items()}
+
+    def count(self, segment: str = 'cash') -> int:
+        """Number of stored days."""
+        with self._lock:
+            self._recover(segment)
+            return min(self._lengths(segment).values())
+
+    def first(self, segment: str = 'cash') -> Optional[date]:
+        """Oldest stored date, or None if the segment is empty."""
+        dates = self.columns(segment)['date']
+        return dates[0].astype(date) if len(dates) else None
+
+    def latest(self, segment: str = 'cash') -> Optional[date]:
+        """Most recent stored date, or None if the segment is empty."""
+        dates = self.columns(segment)['date']
+        return dates[-1].astype(date) if len(dates) else None
+
+    def update(self, rows: Iterable[Tuple[Day, float, float]],
+               segment: str = 'cash') -> int:
+        """
+        Add (date, fii_net, dii_net) rows, ignoring dates already stored.
+
+        Rows newer than the stored history are appended; older ones (e.g. a
+        backfill) trigger a rewrite of the segment in date order.
+
+        Args:
+            rows (iterable): (date, fii_net, dii_net) in any order.
+            segment (str): Segment name.
+
+        Returns:
+            int: Number of new dates stored.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        dates = np.array([to_day(row[0]) for row in rows], dtype=COLUMNS['date'])
+        new = {
+            'date': dates,
+            'fii_net': np.array([row[1] for row in rows], dtype=COLUMNS['fii_net']),
+            'dii_net': np.array([row[2] for row in rows], dtype=COLUMNS['dii_net']),
+        }
+        with self._lock:
+            os.makedirs(os.path.join(self.root, segment), exist_ok=True)
+            existing = self.columns(segment)
+            # First occurrence of each new date, in date order, minus stored dates
+            _, keep = np.unique(dates, return_index=True)
+            keep = keep[~np.isin(dates[keep], existing['date'])]
+            if len(keep) == 0:
+                return 0
+            new = {column: values[keep] for column, values in new.items()}
+            if len(existing['date']) == 0 or new['date'][0] > existing['date'][-1]:
+                self._append(segment, new, len(existing['date']))
+            else:
+                merged = {column: np.concatenate([existing[column], new[column]])
+                          for column in COLUMNS}
+                order = np.argsort(merged['date'], kind='stable')
+                self._rewrite(segment, {column: values[order]
+                                        for column, values in merged.items()})
+        logger.info(f"Stored {len(keep)} new FII/DII day(s) for {segment}")
+        return len(keep)
+
+    def _append(self, segment: str, new: Dict[str, np.ndarray], count: int) -> None:
+        for column, dtype in COLUMNS.items():
+            with open(self._path(segment, column), 'ab') as f:
+                # Drop the tail of a previously torn append before extending
+                f.truncate(count * dtype.itemsize)
+                f.write(new[column].tobytes())
+
+    def _rewrite(self, segment: str, data: Dict[str, np.ndarray]) -> None:
+        for column in COLUMNS:
+            with open(self._path(segment, column) + '.tmp', 'wb') as f:
+                f.write(data[column].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        # From here on the rewrite is committed; _recover() completes it
+        marker = self._marker(segment)
+        with open(marker + '.tmp', 'wb') as f:
+            os.fsync(f.fileno())
+        os.replace(marker + '.tmp', marker)
+        self._recover(segment)
+
+    def _recover(self, segment: str) -> None:
+        """Finish a committed rewrite interrupted before all renames were done."""
+        marker = self._marker(segment)
+        if not os.path.exists(marker):
+            return  # leftover .tmp files of an uncommitted rewrite are ignored
+        for column in COLUMNS:
+            try:
+                os.replace(self._path(segment, column) + '.tmp',
+                           self._path(segment, column))
+            except FileNotFoundError:
+                pass  # already renamed
+        try:
+            os.remove(marker)
+        except FileNotFoundError:
+            pass
+
+    def range(self, start: Optional[Day] = None, end: Optional[Day] = None,
+              segment: str = 'cash') -> Dict[str, np.ndarray]:
+        """
+        Days within [start, end], oldest first, as zero-copy views.
+
+        Args:
+            start, end (date-like, optional): Inclusive bounds; open if None.
+            segment (str): Segment name.
+
+        Returns:
+            dict: Column name -> read-only slice of the memory-mapped column.
+        """
+        columns = self.columns(segment)
+        dates = columns['date']
+        lo = 0 if start is None else int(np.searchsorted(dates, to_day(start), 'left'))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, to_day(end), 'right'))
+        return {column: values[lo:hi] for column, values in columns.items()}
+
+    def tail(self, n: int, segment: str = 'cash') -> pd.DataFrame:
+        """
+        The latest `n` days, newest first.
+
+        Returns:
+            pd.DataFrame: Columns ['date', 'fii_net', 'dii_net'].
+        """
+        columns = self.columns(segment)
+        count = min(max(n, 0), len(columns['date']))
+        return pd.DataFrame({
+            column: np.asarray(columns[column][len(columns['date']) - count:][::-1])
+            for column in ('date', 'fii_net', 'dii_net')
+        })
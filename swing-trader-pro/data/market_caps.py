@@ -0,0 +1,89 @@
+# data/market_caps.py
+"""
+Market-cap classification table.
+
+The table is loaded once from config/market_caps.csv into a symbol-indexed
+pandas Series so single lookups are O(1) dict hits and whole universes can be
+classified with one vectorized map/reindex.
+"""
+from typing import Iterable, Optional
+import logging
+import os
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MARKET_CAPS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "config", "market_caps.csv")
+
+# SEBI categorisation by full market-cap rank
+LARGE_CAP_RANK = 100
+MID_CAP_RANK = 250
+
+
+class MarketCapIndex:
+    """
+    Symbol -> cap type ('large', 'mid', 'small') lookup.
+    """
+
+    def __init__(self, path: str = MARKET_CAPS_PATH, default: str = 'small'):
+        """
+        Args:
+            path (str): CSV with a 'symbol' column and either a 'cap_type'
+                column or a 'market_cap' column (classified by rank: top 100
+                large, next 150 mid, rest small). Rows with an explicit
+                cap_type keep it.
+            default (str): Cap type for symbols missing from the table.
+        """
+        self.default = default
+        self.cap_types = self._load(path)
+        self._lookup = self.cap_types.to_dict()
+
+    @staticmethod
+    def _load(path: str) -> pd.Series:
+        try:
+            table = pd.read_csv(path, comment='#')
+        except Exception as e:
+            logger.warning(f"Could not load market-cap table {path}: {e}")
+            return pd.Series(dtype=object, name='cap_type')
+
+        table['symbol'] = table['symbol'].astype(str).str.strip().str.upper()
+        table = table.drop_duplicates('symbol', keep='last').set_index('symbol')
+        cap_type = (table['cap_type'].astype(object) if 'cap_type' in table
+                    else pd.Series(None, index=table.index, dtype=object))
+        if 'market_cap' in table:
+            rank = table['market_cap'].rank(ascending=False, method='first')
+            by_rank = pd.Series('small', index=table.index, dtype=object)
+            by_rank[rank <= MID_CAP_RANK] = 'mid'
+            by_rank[rank <= LARGE_CAP_RANK] = 'large'
+            cap_type = cap_type.where(cap_type.notna(), by_rank)
+        return cap_type.dropna().rename('cap_type')
+
+    def get(self, symbol: str) -> str:
+        """Cap type of one symbol."""
+        return self._lookup.get(symbol, self.default)
+
+    def classify(self, symbols: Iterable[str]) -> pd.Series:
+        """
+        Cap types for many symbols at once.
+
+        Args:
+            symbols (iterable): Symbols (e.g. a DataFrame index).
+
+        Returns:
+            pd.Series: Cap type indexed by symbol.
+        """
+        index = pd.Index(symbols)
+        return self.cap_types.reindex(index).fillna(self.default)
+
+
+_default_index: Optional[MarketCapIndex] = None
+
+
+def default_index() -> MarketCapIndex:
+    """Process-wide MarketCapIndex over config/market_caps.csv, loaded once."""
+    global _default_index
+    if _default_index is None:
+        _default_index = MarketCapIndex()
+    return _default_index
@@ -0,0 +1,345 @@
+# data/oi_chain_store.py
+"""
+Open-interest chains of index/stock derivatives, kept as arrays.
+
+Every contract of an underlying - (expiry, strike, type) with type CE, PE or
+FUT - owns a slot in a set of float arrays: current OI, the previous
+session's closing OI and the OI first seen in the current session. A new
+chain snapshot is aligned to the slots with one index lookup and updates the
+running totals by its deltas, so day-over-day and intraday OI changes and PCR
+are maintained incrementally. Max pain is recomputed only for the expiries a
+snapshot touched, in O(strikes) with prefix sums. Readers get the cached
+summary without any recomputation.
+
+Each session's closing state is saved as an .npz per underlying so the
+day-over-day change survives restarts.
+"""
+from typing import Any, Dict, Optional
+from datetime import date, datetime
+import glob
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OI_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "nse", "oi")
+
+CONTRACT_TYPES = ('CE', 'PE', 'FUT')
+
+
+def parse_nse_option_chain(payload: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Flatten an NSE option-chain API response.
+
+    Args:
+        payload (dict): JSON of /api/option-chain-indices or
+            /api/option-chain-equities.
+
+    Returns:
+        pd.DataFrame: Columns expiry, strike, type ('CE'/'PE'), oi.
+    """
+    rows = payload.get('records', {}).get('data', [])
+    frame = pd.json_normalize(rows)
+    parts = []
+    for kind in ('CE', 'PE'):
+        column = f'{kind}.openInterest'
+        if column not in frame:
+            continue
+        part = frame[['expiryDate', 'strikePrice', column]].dropna(subset=[column])
+        parts.append(pd.DataFrame({
+            'expiry': part['expiryDate'],
+            'strike': part['strikePrice'],
+            'type': kind,
+            'oi': part[column],
+        }))
+    if not parts:
+        return pd.DataFrame(columns=['expiry', 'strike', 'type', 'oi'])
+    return pd.concat(parts, ignore_index=True)
+
+
+class _Chain:
+    """Array state of one underlying."""
+
+    def __init__(self):
+        self.keys = pd.MultiIndex.from_arrays(
+            [np.array([], dtype='datetime64[D]'), np.array([], dtype=float),
+             np.array([], dtype=object)], names=['expiry', 'strike', 'type'])
+        self.oi = np.zeros(0)
+        self.prev_close = np.zeros(0)
+        self.day_open = np.zeros(0)
+        self.day: Optional[date] = None
+        self.timestamp: Optional[datetime] = None
+        self.total = 0.0
+        self.prev_total = 0.0
+        self.open_total = 0.0
+        self.last_change = 0.0
+        self.by_type = {kind: 0.0 for kind in CONTRACT_TYPES}
+        self.expiries: Dict[np.datetime64, Dict[str, float]] = {}
+
+    def grow(self, new_keys: pd.MultiIndex) -> None:
+        self.keys = self.keys.append(new_keys)
+        pad = np.zeros(len(new_keys))
+        self.oi = np.concatenate([self.oi, pad])
+        self.prev_close = np.concatenate([self.prev_close, pad])
+        self.day_open = np.concatenate([self.day_open, np.full(len(new_keys), np.nan)])
+
+
+class OIChainStore:
+    """
+    Per-underlying OI arrays with incrementally maintained changes, PCR and
+    max pain. Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = OI_STORE_PATH):
+        """
+        Args:
+            path (str, optional): Directory for the per-session closing
+                states; None keeps everything in memory.
+        """
+        self.path = path
+        self._chains: Dict[str, _Chain] = {}
+        self._lock = threading.Lock()
+
+    def ingest(self, underlying: str, chain: pd.DataFrame,
+               ts: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Apply an OI snapshot.
+
+        Args:
+            underlying (str): e.g. 'NIFTY'.
+            chain (pd.DataFrame): Columns expiry, strike, type ('CE', 'PE' or
+                'FUT'; strike is ignored for futures) and oi. Contracts missing
+                from the snapshot keep their last OI.
+            ts (datetime, optional): Snapshot time; defaults to now.
+
+        Returns:
+            dict: The updated summary (see summary()).
+
+        Raises:
+            ValueError: If the snapshot belongs to an earlier session than
+                the underlying's current one.
+        """
+        ts = ts or datetime.now()
+        types = chain['type'].astype(str).str.upper()
+        keys = pd.MultiIndex.from_arrays([
+            pd.to_datetime(chain['expiry'], dayfirst=True).values.astype('datetime64[D]'),
+            np.where(types == 'FUT', 0.0, pd.to_numeric(chain['strike'], errors='coerce')),
+            types.values,
+        ], names=['expiry', 'strike', 'type'])
+        values = pd.to_numeric(chain['oi'], errors='coerce').fillna(0.0).to_numpy(float)
+        unique = ~keys.duplicated(keep='last')
+        keys, values = keys[unique], values[unique]
+        types = keys.get_level_values('type')
+
+        with self._lock:
+            state = self._chains.get(underlying)
+            if state is None:
+                state = self._chains[underlying] = _Chain()
+                self._restore(underlying, state, ts.date())
+            if state.day is not None and ts.date() < state.day:
+                raise ValueError(
+                    f"OI snapshot of {underlying} for {ts.date()} is older than session {state.day}")
+            if state.day != ts.date():
+                self._roll(underlying, state, ts.date())
+
+            slots = state.keys.get_indexer(keys)
+            new = slots < 0
+            if new.any():
+                new_keys = keys[new].unique()
+                state.grow(new_keys)
+                slots = state.keys.get_indexer(keys)
+
+            delta = values - state.oi[slots]
+            state.oi[slots] = values
+            first_seen = np.isnan(state.day_open[slots])
+            state.day_open[slots[first_seen]] = values[first_seen]
+
+            change = float(delta.sum())
+            state.total += change
+            state.last_change = change
+            for kind in CONTRACT_TYPES:
+                state.by_type[kind] += float(delta[types == kind].sum())
+            if state.timestamp is None or state.timestamp.date() != ts.date():
+                state.open_total = state.total
+            state.timestamp = ts
+            self._update_expiries(state, np.unique(keys.get_level_values('expiry').values))
+            return self._summary(state)
+
+    def _roll(self, underlying: str, state: _Chain, day: date) -> None:
+        """Start a new session: the current OI becomes the previous close."""
+        if state.day is not None:
+            self._save(underlying, state)
+        # Expired contracts are dropped from both sides of the day-over-day comparison
+        live = state.keys.get_level_values('expiry').values >= np.datetime64(day, 'D')
+        state.keys = state.keys[live]
+        state.oi = state.oi[live]
+        state.prev_close = state.oi.copy()
+        state.day_open = np.full(len(state.oi), np.nan)
+        state.total = float(state.oi.sum())
+        state.prev_total = state.total
+        types = state.keys.get_level_values('type')
+        state.by_type = {kind: float(state.oi[types == kind].sum()) for kind in CONTRACT_TYPES}
+        state.expiries = {expiry: stats for expiry, stats in state.expiries.items()
+                          if expiry >= np.datetime64(day, 'D')}
+        state.day = day
+
+    def _update_expiries(self, state: _Chain, expiries: np.ndarray) -> None:
+        """Recompute PCR and max pain of the given expiries."""
+        levels = state.keys
+        expiry_values = levels.get_level_values('expiry').values
+        types = levels.get_level_values('type')
+        strikes = levels.get_level_values('strike').values
+        for expiry in expiries:
+            in_expiry = expiry_values == expiry
+            calls = in_expiry & (types == 'CE')
+            puts = in_expiry & (types == 'PE')
+            call_oi, put_oi = state.oi[calls].sum(), state.oi[puts].sum()
+            stats = {
+                'total_oi': float(state.oi[in_expiry].sum()),
+                'pcr': float(put_oi / call_oi) if call_oi else None,
+                'max_pain': None,
+            }
+            if calls.any() or puts.any():
+                stats['max_pain'] = _max_pain(strikes[calls], state.oi[calls],
+                                              strikes[puts], state.oi[puts])
+            state.expiries[expiry] = stats
+
+    def summary(self, underlying: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached OI summary of an underlying.
+
+        Returns:
+            dict or None: None before the first snapshot; otherwise
+                timestamp, total_oi, oi_change and oi_pct_change (vs the
+                previous session's close; the pct as a fraction), intraday_oi_change
+                (vs the session's first snapshot), last_oi_change (vs the
+                previous snapshot), pcr, futures_oi and expiries
+                ({expiry date: {'total_oi', 'pcr', 'max_pain'}}).
+        """
+        with self._lock:
+            state = self._chains.get(underlying)
+            return None if state is None or state.timestamp is None else self._summary(state)
+
+    @staticmethod
+    def _summary(state: _Chain) -> Dict[str, Any]:
+        change = state.total - state.prev_total
+        calls, puts = state.by_type['CE'], state.by_type['PE']
+        return {
+            'timestamp': state.timestamp,
+            'total_oi': state.total,
+            'oi_change': change,
+            'oi_pct_change': change / state.prev_total if state.prev_total else None,
+            'intraday_oi_change': state.total - state.open_total,
+            'last_oi_change': state.last_change,
+            'pcr': puts / calls if calls else None,
+            'futures_oi': state.by_type['FUT'],
+            'expiries': {pd.Timestamp(expiry).date(): dict(stats)
+                         for expiry, stats in sorted(state.expiries.items())},
+        }
+
+    def deltas(self, underlying: str) -> pd.DataFrame:
+        """
+        Per-contract OI with day-over-day and intraday changes.
+
+        Returns:
+            pd.DataFrame: Indexed by (expiry, strike, type); columns oi,
+            oi_change (vs previous close) and intraday_oi_change (vs the
+            session's first snapshot).
+        """
+        with self._lock:
+            state = self._chains.get(underlying)
+            if state is None:
+                return pd.DataFrame(columns=['oi', 'oi_change', 'intraday_oi_change'])
+            return pd.DataFrame({
+                'oi': state.oi.copy(),
+                'oi_change': state.oi - state.prev_close,
+                'intraday_oi_change': state.oi - np.where(
+                    np.isnan(state.day_open), state.oi, state.day_open),
+            }, index=state.keys.copy())
+
+    def oi_changes(self, symbol: Optional[str] = None, index: str = 'NIFTY') -> Dict[str, Any]:
+        """
+        OI inputs for HedgeDetector/strategies: the symbol's own summary (if
+        it has a chain) plus 'nifty_oi_pct_change' from the index chain.
+        """
+        data = dict(self.summary(symbol) or {}) if symbol else {}
+        index_summary = self.summary(index)
+        if index_summary and index_summary['oi_pct_change'] is not None:
+            data['nifty_oi_pct_change'] = index_summary['oi_pct_change']
+        return data
+
+    # --- Persistence of session closes ---
+    def _save(self, underlying: str, state: _Chain) -> None:
+        if not self.path or state.day is None:
+            return
+        try:
+            directory = os.path.join(self.path, underlying)
+            os.makedirs(directory, exist_ok=True)
+            np.savez_compressed(
+                os.path.join(directory, f"{state.day:%Y-%m-%d}.npz"),
+                expiry=state.keys.get_level_values('expiry').values.astype('datetime64[D]'),
+                strike=state.keys.get_level_values('strike').values.astype(float),
+                type=np.asarray(state.keys.get_level_values('type'), dtype=str),
+                oi=state.oi)
+        except Exception as e:
+            logger.error(f"Could not save OI close of {underlying}: {e}")
+
+    def _restore(self, underlying: str, state: _Chain, day: date) -> None:
+        """Load the latest saved session before `day` as the current state."""
+        if not self.path:
+            return
+        files = sorted(glob.glob(os.path.join(self.path, underlying, "*.npz")))
+        files = [f for f in files if os.path.basename(f)[:-4] < f"{day:%Y-%m-%d}"]
+        if not files:
+            return
+        try:
+            with np.load(files[-1]) as saved:
+                keys = pd.MultiIndex.from_arrays(
+                    [saved['expiry'], saved['strike'], saved['type'].astype(object)],
+                    names=['expiry', 'strike', 'type'])
+                state.grow(keys)
+                state.oi[:] = saved['oi']
+            state.day = datetime.strptime(os.path.basename(files[-1])[:-4], "%Y-%m-%d").date()
+            state.total = float(state.oi.sum())
+        except Exception as e:
+            logger.error(f"Could not restore OI close of {underlying}: {e}")
+
+    def close_day(self) -> None:
+        """Save every underlying's current state as its session close."""
+        with self._lock:
+            for underlying, state in self._chains.items():
+                self._save(underlying, state)
+
+
+def _max_pain(call_strikes: np.ndarray, call_oi: np.ndarray,
+              put_strikes: np.ndarray, put_oi: np.ndarray) -> float:
+    """
+    Strike at which option writers pay the least at expiry:
+    argmin over K of sum(c * max(K - s, 0)) + sum(p * max(s - K, 0)).
+    """
+    strikes = np.union1d(call_strikes, put_strikes)
+    c = np.zeros(len(strikes))
+    p = np.zeros(len(strikes))
+    np.add.at(c, np.searchsorted(strikes, call_strikes), call_oi)
+    np.add.at(p, np.searchsorted(strikes, put_strikes), put_oi)
+    # Calls below K: K * sum(c) - sum(c * s); puts above K: sum(p * s) - K * sum(p)
+    c_cum, cs_cum = np.cumsum(c), np.cumsum(c * strikes)
+    p_rev, ps_rev = np.cumsum(p[::-1])[::-1], np.cumsum((p * strikes)[::-1])[::-1]
+    pain = strikes * c_cum - cs_cum + ps_rev - strikes * p_rev
+    return float(strikes[int(np.argmin(pain))])
+
+
+_default_store: Optional[OIChainStore] = None
+
+
+def default_oi_store() -> OIChainStore:
+    """Process-wide OIChainStore, shared by the NSE fetcher and its readers."""
+    global _default_store
+    if _default_store is None:
+        _default_store = OIChainStore()
+    return _default_store
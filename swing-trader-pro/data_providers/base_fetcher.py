@@ -1,9 +1,17 @@
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Tuple
+from collections import OrderedDict
 from tenacity import retry, stop_after_attempt, wait_exponential
 import requests_cache
 import requests
 import logging
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, date
+from zoneinfo import ZoneInfo
+from core.metrics import REGISTRY as METRICS
+
+# requests_cache.install_cache() below swaps requests.Session for a caching
+# session; conditional GETs need to reach the server, so keep the original.
+_PlainSession = requests.Session
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -69,14 +77,121 @@ requests_cache.install_cache(
 )
 
 
+MARKET_TZ = ZoneInfo("Asia/Kolkata")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def shared_session() -> requests.Session:
+    """
+    Process-wide keep-alive session (not routed through requests_cache) used
+    for conditional requests; asks for gzip/deflate bodies.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _PlainSession()
+            _session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        return _session
+
+
+def trading_date(now: Optional[datetime] = None) -> date:
+    """
+    Current NSE trading date: today in IST, rolled back from weekends to Friday.
+    (Exchange holidays are not modelled.)
+    """
+    now = now.astimezone(MARKET_TZ) if now else datetime.now(MARKET_TZ)
+    day = now.date()
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def _record_retry(retry_state) -> None:
+    """tenacity before_sleep hook: count retries per fetch method."""
+    METRICS.inc('swing_http_retries_total',
+                method=getattr(retry_state.fn, '__name__', 'unknown'))
+
+
 class BaseFetcher:
     """Base class with common data fetching utilities and fallback support."""
 
+    # url -> validators and last body for conditional GETs, shared by all
+    # fetchers; least recently used first, at most MAX_VALIDATORS urls
+    _validators: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+    _validators_lock = threading.Lock()
+    MAX_VALIDATORS = 128
+
     def __init__(self, timeout: int = 10, max_retries: int = 3):
         self.timeout = timeout
         self.max_retries = max_retries
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    def fetch_conditional(self, url: str,
+                          headers: Optional[Dict[str, str]] = None) -> Tuple[bytes, bool]:
+        """
+        GET a URL over the shared session, revalidating the previous copy with
+        If-None-Match/If-Modified-Since so an unchanged resource costs a 304.
+        Retried like _fetch_url(); once the retries are exhausted the local
+        fallback copy is used if there is one.
+
+        Args:
+            url (str): Resource URL.
+            headers (dict, optional): Extra request headers.
+
+        Returns:
+            tuple: (body bytes, modified). `modified` is False when the server
+            answered 304 and the body is the previously downloaded one.
+        """
+        try:
+            return self._fetch_conditional(url, headers)
+        except Exception as e:
+            fallback = self._load_fallback_data(self._generate_cache_key(url, headers))
+            if fallback is not None:
+                logger.warning(f"Loaded fallback data for {url} after: {e}")
+                return fallback.content, True
+            raise
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           before_sleep=_record_retry)
+    def _fetch_conditional(self, url: str,
+                           headers: Optional[Dict[str, str]] = None) -> Tuple[bytes, bool]:
+        """One conditional GET attempt (see fetch_conditional())."""
+        request_headers = dict(headers or {})
+        with self._validators_lock:
+            previous = self._validators.get(url)
+            if previous:
+                self._validators.move_to_end(url)
+        if previous:
+            if previous.get('etag'):
+                request_headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                request_headers['If-Modified-Since'] = previous['last_modified']
+        try:
+            response = shared_session().get(
+                url, headers=request_headers, timeout=self.timeout)
+            if response.status_code == 304 and previous:
+                METRICS.inc('swing_http_cache_total', result='not_modified')
+                return previous['content'], False
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Conditional request failed for {url}: {str(e)}")
+            raise
+        self._record_response(response)
+        if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+            with self._validators_lock:
+                self._validators[url] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'content': response.content,
+                }
+                self._validators.move_to_end(url)
+                while len(self._validators) > self.MAX_VALIDATORS:
+                    self._validators.popitem(last=False)
+        return response.content, True
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           before_sleep=_record_retry)
     def _fetch_url(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
         """
         Fetch a URL with GET, retrying on failure. Falls back to local cache if all retries fail.
@@ -86,6 +201,7 @@ class BaseFetcher:
                 url, headers=headers or {}, timeout=self.timeout)
             response.raise_for_status()
             self._validate_freshness(response)
+            self._record_response(response)
             return response
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed for {url}: {str(e)}")
@@ -97,7 +213,8 @@ class BaseFetcher:
                 return fallback
             raise
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           before_sleep=_record_retry)
     def _fetch(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
                data: Optional[Union[Dict, str]] = None, json: Optional[Any] = None) -> requests.Response:
         """
@@ -114,6 +231,7 @@ class BaseFetcher:
             )
             response.raise_for_status()
             self._validate_freshness(response)
+            self._record_response(response)
             return response
         except requests.exceptions.RequestException as e:
             logger.error(f"{method} request failed for {url}: {str(e)}")
@@ -124,6 +242,18 @@ class BaseFetcher:
                 return fallback
             raise
 
+    @staticmethod
+    def _record_response(response: requests.Response) -> None:
+        """
+        Record cache hit/miss and body size for instrumentation.
+        """
+        if not METRICS.enabled:
+            return
+        from_cache = getattr(response, 'from_cache', False)
+        METRICS.inc('swing_http_cache_total',
+                    result='hit' if from_cache else 'miss')
+        METRICS.observe('swing_http_response_bytes', len(response.content))
+
     @staticmethod
     def _validate_freshness(response: requests.Response) -> bool:
         """
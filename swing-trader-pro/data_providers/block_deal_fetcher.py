@@ -1,5 +1,9 @@
+from typing import Any, Dict, List, Optional, Union
 import logging
+import threading
 from .base_fetcher import BaseFetcher
+from data.block_deal_store import BlockDealStore
+from core.client_classifier import ClientClassifier, default_classifier
 import requests
 import pandas as pd
 from datetime import datetime
@@ -75,13 +79,39 @@ class BlockDealFetcher(BaseFetcher):
 
     NSE_API = "https://www.nseindia.com/api/block-deals"
 
+    def __init__(self, store: Optional[BlockDealStore] = None,
+                 classifier: Optional[ClientClassifier] = None, **kwargs):
+        """
+        Args:
+            store (BlockDealStore, optional): Persistent deal store every fetch
+                is added to; defaults to data/nse/block_deals.sqlite, opened
+                on first use.
+            classifier (ClientClassifier, optional): Client name categorizer;
+                defaults to the shared one over config/client_aliases.json.
+        """
+        super().__init__(**kwargs)
+        self._store = store
+        self._store_lock = threading.Lock()
+        self.classifier = classifier if classifier is not None else default_classifier()
+
+    @property
+    def store(self) -> BlockDealStore:
+        """The deal store, opened on the first fetch or query."""
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    self._store = BlockDealStore()
+        return self._store
+
     def get_recent_block_deals(self, days=1, filter_fii=True):
         """
         Fetch recent block deals from NSE, optionally filtering for FII activity.
+        Every fetched deal is also added to the store.
 
         Args:
             days (int): Number of days to look back for deals.
-            filter_fii (bool): If True, only include deals with FII in client name.
+            filter_fii (bool): If True, only include deals by clients the
+                classifier tags as FII.
 
         Returns:
             pd.DataFrame: DataFrame of filtered block deals.
@@ -92,24 +122,80 @@ class BlockDealFetcher(BaseFetcher):
                 headers={"User-Agent": "Mozilla/5.0",
                          "Accept-Language": "en-US"}
             )
-            deals = response.json()
-            filtered_deals = self._parse_and_filter_deals(
-                deals, days, filter_fii)
-            return pd.DataFrame(filtered_deals)
+            deals = self.parse_deals(response.json())
+            self._store_deals(deals)
+            return self._filter_deals(deals, days, filter_fii)
         except Exception as e:
             logger.error(f"Block deal fetch failed: {str(e)}")
             fallback = self._load_fallback_data("block_deals")
             if fallback is not None:
                 try:
-                    deals = fallback.json()
-                    filtered_deals = self._parse_and_filter_deals(
-                        deals, days, filter_fii)
-                    return pd.DataFrame(filtered_deals)
+                    return self._parse_and_filter_deals(
+                        fallback.json(), days, filter_fii)
                 except Exception as fallback_e:
                     logger.error(
                         f"Fallback block deal parse failed: {fallback_e}")
             return pd.DataFrame([])
 
+    def get_deals(self, symbol: Optional[str] = None, start=None, end=None,
+                  fii_only: bool = False, client_type: Optional[str] = None) -> pd.DataFrame:
+        """
+        Block deals from the local store, without a network request.
+
+        Args:
+            symbol (str, optional): Trading symbol; all symbols if None.
+            start, end (date-like, optional): Inclusive date bounds.
+            fii_only (bool): Only deals by FII clients.
+            client_type (str, optional): Only deals by this client category.
+
+        Returns:
+            pd.DataFrame: Columns symbol, date, clientName, client_type, side,
+            qty, price, is_fii.
+        """
+        return self.store.query(symbol, start, end, fii_only, client_type)
+
+    def parse_deals(self, deals: Union[List[Dict[str, Any]], Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Parse the NSE block-deal JSON column-wise.
+
+        Args:
+            deals (list or dict): Deal dicts from the API, or a response with
+                them under 'data'.
+
+        Returns:
+            pd.DataFrame: Columns symbol, date, clientName, client_type, side,
+            qty, price, is_fii; deals without a symbol or a parseable trade date dropped.
+        """
+        if isinstance(deals, dict):
+            deals = deals.get('data', [])
+        frame = pd.DataFrame.from_records(deals or [])
+        frame = frame.reindex(columns=frame.columns.union(
+            ['symbol', 'clientName', 'buySell', 'quantity', 'price', 'tradeDate'],
+            sort=False))
+        client = frame['clientName'].fillna('').astype(str)
+        client_type = self.classifier.classify(client)
+        parsed = pd.DataFrame({
+            'symbol': frame['symbol'],
+            'date': pd.to_datetime(frame['tradeDate'], format='%d-%b-%Y', errors='coerce'),
+            'clientName': client,
+            'client_type': client_type,
+            'side': frame['buySell'].fillna('').astype(str).str.upper(),
+            'qty': pd.to_numeric(frame['quantity'], errors='coerce'),
+            'price': pd.to_numeric(frame['price'], errors='coerce'),
+            'is_fii': client_type == 'FII',
+        })
+        return parsed[parsed['date'].notna() & parsed['symbol'].notna()].reset_index(drop=True)
+
+    @staticmethod
+    def _filter_deals(deals: pd.DataFrame, days: int, filter_fii: bool) -> pd.DataFrame:
+        """Deals from the last `days` days (FII only if `filter_fii`), in API order."""
+        cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
+        mask = deals['date'] >= cutoff
+        if filter_fii:
+            mask &= deals['is_fii']
+        return deals.loc[mask, ['symbol', 'qty', 'price', 'date', 'clientName']] \
+            .reset_index(drop=True)
+
     def _parse_and_filter_deals(self, deals, days, filter_fii):
         """
         Parse and filter deals for recency and FII activity.
@@ -120,26 +206,12 @@ class BlockDealFetcher(BaseFetcher):
             filter_fii (bool): If True, only include FII deals.
 
         Returns:
-            list: List of filtered deal dicts.
+            pd.DataFrame: Filtered deals (symbol, qty, price, date, clientName).
         """
-        cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
-        filtered = []
-        for deal in deals:
-            try:
-                trade_date = pd.to_datetime(
-                    deal.get('tradeDate'), format='%d-%b-%Y', errors='coerce')
-                if pd.isnull(trade_date) or trade_date < cutoff:
-                    continue
-                client_name = deal.get('clientName', '').upper()
-                if filter_fii and 'FII' not in client_name:
-                    continue
-                filtered.append({
-                    'symbol': deal.get('symbol'),
-                    'qty': deal.get('quantity'),
-                    'price': deal.get('price'),
-                    'date': trade_date,
-                    'clientName': deal.get('clientName')
-                })
-            except Exception as e:
-                logger.warning(f"Skipping deal due to parse error: {e}")
-        return filtered
+        return self._filter_deals(self.parse_deals(deals), days, filter_fii)
+
+    def _store_deals(self, deals: pd.DataFrame) -> None:
+        try:
+            self.store.add(deals.dropna(subset=['qty', 'price']))
+        except Exception as e:
+            logger.error(f"Failed to persist block deals: {e}")
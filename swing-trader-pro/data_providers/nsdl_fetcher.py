@@ -1,6 +1,14 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import date, datetime
+from html.parser import HTMLParser
+import codecs
 import logging
-from .base_fetcher import BaseFetcher
+import time
+from tenacity import retry, stop_after_attempt, wait_exponential
+from .base_fetcher import BaseFetcher, shared_session, trading_date
+from data.fii_dii_store import Day, FiiDiiStore, to_day
+from config.nsdl_config import NSDL_CONFIG
+import numpy as np
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
@@ -76,6 +84,105 @@ class NSDLFetcher(BaseFetcher):
 
 logger = logging.getLogger(__name__)
 
+# Date formats seen in NSDL archive tables
+_DATE_FORMATS = ('%d-%b-%Y', '%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d', '%d %b %Y', '%b %d, %Y')
+
+
+def _parse_date(text: str) -> Optional[date]:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_amount(text: str) -> float:
+    text = text.replace(',', '').replace('--', '0').strip()
+    return float(text or 0)
+
+
+# NSDL reports net investment in Rs crore; strategy thresholds are in rupees
+CRORE = 1e7
+
+
+def fii_flow_summary(cash: Optional[pd.DataFrame],
+                     derivatives: Optional[pd.DataFrame] = None,
+                     days: int = 3) -> Dict[str, float]:
+    """
+    The fii_flows dict strategies and HedgeDetector read, from NSDL rows.
+
+    Args:
+        cash (pd.DataFrame): Cash-segment rows ['date', 'fii_net', 'dii_net']
+            in Rs crore, as returned by NSDLFetcher.get_fii_dii_activity().
+        derivatives (pd.DataFrame, optional): Derivatives-segment rows of the
+            same shape, e.g. FiiDiiStore.tail(1, 'derivatives').
+        days (int): Sessions summed into 'net_3day'.
+
+    Returns:
+        dict: 'net_3day', 'net_cash', 'fii_net' and 'dii_net', plus
+        'net_fno' when derivatives rows are given, all in rupees; empty if
+        there are no cash rows.
+    """
+    if cash is None or len(cash) == 0:
+        return {}
+    cash = cash.sort_values('date', ascending=False)
+    latest = cash.iloc[0]
+    flows = {
+        'net_3day': float(cash['fii_net'].head(days).sum()) * CRORE,
+        'net_cash': float(latest['fii_net']) * CRORE,
+        'fii_net': float(latest['fii_net']) * CRORE,
+        'dii_net': float(latest['dii_net']) * CRORE,
+    }
+    if derivatives is not None and len(derivatives):
+        flows['net_fno'] = float(
+            derivatives.sort_values('date', ascending=False)['fii_net'].iloc[0]) * CRORE
+    return flows
+
+
+class _TableRowParser(HTMLParser):
+    """
+    Incremental parser collecting the cell texts of the first <table>'s rows.
+    Fed chunk by chunk; completed rows accumulate in `rows` and `done` is set
+    once the table closes, so the caller can stop reading the response.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: List[List[str]] = []
+        self.done = False
+        self._in_table = False
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'table':
+            self._in_table = True
+        elif not self._in_table:
+            return
+        elif tag == 'tr':
+            self._row = []
+        elif tag in ('td', 'th') and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if self.done or not self._in_table:
+            return
+        if tag in ('td', 'th') and self._cell is not None:
+            self._row.append(''.join(self._cell).strip())
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+        elif tag == 'table':
+            self.done = True
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
 
 class NSDLFetcher(BaseFetcher):
     """
@@ -85,86 +192,225 @@ class NSDLFetcher(BaseFetcher):
 
     BASE_URL = "https://www.nsdl.co.in/emi/ismr/fii_dii_archive.php"
 
+    def __init__(self, store: Optional[FiiDiiStore] = None, chunk_size: int = 16384,
+                 config: Optional[Dict[str, Any]] = None, **kwargs):
+        """
+        Args:
+            store (FiiDiiStore, optional): Local FII/DII history; defaults to
+                NSDL_CONFIG['store_path'].
+            chunk_size (int): Bytes read per step of the streaming parse.
+            config (dict, optional): Defaults to config.nsdl_config.NSDL_CONFIG.
+        """
+        super().__init__(**kwargs)
+        self.config = config or NSDL_CONFIG
+        self.store = store if store is not None else FiiDiiStore(self.config['store_path'])
+        self.chunk_size = chunk_size
+
     def get_fii_dii_activity(self, days: int = 3) -> pd.DataFrame:
         """
         Fetch FII/DII net investment data for the last `days` days.
 
+        Only dates missing from the local store are read from NSDL: the
+        archive page is parsed as it streams in and the download stops at
+        the first date already stored.
+
         Args:
             days (int): Number of recent days to fetch.
 
         Returns:
-            pd.DataFrame: DataFrame with columns ['date', 'fii_net', 'dii_net']
+            pd.DataFrame: DataFrame with columns ['date', 'fii_net', 'dii_net'],
+            newest first.
         """
         try:
-            response = self._fetch_url(self.BASE_URL)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            reports = self._parse_table(soup, days)
-            return self._validate_output(reports, days)
+            self.refresh(days)
         except Exception as e:
             logger.error(f"FII/DII fetch failed: {str(e)}")
-            fallback = self._load_fallback_data("fii_dii_activity")
-            if fallback is not None:
-                try:
-                    soup = BeautifulSoup(fallback.text, 'html.parser')
-                    reports = self._parse_table(soup, days)
-                    return self._validate_output(reports, days)
-                except Exception as fallback_e:
-                    logger.error(
-                        f"Fallback FII/DII parse failed: {fallback_e}")
-            return pd.DataFrame([])
-
-    def _parse_table(self, soup: BeautifulSoup, days: int) -> List[Dict[str, Any]]:
+        stored = self.store.tail(days)
+        if not stored.empty:
+            return self._validate_output(stored, days)
+
+        fallback = self._load_fallback_data("fii_dii_activity")
+        if fallback is not None:
+            try:
+                reports = self._parse_table(fallback.text, days)
+                return self._validate_output(pd.DataFrame(reports), days)
+            except Exception as fallback_e:
+                logger.error(f"Fallback FII/DII parse failed: {fallback_e}")
+        return pd.DataFrame([])
+
+    def refresh(self, days: int = 3) -> int:
+        """
+        Bring the local store up to date from the NSDL archive page.
+
+        Args:
+            days (int): Minimum history to hold afterwards; rows are read past
+                the stored dates only while the store has fewer than `days`.
+
+        Returns:
+            int: Number of new dates stored.
+        """
+        latest = self.store.latest()
+        stored = self.store.count()
+        if latest is not None and latest >= trading_date() and stored >= days:
+            return 0
+        rows = []
+        for row in self._stream_rows(self.BASE_URL):
+            if stored >= days and row[0] <= latest:
+                break  # reached the stored history
+            rows.append(row)
+            if stored < days and len(rows) >= days:
+                break
+        return self.store.update(rows)
+
+    def backfill(self, start: Day, end: Optional[Day] = None,
+                 segments: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Page through the NSDL archives from `end` back to `start` into the store.
+
+        Pages entirely inside the stored date range are skipped, so an
+        interrupted backfill resumes where it stopped. A failing page stops
+        that segment, keeping its stored history contiguous.
+
+        Args:
+            start (date-like): Oldest date to load.
+            end (date-like, optional): Newest date; defaults to the current
+                trading date.
+            segments (list, optional): Segments to load; defaults to every
+                segment in config['archive_urls'].
+
+        Returns:
+            dict: Segment -> number of new dates stored.
+        """
+        start = to_day(start)
+        end = to_day(end if end is not None else trading_date())
+        page = np.timedelta64(self.config['page_days'], 'D')
+        one_day = np.timedelta64(1, 'D')
+        added = {}
+        for segment in segments or list(self.config['archive_urls']):
+            template = self.config['archive_urls'][segment]
+            first, latest = self.store.first(segment), self.store.latest(segment)
+            added[segment] = 0
+            page_end = end
+            while page_end >= start:
+                page_start = max(start, page_end - page + one_day)
+                if first is None or page_start < to_day(first) or page_end > to_day(latest):
+                    url = template.format(
+                        base=self.config['archive_base'],
+                        start=page_start.astype(date).strftime('%d-%m-%Y'),
+                        end=page_end.astype(date).strftime('%d-%m-%Y'))
+                    try:
+                        rows = [row for row in self._stream_rows(url)
+                                if page_start <= to_day(row[0]) <= page_end]
+                    except Exception as e:
+                        logger.error(f"NSDL {segment} backfill stopped at {url}: {e}")
+                        break
+                    added[segment] += self.store.update(rows, segment)
+                    time.sleep(self.config.get('page_interval_seconds', 0))
+                page_end = page_start - one_day
+            logger.info(f"Backfilled {added[segment]} {segment} day(s) "
+                        f"between {start} and {end}")
+        return added
+
+    def get_fii_dii_range(self, start: Optional[Day] = None, end: Optional[Day] = None,
+                          segment: str = 'cash') -> Dict[str, np.ndarray]:
+        """
+        Stored FII/DII history within [start, end] (inclusive), oldest first.
+
+        The arrays are read-only views of the memory-mapped store: no copy and
+        no network, so backtests can call this freely. Run backfill() first
+        for long histories.
+
+        Args:
+            start, end (date-like, optional): Bounds; open if None.
+            segment (str): 'cash' or another configured segment.
+
+        Returns:
+            dict: 'date' (datetime64[D]), 'fii_net' and 'dii_net' arrays.
+        """
+        return self.store.range(start, end, segment)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    def _open_stream(self, url: str) -> requests.Response:
+        response = shared_session().get(url, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def _stream_rows(self, url: str) -> Iterator[Tuple[date, float, float]]:
+        """
+        (date, fii_net, dii_net) rows of the page's first table, in page order,
+        parsed as the body streams in. The download stops when the table ends
+        or the caller stops iterating.
+        """
+        parser = _TableRowParser()
+        with self._open_stream(url) as response:
+            decoder = codecs.getincrementaldecoder(
+                response.encoding or 'utf-8')(errors='replace')
+            for chunk in response.iter_content(self.chunk_size):
+                parser.feed(decoder.decode(chunk))
+                rows, parser.rows = parser.rows, []
+                for cells in rows:
+                    row = self._parse_row(cells)
+                    if row is not None:
+                        yield row
+                if parser.done:
+                    return
+
+    @staticmethod
+    def _parse_row(cells: List[str]) -> Optional[Tuple[date, float, float]]:
+        """(date, fii_net, dii_net) from a table row; None for headers and bad rows."""
+        if len(cells) < 3:
+            return None
+        day = _parse_date(cells[0])
+        if day is None:
+            return None
+        try:
+            return day, _parse_amount(cells[1]), _parse_amount(cells[2])
+        except ValueError as e:
+            logger.warning(f"Error parsing row: {e}")
+            return None
+
+    def _parse_table(self, html: str, days: int) -> List[Dict[str, Any]]:
         """
         Parse the FII/DII HTML table from NSDL.
 
         Args:
-            soup (BeautifulSoup): Parsed HTML soup.
+            html (str): Page HTML.
             days (int): Number of rows to extract.
 
         Returns:
             List[Dict[str, Any]]: List of dicts with 'date', 'fii_net', 'dii_net'.
         """
-        reports = []
-        table = soup.find('table')
-        if not table:
+        parser = _TableRowParser()
+        parser.feed(html)
+        parser.close()
+        if not parser.rows:
             logger.error("No table found in NSDL FII/DII page.")
-            return reports
-
-        rows = table.find_all('tr')[1:]  # Skip header
-        for row in rows[:days]:
-            cols = row.find_all('td')
-            if len(cols) < 3:
+        reports = []
+        for cells in parser.rows:
+            row = self._parse_row(cells)
+            if row is None:
                 continue
-            try:
-                date = cols[0].text.strip()
-                fii_net = float(cols[1].text.replace(
-                    ',', '').replace('--', '0') or 0)
-                dii_net = float(cols[2].text.replace(
-                    ',', '').replace('--', '0') or 0)
-                reports.append({
-                    'date': date,
-                    'fii_net': fii_net,
-                    'dii_net': dii_net
-                })
-            except Exception as e:
-                logger.warning(f"Error parsing row: {e}")
+            reports.append({'date': pd.Timestamp(row[0]),
+                            'fii_net': row[1], 'dii_net': row[2]})
+            if len(reports) >= days:
+                break
         return reports
 
-    def _validate_output(self, data: List[Dict[str, Any]], expected_days: int) -> pd.DataFrame:
+    def _validate_output(self, data: pd.DataFrame, expected_days: int) -> pd.DataFrame:
         """
-        Validate data completeness and return as DataFrame.
+        Validate data completeness.
 
         Args:
-            data (list): List of parsed data dicts.
+            data (pd.DataFrame): Parsed rows.
             expected_days (int): Expected number of days.
 
         Returns:
-            pd.DataFrame: DataFrame of results.
+            pd.DataFrame: The same rows.
         """
         if len(data) < expected_days:
             logger.warning(
                 f"Only got {len(data)} days of FII/DII data (expected {expected_days})")
-        return pd.DataFrame(data)
+        return data
 
     def get_sector_flows(self) -> Dict[str, float]:
         """
@@ -172,11 +418,14 @@ class NSDLFetcher(BaseFetcher):
         Placeholder: returns static data.
 
         Returns:
-            dict: Sector name to net flow.
+            dict: Sector name to net flow in rupees (the reports' Rs crore
+            figures times CRORE), the unit of HedgeDetector's
+            'sector_flow_threshold'.
         """
         # TODO: Implement actual PDF parsing if required
-        return {
+        flows_crore = {
             'BANKING': 1200.0,
             'IT': -450.0,
             'AUTO': 780.0
         }
+        return {sector: flow * CRORE for sector, flow in flows_crore.items()}
@@ -1,8 +1,9 @@
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 import logging
 from .base_fetcher import BaseFetcher
+from data.oi_chain_store import OIChainStore, default_oi_store, parse_nse_option_chain
 from nsepy import get_history, get_index_pe_history
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 import pandas as pd
 
 
@@ -107,13 +108,22 @@ class NSEFetcher(BaseFetcher):
     and data freshness validation.
     """
 
-    def __init__(self):
+    # Underlyings served by NSE's option-chain-indices endpoint
+    INDEX_UNDERLYINGS = ('NIFTY', 'BANKNIFTY', 'FINNIFTY', 'MIDCPNIFTY')
+
+    def __init__(self, oi_store: Optional[OIChainStore] = None):
+        """
+        Args:
+            oi_store (OIChainStore, optional): Where option chains are
+                ingested; defaults to the process-wide store.
+        """
         super().__init__()
         self.base_url = "https://www.nseindia.com"
         self.headers = {
             "User-Agent": "Mozilla/5.0",
             "Accept-Language": "en-US"
         }
+        self.oi_store = oi_store or default_oi_store()
 
     def get_ohlc(self, symbol: str, days: int = 30) -> Optional[pd.DataFrame]:
         """
@@ -183,6 +193,26 @@ class NSEFetcher(BaseFetcher):
             logger.error(f"Index OI fetch failed for {index}: {str(e)}")
             return self._load_fallback_data(f"index_oi_{index}")
 
+    def get_option_chain(self, underlying: str = 'NIFTY') -> Optional[Dict[str, Any]]:
+        """
+        Fetch the live option chain of an index or stock, ingest it into the
+        OI store and return the underlying's OI summary (see
+        OIChainStore.summary()).
+        """
+        kind = 'indices' if underlying.upper() in self.INDEX_UNDERLYINGS else 'equities'
+        try:
+            response = self._fetch_url(
+                f"{self.base_url}/api/option-chain-{kind}?symbol={underlying}",
+                headers=self.headers)
+            chain = parse_nse_option_chain(response.json())
+            if chain.empty:
+                logger.warning(f"Empty option chain for {underlying}")
+                return self.oi_store.summary(underlying)
+            return self.oi_store.ingest(underlying, chain, datetime.now())
+        except Exception as e:
+            logger.error(f"Option chain fetch failed for {underlying}: {str(e)}")
+            return self.oi_store.summary(underlying)
+
     def _validate_data_freshness(self, df: Optional[pd.DataFrame]) -> bool:
         """
         Ensure data is a non-empty DataFrame and recent (last date within 1 day).
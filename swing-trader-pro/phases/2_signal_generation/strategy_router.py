@@ -1,14 +1,8 @@
 # phases/2_signal_generation/strategy_router.py
 import logging
-from strategies.institutional import (
-    InstitutionalFlowStrategy,
-    HedgeDetector
-)
-from strategies import (
-    InstitutionalStrategy,
-    WyckoffStrategy,
-    QuantitativeStrategy
-)
+import threading
+from core.strategy_registry import StrategyRegistry, StrategySpec
+from data.oi_chain_store import default_oi_store
 
 
 class StrategyRouter:
@@ -66,50 +60,150 @@ class StrategyRouter:
 
 logger = logging.getLogger(__name__)
 
+HEDGE_DETECTOR = StrategySpec('strategies.institutional.hedge_detector:HedgeDetector')
+
 
 class StrategyRouter:
     """
     Routes symbol data to all strategies, but for 'institutional' strategy,
     runs HedgeDetector first and only proceeds if no strong hedge is detected.
+
+    Strategies come from a StrategyRegistry and are imported on first use;
+    the hedge detector is only loaded when 'institutional' is enabled.
+    symbol_data's 'oi_changes' is completed from the OI chain store, which
+    PhaseManager keeps fed with live option chains.
     """
 
-    def __init__(self):
-        self.strategies = {
-            'institutional': InstitutionalStrategy(),
-            'wyckoff': WyckoffStrategy(),
-            'quant': QuantitativeStrategy()
-        }
-        self.hedge_detector = HedgeDetector()
+    def __init__(self, registry=None, oi_store=None, pair_engine=None):
+        """
+        Args:
+            registry (StrategyRegistry, optional): Strategies to route to;
+                defaults to the built-in and plugin strategies enabled in
+                config/strategy_config.py.
+            oi_store (OIChainStore, optional): Source of OI changes missing
+                from symbol_data; defaults to the process-wide store.
+            pair_engine (RollingCorrelation, optional): Correlation-based pair
+                discovery for the hedge check; the caller keeps it updated.
+        """
+        self.registry = registry or StrategyRegistry()
+        self.oi_store = oi_store or default_oi_store()
+        self.pair_engine = pair_engine
+        self._hedge_detector = None
+        self._hedge_lock = threading.Lock()
+
+    @property
+    def hedge_detector(self):
+        if self._hedge_detector is None:
+            with self._hedge_lock:
+                if self._hedge_detector is None:
+                    self._hedge_detector = HEDGE_DETECTOR.load()(
+                        oi_store=self.oi_store, pair_engine=self.pair_engine)
+        return self._hedge_detector
+
+    def update_sector_flows(self, sector_flows):
+        """
+        Set this cycle's sector -> net flow (rupees) for the hedge check's
+        sector hedges; a no-op unless 'institutional' is enabled.
+        """
+        if 'institutional' in self.registry.enabled:
+            self.hedge_detector.update_sector_flows(sector_flows)
+
+    def required_features(self):
+        """symbol_data features the enabled strategies read (see StrategyRegistry.features)."""
+        return self.registry.features()
 
     def generate_signals(self, symbol_data):
         """
         Generate signals from all strategies.
         For 'institutional', only generate if hedge check passes.
         """
-        signals = {}
+        return dict(self.stream_signals(symbol_data))
+
+    def stream_signals(self, symbol_data):
+        """
+        Run the hedge check and strategies for one symbol, yielding each
+        strategy's output as soon as it is computed.
 
-        # Institutional strategy with hedge check
+        Yields:
+            tuple: (strategy name, signal or None).
+        """
+        symbol_data = self._with_oi(symbol_data)
+        if 'institutional' not in self.registry.enabled:
+            yield from self._iter_strategies(symbol_data, None)
+            return
         try:
             hedge_status = self.hedge_detector.detect_hedges(
                 symbol_data.get('symbol'),
                 symbol_data.get('fii_flows'),
                 symbol_data.get('oi_changes')
             )
-            if not all(hedge_status.values()):
-                signals['institutional'] = self.strategies['institutional'].analyze(
-                    symbol_data)
-            else:
-                logger.info(
-                    f"Hedge detected for {symbol_data.get('symbol')}, skipping institutional strategy.")
         except Exception as e:
             logger.error(f"Error in institutional hedge check: {str(e)}")
+            hedge_status = None
+        yield from self._iter_strategies(symbol_data, hedge_status)
+
+    def generate_signals_many(self, universe_data, fii_data, oi_data=None,
+                              sector_flows=None):
+        """
+        Generate signals for a whole universe, running the hedge check once
+        per cycle (see HedgeDetector.detect_hedges_many).
+
+        Args:
+            universe_data (list): symbol_data dicts, each with a 'symbol'.
+            fii_data (dict): Market-wide FII flow data ('net_cash', 'net_fno').
+            oi_data (dict, optional): Index OI data ('nifty_oi_pct_change');
+                defaults to the OI store's.
+            sector_flows (dict, optional): Sector -> net flow for this cycle.
+
+        Returns:
+            dict: Symbol -> signals as returned by generate_signals().
+        """
+        universe_data = [self._with_oi(symbol_data) for symbol_data in universe_data]
+        symbols = [symbol_data.get('symbol') for symbol_data in universe_data]
+        if 'institutional' not in self.registry.enabled:
+            return {symbol: dict(self._iter_strategies(symbol_data, None))
+                    for symbol, symbol_data in zip(symbols, universe_data)}
+        try:
+            hedges = self.hedge_detector.detect_hedges_many(
+                symbols, fii_data, oi_data, sector_flows)
+            hedge_rows = hedges.to_dict('records')
+        except Exception as e:
+            logger.error(f"Error in institutional hedge check: {str(e)}")
+            hedge_rows = [None] * len(symbols)
+        return {symbol: dict(self._iter_strategies(symbol_data, hedge_status))
+                for symbol, symbol_data, hedge_status
+                in zip(symbols, universe_data, hedge_rows)}
+
+    def _with_oi(self, symbol_data):
+        """symbol_data with 'oi_changes' filled in from the OI store; values passed in win."""
+        oi_changes = {**self.oi_store.oi_changes(symbol_data.get('symbol')),
+                      **(symbol_data.get('oi_changes') or {})}
+        return {**symbol_data, 'oi_changes': oi_changes}
+
+    def _iter_strategies(self, symbol_data, hedge_status):
+        """Run every enabled strategy, yielding (name, signal); 'institutional' only if hedge_status passes."""
+        # Institutional strategy, only if the hedge check ran and passed
+        if hedge_status is not None:
+            if all(hedge_status.values()):
+                logger.info(
+                    f"Hedge detected for {symbol_data.get('symbol')}, skipping institutional strategy.")
+            else:
+                try:
+                    # Pass the flags on so the strategy does not run the check again
+                    signal = self.registry.get('institutional').analyze(
+                        {**symbol_data, 'hedge_flags': hedge_status})
+                except Exception as e:
+                    logger.error(f"Error in institutional strategy: {str(e)}")
+                else:
+                    yield 'institutional', signal
 
         # Other strategies
-        for name in ['wyckoff', 'quant']:
+        for name in self.registry.enabled:
+            if name == 'institutional':
+                continue
             try:
-                signals[name] = self.strategies[name].analyze(symbol_data)
+                signal = self.registry.get(name).analyze(symbol_data)
             except Exception as e:
                 logger.error(f"Error in {name} strategy: {str(e)}")
                 continue
-
-        return signals
+            yield name, signal
@@ -1,7 +1,10 @@
 # phases/2_signal_generation/trend_classifier.py
 import talib
 import numpy as np
+import pandas as pd
 from collections import deque
+from technicals import indicators
+from technicals.swings import find_swings, swing_masks
 # from swing_trader_pro.phases.morning_screening.wyckoff_phase import WyckoffAnalyzer
 from phases.morning_screening.wyckoff_phase import WyckoffAnalyzer
 
@@ -173,6 +176,12 @@ class TrendClassifier:
     volume confirmation, and momentum for robust trend detection and scoring.
     """
 
+    # Score tables shared by classify() and classify_many()
+    MA_SCORES = {'uptrend': 8, 'downtrend': 3, 'neutral': 5}
+    STRUCTURE_SCORES = {'higher_highs': 8, 'lower_lows': 3, 'neutral': 5}
+    VOLUME_SCORES = {True: 8, False: 3}
+    MOMENTUM_SCORES = {'strong': 8, 'weak': 3, 'neutral': 5}
+
     def __init__(self, trend_window=20, confirmation_bars=3):
         self.trend_window = trend_window
         self.confirmation_bars = confirmation_bars
@@ -204,20 +213,19 @@ class TrendClassifier:
 
         # 2. Moving Average Analysis
         ma_status = self._ma_analysis(closes)
-        ma_score = {'uptrend': 8, 'downtrend': 3, 'neutral': 5}[ma_status]
+        ma_score = self.MA_SCORES[ma_status]
 
         # 3. Price Structure
         structure = self._price_structure(closes)
-        structure_score = {'higher_highs': 8,
-                           'lower_lows': 3, 'neutral': 5}[structure]
+        structure_score = self.STRUCTURE_SCORES[structure]
 
         # 4. Volume Confirmation
         volume_confirmation = self._volume_analysis(closes, volumes)
-        volume_score = 8 if volume_confirmation else 3
+        volume_score = self.VOLUME_SCORES[bool(volume_confirmation)]
 
         # 5. Momentum (RSI, MACD)
         momentum = self._momentum(closes)
-        momentum_score = {'strong': 8, 'weak': 3, 'neutral': 5}[momentum]
+        momentum_score = self.MOMENTUM_SCORES[momentum]
 
         # Composite score (weighted)
         composite_score = (
@@ -245,6 +253,163 @@ class TrendClassifier:
             }
         }
 
+    def classify_many(self, panel):
+        """
+        Classify every symbol of a universe panel in one pass.
+
+        Computes the same factors and composite score as classify(), but as
+        array operations over a (symbols x bars) matrix instead of one call
+        per symbol.
+
+        Args:
+            panel: Either a dict with 'close' and 'volume' DataFrames (index =
+                dates, columns = symbols), or a dict with 'symbols' plus
+                'close'/'volume' 2D arrays shaped (symbols x bars). Shorter
+                histories may be left-padded with NaN.
+
+        Returns:
+            pd.DataFrame: One row per symbol (indexed by symbol) with columns
+            wyckoff_phase, wyckoff_score, ma_status, structure,
+            volume_confirmation, momentum, composite_score, ma_score,
+            structure_score, volume_score, momentum_score and error. Rows
+            without enough data carry only the error and a zero composite
+            score, like classify(); their factor columns are None/NaN.
+        """
+        symbols, closes, volumes = self._panel_arrays(panel)
+        lookback = max(50, self.trend_window)
+        closes = closes[:, -lookback:]
+        volumes = volumes[:, -lookback:]
+        n_symbols = len(symbols)
+
+        # Rows with gaps in the window are reported like classify() does
+        sufficient = (
+            (closes.shape[1] >= 50) &
+            np.isfinite(closes).all(axis=1) &
+            (np.isfinite(volumes[:, -20:]).sum(axis=1) >= 20)
+        ) if n_symbols else np.zeros(0, dtype=bool)
+        closes = np.where(sufficient[:, None], closes, 1.0)
+        volumes = np.where(sufficient[:, None], volumes, 1.0)
+
+        # 1. Wyckoff phase (same rules as WyckoffAnalyzer.detect)
+        analyzer = self.wyckoff_analyzer
+        band = closes[:, -analyzer.band:]
+        support = band.min(axis=1)
+        resistance = band.max(axis=1)
+        midpoint = (support + resistance) / 2
+        last_close = closes[:, -1]
+        mean_recent_vol = volumes[:, -5:].mean(axis=1)
+        mean_recent_vol = np.where(mean_recent_vol == 0, 1e-8, mean_recent_vol)
+        accumulation = (last_close > midpoint) & (volumes[:, -1] > mean_recent_vol)
+        distribution = ~accumulation & (last_close < midpoint)
+        wyckoff_phase = np.select(
+            [accumulation, distribution], ['accumulation', 'distribution'], 'neutral')
+        wyckoff_score = np.select([accumulation, distribution], [8, 4], 5)
+
+        # 2. Moving averages with confirmation bars
+        sma20 = indicators.sma(closes, 20)[:, -self.confirmation_bars:]
+        sma50 = indicators.sma(closes, 50)[:, -self.confirmation_bars:]
+        ma_up = (sma20 > sma50).all(axis=1)
+        ma_down = (sma20 < sma50).all(axis=1)
+        ma_status = np.select([ma_up, ma_down], ['uptrend', 'downtrend'], 'neutral')
+
+        # 3. Price structure from the last two swing points
+        structure = self._price_structure_many(closes)
+
+        # 4. Volume confirmation
+        price_change = closes[:, -1] / closes[:, -self.trend_window] - 1
+        volume_change = volumes[:, -1] / \
+            volumes[:, -self.trend_window:-1].mean(axis=1)
+        volume_confirmation = np.where(
+            np.abs(price_change) > 0.05, volume_change > 1.2, True)
+
+        # 5. Momentum (RSI, MACD slope)
+        rsi = indicators.rsi(closes, 14)[:, -1]
+        macd = indicators.macd_line(closes)
+        macd_val = macd[:, -1] - macd[:, -2]
+        strong = (rsi > 60) & (macd_val > 0)
+        weak = ~strong & (rsi < 40) & (macd_val < 0)
+        momentum = np.select([strong, weak], ['strong', 'weak'], 'neutral')
+
+        ma_score = pd.Series(ma_status).map(self.MA_SCORES).to_numpy()
+        structure_score = pd.Series(structure).map(
+            self.STRUCTURE_SCORES).to_numpy()
+        volume_score = np.where(volume_confirmation, self.VOLUME_SCORES[True],
+                                self.VOLUME_SCORES[False])
+        momentum_score = pd.Series(momentum).map(
+            self.MOMENTUM_SCORES).to_numpy()
+        composite_score = np.round(
+            0.3 * wyckoff_score +
+            0.2 * ma_score +
+            0.15 * structure_score +
+            0.15 * volume_score +
+            0.2 * momentum_score, 2)
+
+        result = pd.DataFrame({
+            'wyckoff_phase': wyckoff_phase,
+            'wyckoff_score': wyckoff_score,
+            'ma_status': ma_status,
+            'structure': structure,
+            'volume_confirmation': volume_confirmation.astype(bool),
+            'momentum': momentum,
+            'composite_score': np.where(sufficient, composite_score, 0.0),
+            'ma_score': ma_score,
+            'structure_score': structure_score,
+            'volume_score': volume_score,
+            'momentum_score': momentum_score,
+            'error': np.where(
+                sufficient, None, 'Insufficient data for trend classification'),
+        }, index=pd.Index(symbols, name='symbol'))
+
+        # The placeholder rows above were scored on dummy prices; blank them
+        factors = ['wyckoff_phase', 'ma_status', 'structure',
+                   'volume_confirmation', 'momentum']
+        scores = ['wyckoff_score', 'ma_score', 'structure_score',
+                  'volume_score', 'momentum_score']
+        result[factors] = result[factors].astype(object)
+        result[scores] = result[scores].astype(float)
+        result.loc[~sufficient, factors] = None
+        result.loc[~sufficient, scores] = np.nan
+        return result
+
+    @staticmethod
+    def _panel_arrays(panel):
+        """Normalize a panel into (symbols, closes 2D, volumes 2D) float arrays."""
+        close = panel['close']
+        volume = panel['volume']
+        if isinstance(close, pd.DataFrame):
+            symbols = list(close.columns)
+            volume = volume.reindex(columns=close.columns)
+            return (symbols,
+                    close.to_numpy(dtype=float).T,
+                    volume.to_numpy(dtype=float).T)
+        closes = np.atleast_2d(np.asarray(close, dtype=float))
+        volumes = np.atleast_2d(np.asarray(volume, dtype=float))
+        symbols = list(panel.get('symbols', range(closes.shape[0])))
+        return symbols, closes, volumes
+
+    @staticmethod
+    def _price_structure_many(closes):
+        """Vectorized _price_structure over rows of a 2D close matrix."""
+        n_symbols = closes.shape[0]
+        is_peak, is_trough = swing_masks(closes)
+
+        def last_two(mask):
+            # Position of the last and second-to-last True per row (-1 if none)
+            pos = np.where(mask, np.arange(mask.shape[1]), -1)
+            last = pos.max(axis=1)
+            prev = np.where(pos == last[:, None], -1, pos).max(axis=1)
+            return last, prev
+
+        rows = np.arange(n_symbols)
+        p_last, p_prev = last_two(is_peak)
+        t_last, t_prev = last_two(is_trough)
+        higher_highs = (p_prev >= 0) & \
+            (closes[rows, p_last] > closes[rows, p_prev])
+        lower_lows = (t_prev >= 0) & \
+            (closes[rows, t_last] < closes[rows, t_prev])
+        return np.select([higher_highs, lower_lows],
+                         ['higher_highs', 'lower_lows'], 'neutral')
+
     def _ma_analysis(self, closes):
         """Analyze moving average crossovers and confirmation bars."""
         sma20 = talib.SMA(closes, timeperiod=20)
@@ -267,15 +432,11 @@ class TrendClassifier:
 
     def _price_structure(self, closes):
         """Analyze price structure for higher highs/lows or lower highs/lows."""
-        peaks, troughs = [], []
-        for i in range(1, len(closes)-1):
-            if closes[i] > closes[i-1] and closes[i] > closes[i+1]:
-                peaks.append(closes[i])
-            elif closes[i] < closes[i-1] and closes[i] < closes[i+1]:
-                troughs.append(closes[i])
-        if len(peaks) >= 2 and peaks[-1] > peaks[-2]:
+        closes = np.asarray(closes, dtype=float)
+        peaks, troughs = find_swings(closes)
+        if len(peaks) >= 2 and closes[peaks[-1]] > closes[peaks[-2]]:
             return 'higher_highs'
-        elif len(troughs) >= 2 and troughs[-1] < troughs[-2]:
+        elif len(troughs) >= 2 and closes[troughs[-1]] < closes[troughs[-2]]:
             return 'lower_lows'
         return 'neutral'
 
@@ -1,8 +1,13 @@
 # phases/1_morning_screening/institutional_flow.py
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Union
+from collections import defaultdict
+import json
+import time
 import requests
+import pandas as pd
+from data.market_caps import MarketCapIndex, default_index
+from data_providers.base_fetcher import BaseFetcher, trading_date
 # from config.constraints import CAP_THRESHOLDS
-from config import constraints
 
 
 class InstitutionalScreener:
@@ -128,7 +133,10 @@ class InstitutionalScreener:
         use_api: bool = True,
         api_endpoint: str = "https://fii-dii-data.com/latest",
         cap_thresholds: Optional[Dict[str, float]] = None,
-        data_pipeline: Optional[Any] = None
+        data_pipeline: Optional[Any] = None,
+        cap_index: Optional[MarketCapIndex] = None,
+        fetcher: Optional[BaseFetcher] = None,
+        revalidate_seconds: float = 900
     ):
         """
         Args:
@@ -136,11 +144,21 @@ class InstitutionalScreener:
             api_endpoint (str): API endpoint for institutional data.
             cap_thresholds (dict): Optional override for cap thresholds.
             data_pipeline: Optional data pipeline object for advanced data fetching.
+            cap_index (MarketCapIndex, optional): Market-cap table; defaults to
+                config/market_caps.csv.
+            fetcher (BaseFetcher, optional): Shared fetch layer for the API.
+            revalidate_seconds (float): Within a trading date, reuse the parsed
+                payload this long before revalidating it with the server.
         """
         self.use_api = use_api
         self.api_endpoint = api_endpoint
         self.cap_thresholds = cap_thresholds or CAP_THRESHOLDS
         self.data_pipeline = data_pipeline or DataPipeline()
+        self.cap_index = cap_index or default_index()
+        self.fetcher = fetcher or BaseFetcher()
+        self.revalidate_seconds = revalidate_seconds
+        # trading date -> (monotonic time of last check, parsed payload)
+        self._payloads: Dict[Any, tuple] = {}
 
     def screen(self, institutional_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -173,20 +191,67 @@ class InstitutionalScreener:
                 }
         return screened
 
+    def screen_bulk(
+        self,
+        institutional_data: Optional[Union[Dict[str, Any], pd.DataFrame]] = None
+    ) -> pd.DataFrame:
+        """
+        Vectorized screen(): classify and threshold the whole payload at once.
+
+        Args:
+            institutional_data (dict or DataFrame, optional): Symbol -> metrics
+                dict, or a DataFrame indexed by symbol. Fetched as in screen()
+                when omitted.
+
+        Returns:
+            pd.DataFrame: Passing symbols (index) with columns fii_net, dii_net,
+            delivery_pct and cap_type.
+        """
+        if institutional_data is None:
+            if self.use_api:
+                institutional_data = self.fetch_institutional_data()
+            else:
+                institutional_data = self.data_pipeline.fetch_fii_activity()
+        if isinstance(institutional_data, pd.DataFrame):
+            flows = institutional_data
+        else:
+            flows = pd.DataFrame.from_records(
+                list(institutional_data.values()), index=list(institutional_data))
+        flows = flows.reindex(columns=flows.columns.union(
+            ['net_3day', 'fii_net', 'dii_net', 'delivery_pct'], sort=False))
+
+        cap_type = self.cap_index.classify(flows.index)
+        threshold = cap_type.map(self.cap_thresholds).fillna(1e7)
+        passed = pd.to_numeric(flows['net_3day'], errors='coerce').fillna(0) >= threshold
+
+        screened = flows.loc[passed, ['fii_net', 'dii_net', 'delivery_pct']].copy()
+        screened['cap_type'] = cap_type[passed]
+        return screened
+
     def fetch_institutional_data(self) -> Dict[str, Any]:
         """
         Fetch FII/DII data from the configured API endpoint.
 
+        The parsed payload is memoized per trading date. Repeat calls within
+        `revalidate_seconds` make no request; later ones send a conditional GET
+        and only re-parse if the server reports a change.
+
         Returns:
             dict: Institutional data keyed by symbol.
         """
+        day = trading_date()
+        memo = self._payloads.get(day)
+        if memo and time.monotonic() - memo[0] < self.revalidate_seconds:
+            return memo[1]
         try:
-            response = requests.get(self.api_endpoint, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            content, modified = self.fetcher.fetch_conditional(self.api_endpoint)
+            payload = memo[1] if memo and not modified else json.loads(content)
         except Exception as e:
             print(f"Error fetching institutional data: {e}")
-            return {}
+            return memo[1] if memo else {}
+        # Only the current trading date is worth keeping
+        self._payloads = {day: (time.monotonic(), payload)}
+        return payload
 
     def get_cap_type(self, symbol: str) -> str:
         """
@@ -198,12 +263,7 @@ class InstitutionalScreener:
         Returns:
             str: 'large', 'mid', or 'small'
         """
-        # Example logic; replace with actual market cap lookup
-        if symbol in ['RELIANCE', 'HDFCBANK']:
-            return 'large'
-        elif symbol in ['PEL', 'DEEPAKNTR']:
-            return 'mid'
-        return 'small'
+        return self.cap_index.get(symbol)
 
     def get_enhanced_flows(self, symbol: str) -> Dict[str, Any]:
         """
@@ -226,6 +286,40 @@ class InstitutionalScreener:
             'block_deals': self._match_block_deals(symbol, block_deals)
         }
 
+    def get_enhanced_flows_many(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        get_enhanced_flows() for many symbols, fetching each dataset once and
+        grouping block deals by symbol up front.
+
+        Args:
+            symbols (iterable): Trading symbols.
+
+        Returns:
+            dict: Symbol -> aggregated institutional flow data.
+        """
+        flows = self.data_pipeline.fetch_fii_activity()
+        oi_data = self.data_pipeline.fetch_oi_changes()
+        deals_by_symbol = self.index_block_deals(
+            self.data_pipeline.fetch_block_deals())
+
+        return {
+            symbol: {
+                'symbol': symbol,
+                'fii_flows': self._process_flows(flows, symbol),
+                'oi_changes': self._process_oi(oi_data, symbol),
+                'block_deals': deals_by_symbol.get(symbol, [])
+            }
+            for symbol in symbols
+        }
+
+    @staticmethod
+    def index_block_deals(deals: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group block deals by symbol in one pass."""
+        by_symbol: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for deal in deals:
+            by_symbol[deal.get('symbol')].append(deal)
+        return dict(by_symbol)
+
     def _process_flows(self, flows: Dict[str, Any], symbol: str) -> Dict[str, Any]:
         """Extract FII flows for the symbol."""
         return flows.get(symbol, {})
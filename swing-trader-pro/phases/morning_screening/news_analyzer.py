@@ -1,8 +1,22 @@
 # phases/1_morning_screening/news_analyzer.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable
 import requests
 import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from textblob import TextBlob
+from config.news_config import (
+    NEWS_FETCH_CONFIG, SENTIMENT_CACHE_CONFIG, SENTIMENT_TIMELINE_CONFIG)
+from core.metrics import REGISTRY as METRICS
+from core.sentiment_backends import SentimentBackend, build_backend
+from core.sentiment_cache import SentimentCache
+from core.sentiment_store import SentimentTimeline
+from core.symbol_matcher import SymbolMatcher
+from data_providers.rss_fetcher import RSSFetcher
+
+logger = logging.getLogger(__name__)
 
 
 class NewsAnalyzer:
@@ -206,16 +220,26 @@ class NewsAnalyzer:
     Sources and their weights are configurable via a JSON config file.
     """
 
-    def __init__(self, config_path: str = 'config/news_sources.json'):
+    # Sentiment caches shared by all instances (one per backend), see _shared_cache()
+    _caches: Dict[str, SentimentCache] = {}
+    _cache_lock = threading.Lock()
+    _timeline: Optional[SentimentTimeline] = None
+
+    def __init__(self, config_path: str = 'config/news_sources.json',
+                 backend: Optional[SentimentBackend] = None):
         """
         Initialize NewsAnalyzer with sources from config.
 
         Args:
             config_path (str): Path to JSON config listing sources and weights.
+            backend (SentimentBackend, optional): Headline scorer; defaults to
+                the one configured in SENTIMENT_BACKEND_CONFIG.
         """
         try:
             with open(config_path) as f:
-                self.sources = json.load(f)
+                # Skip the '//' path header the config files carry
+                self.sources = json.loads(''.join(
+                    line for line in f if not line.lstrip().startswith('//')))
         except Exception as e:
             print(f"Error loading news sources config: {e}")
             # Fallback to default sources if config fails
@@ -224,6 +248,13 @@ class NewsAnalyzer:
                 "economic_times": {"weight": 1.0},
                 "twitter_finance": {"weight": 1.0}
             }
+        # analyze_bulk state: source -> (fetched_at, articles), lazy fetcher/matcher
+        self._feed_cache: Dict[str, tuple] = {}
+        self._rss_fetcher: Optional[RSSFetcher] = None
+        self._matcher: Optional[tuple] = None
+        self.backend = backend or build_backend()
+        self.sentiment_cache = self._shared_cache(self.backend.name)
+        self.timeline = self._shared_timeline()
 
     def analyze(self, symbol: str) -> float:
         """
@@ -233,8 +264,13 @@ class NewsAnalyzer:
             symbol (str): The trading symbol.
 
         Returns:
-            float: Weighted average sentiment score (-1 to 1).
+            float: Weighted average sentiment score (-1 to 1); the time-decayed
+            rolling score when the sentiment timeline is enabled.
         """
+        rolling = self._recent_score(symbol)
+        if rolling is not None:
+            return rolling
+
         sentiments = []
         total_weight = 0.0
 
@@ -250,7 +286,228 @@ class NewsAnalyzer:
 
         if not sentiments or total_weight == 0:
             return 0.0
-        return sum(sentiments) / total_weight
+        return self._record(symbol, sum(sentiments) / total_weight)
+
+    def analyze_many(self, symbols: Iterable[str],
+                     deadline_seconds: Optional[float] = None) -> Dict[str, float]:
+        """
+        Aggregate sentiment for many symbols, fetching (source x symbol)
+        concurrently.
+
+        Each source has its own concurrency limit and request timeout; the
+        whole fan-out is bounded by a global deadline. Fetches that have not
+        finished by the deadline are dropped and the symbol is scored from the
+        sources that did answer, exactly like analyze() skips a failed source.
+
+        Args:
+            symbols (iterable): Trading symbols.
+            deadline_seconds (float, optional): Overrides the configured deadline.
+
+        Returns:
+            dict: Symbol -> weighted average sentiment score (-1 to 1), or the
+            rolling score as in analyze(). Symbols with no completed source
+            score 0.0. Symbols scored within refresh_minutes are answered
+            from the timeline without fetching.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        fresh = self._recent_scores(symbols)
+        stale = [symbol for symbol in symbols if symbol not in fresh]
+        scores = self._fan_out(stale, list(self.sources), deadline_seconds)
+        return self._merge(symbols, fresh, self._record_many(scores))
+
+    def analyze_bulk(self, symbols: Iterable[str],
+                     deadline_seconds: Optional[float] = None) -> Dict[str, float]:
+        """
+        Aggregate sentiment for many symbols, pulling each market-wide feed once.
+
+        Sources with a feed 'url' in news_sources.json are downloaded once per
+        cycle (cached for `feed_ttl_seconds`) and their articles are assigned to
+        symbols by SymbolMatcher over tickers, company names and aliases. Sources
+        without a feed (e.g. twitter_finance) still go through the per-symbol
+        fan-out of analyze_many().
+
+        Args:
+            symbols (iterable): Trading symbols.
+            deadline_seconds (float, optional): Deadline for the per-symbol sources.
+
+        Returns:
+            dict: Symbol -> weighted average sentiment score (-1 to 1), or the
+            rolling score as in analyze(). Symbols scored within
+            refresh_minutes are answered from the timeline without fetching.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        fresh = self._recent_scores(symbols)
+        stale = [symbol for symbol in symbols if symbol not in fresh]
+        if not stale:
+            return self._merge(symbols, fresh, {})
+        feed_sources = [source for source, config in self.sources.items()
+                        if RSSFetcher.feed_urls(config)]
+        other_sources = [source for source in self.sources
+                         if source not in feed_sources]
+
+        scores = self._fan_out(stale, other_sources, deadline_seconds)
+        if feed_sources:
+            # Matched over the whole universe so the automaton is reused
+            # between cycles; fresh symbols' matches are dropped below
+            matcher = self._get_matcher(symbols)
+            for source in feed_sources:
+                articles = self._feed_articles(source)
+                if articles is None:
+                    continue
+                if self.sentiment_cache is not None:
+                    # Score the whole feed in one batch; per-symbol scoring
+                    # below then only hits the cache
+                    self._score_texts([article['title'] for article in articles])
+                for symbol, matched in matcher.index(articles).items():
+                    if symbol in scores:
+                        scores[symbol][source] = self._analyze_articles(matched)
+        return self._merge(symbols, fresh, self._record_many(scores))
+
+    def _recent_score(self, symbol: str) -> Optional[float]:
+        """Rolling score if the symbol was scored within refresh_minutes, else None."""
+        if self.timeline is None:
+            return None
+        last = self.timeline.last_update(symbol)
+        if (last is None or time.time() - last >=
+                SENTIMENT_TIMELINE_CONFIG['refresh_minutes'] * 60):
+            return None
+        return self.timeline.score(symbol)
+
+    def _recent_scores(self, symbols: List[str]) -> Dict[str, float]:
+        """_recent_score() for many symbols, leaving out the ones due a refresh."""
+        recent = {symbol: self._recent_score(symbol) for symbol in symbols}
+        return {symbol: score for symbol, score in recent.items() if score is not None}
+
+    @staticmethod
+    def _merge(symbols: List[str], fresh: Dict[str, float],
+               scored: Dict[str, float]) -> Dict[str, float]:
+        """Timeline and freshly fetched scores, in the caller's symbol order."""
+        return {symbol: fresh[symbol] if symbol in fresh else scored[symbol]
+                for symbol in symbols}
+
+    def _record(self, symbol: str, score: float) -> float:
+        """Append a fresh score to the timeline and return the rolling score."""
+        if self.timeline is None:
+            return score
+        try:
+            self.timeline.append(symbol, score)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not record sentiment for {symbol}: {e}")
+            return score
+        rolling = self.timeline.score(symbol)
+        return score if rolling is None else rolling
+
+    def _record_many(self, scores: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """Weight per-source scores, recording symbols that had any source answer."""
+        return {symbol: self._record(symbol, self._weighted(per_source))
+                if per_source else 0.0
+                for symbol, per_source in scores.items()}
+
+    def _feed_articles(self, source: str) -> Optional[List[Dict[str, Any]]]:
+        """Articles of a feed source, fetched at most once per feed_ttl_seconds."""
+        cached = self._feed_cache.get(source)
+        if cached and time.monotonic() - cached[0] < NEWS_FETCH_CONFIG['feed_ttl_seconds']:
+            return cached[1]
+        if self._rss_fetcher is None:
+            self._rss_fetcher = RSSFetcher()
+        self._rss_fetcher.timeout = self._source_setting(source, 'timeout')
+        start = time.perf_counter()
+        articles = self._rss_fetcher.get_articles(self.sources[source])
+        METRICS.observe('swing_fetch_seconds',
+                        time.perf_counter() - start, source=source)
+        METRICS.observe('swing_fetch_rows', len(articles), source=source)
+        if not articles:
+            METRICS.inc('swing_fetch_failures_total', source=source)
+            logger.warning(f"No articles from {source} feed")
+            return None
+        self._feed_cache[source] = (time.monotonic(), articles)
+        return articles
+
+    def _get_matcher(self, symbols: List[str]) -> SymbolMatcher:
+        """SymbolMatcher for this universe, rebuilt only when the universe changes."""
+        key = frozenset(symbols)
+        if self._matcher is None or self._matcher[0] != key:
+            self._matcher = (key, SymbolMatcher(symbols))
+        return self._matcher[1]
+
+    def _fan_out(self, symbols: List[str], sources: List[str],
+                 deadline_seconds: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Fetch and score (source x symbol) concurrently under per-source limits
+        and a global deadline.
+
+        Returns:
+            dict: Symbol -> {source: sentiment} for the fetches that completed.
+        """
+        if deadline_seconds is None:
+            deadline_seconds = NEWS_FETCH_CONFIG['deadline_seconds']
+        deadline = time.monotonic() + deadline_seconds
+        scores: Dict[str, Dict[str, float]] = {symbol: {} for symbol in symbols}
+        if not sources:
+            return scores
+
+        def fetch(source, symbol):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"deadline reached before fetching {source}")
+            start = time.perf_counter()
+            articles = self._fetch_news(source, symbol)
+            METRICS.observe('swing_fetch_seconds',
+                            time.perf_counter() - start, source=source)
+            return self._analyze_articles(articles)
+
+        # One bounded pool per source: a slow source queues behind its own
+        # limit without holding threads the other sources could use.
+        executors = {
+            source: ThreadPoolExecutor(
+                max_workers=int(self._source_setting(source, 'max_concurrency')),
+                thread_name_prefix=f'news-{source}')
+            for source in sources
+        }
+        futures = {
+            executors[source].submit(fetch, source, symbol): (source, symbol)
+            for symbol in symbols for source in sources
+        }
+        done, pending = wait(futures, timeout=max(
+            0.0, deadline - time.monotonic()))
+        # Don't wait for stragglers; their HTTP timeouts end them in the background
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        failed: Dict[str, int] = {}
+        for future in done:
+            source, symbol = futures[future]
+            try:
+                scores[symbol][source] = future.result()
+            except Exception as e:
+                failed[source] = failed.get(source, 0) + 1
+                logger.debug(f"Error analyzing {source} for {symbol}: {e}")
+        for future in pending:
+            source, _ = futures[future]
+            failed[source] = failed.get(source, 0) + 1
+        for source, count in failed.items():
+            METRICS.inc('swing_fetch_failures_total', count, source=source)
+            logger.warning(
+                f"News source {source}: {count}/{len(symbols)} symbols missing "
+                f"(failed or past the {deadline_seconds:g}s deadline)")
+        return scores
+
+    def _weighted(self, per_source: Dict[str, float]) -> float:
+        """Weighted average of per-source sentiments using configured weights."""
+        total_weight = 0.0
+        total = 0.0
+        for source, sentiment in per_source.items():
+            weight = self.sources[source].get('weight', 1.0)
+            total += sentiment * weight
+            total_weight += weight
+        return total / total_weight if total_weight else 0.0
+
+    def _source_setting(self, source: str, key: str):
+        """Per-source fetch setting from news_sources.json, news_config, or the default."""
+        value = self.sources.get(source, {}).get(key)
+        if value is None:
+            value = NEWS_FETCH_CONFIG['sources'].get(source, {}).get(
+                key, NEWS_FETCH_CONFIG[f'default_{key}'])
+        return value
 
     def _fetch_news(self, source: str, symbol: str) -> List[Dict[str, Any]]:
         """
@@ -286,12 +543,50 @@ class NewsAnalyzer:
         if not articles:
             return 0.0
 
-        polarities = [
-            TextBlob(article.get('title', '')).sentiment.polarity
-            for article in articles if 'title' in article
-        ]
+        titles = [article.get('title', '')
+                  for article in articles if 'title' in article]
+        polarities = self._score_texts(titles)
         return sum(polarities) / len(polarities) if polarities else 0.0
 
+    def _score_texts(self, texts: List[str]) -> List[float]:
+        """Score a batch of texts with the backend, through the cache if enabled."""
+        if not texts:
+            return []
+        if self.sentiment_cache is not None:
+            return self.sentiment_cache.score_many(texts, self.backend.score_many)
+        return self.backend.score_many(texts)
+
+    @classmethod
+    def _shared_cache(cls, namespace: str) -> Optional[SentimentCache]:
+        """Process-wide SentimentCache for a backend, opened on first use (None if disabled)."""
+        if not SENTIMENT_CACHE_CONFIG['enabled']:
+            return None
+        with cls._cache_lock:
+            if namespace not in cls._caches:
+                cls._caches[namespace] = SentimentCache(
+                    path=SENTIMENT_CACHE_CONFIG['path'],
+                    ttl_seconds=SENTIMENT_CACHE_CONFIG['ttl_seconds'],
+                    max_memory=SENTIMENT_CACHE_CONFIG['max_memory'],
+                    max_distance=SENTIMENT_CACHE_CONFIG['max_distance'],
+                    namespace=namespace)
+            return cls._caches[namespace]
+
+    @classmethod
+    def _shared_timeline(cls) -> Optional[SentimentTimeline]:
+        """Process-wide SentimentTimeline, opened on first use (None if disabled)."""
+        if not SENTIMENT_TIMELINE_CONFIG['enabled']:
+            return None
+        with cls._cache_lock:
+            if cls._timeline is None:
+                try:
+                    cls._timeline = SentimentTimeline(
+                        SENTIMENT_TIMELINE_CONFIG['path'],
+                        half_life_hours=SENTIMENT_TIMELINE_CONFIG['half_life_hours'])
+                except OSError as e:
+                    logger.error(f"Sentiment timeline disabled: {e}")
+                    return None
+            return cls._timeline
+
     def _fetch_moneycontrol(self, symbol: str) -> List[Dict[str, Any]]:
         """
         Fetch news articles from Moneycontrol for a symbol.
@@ -306,7 +601,8 @@ class NewsAnalyzer:
         # Example: Simulate fetching with a public RSS feed or placeholder
         try:
             url = f"https://newsapi.org/v2/everything?q={symbol}+moneycontrol&apiKey=YOUR_NEWSAPI_KEY"
-            response = requests.get(url, timeout=5)
+            response = requests.get(
+                url, timeout=self._source_setting('moneycontrol', 'timeout'))
             if response.status_code == 200:
                 data = response.json()
                 return [{"title": article["title"]} for article in data.get("articles", [])]
@@ -331,7 +627,8 @@ class NewsAnalyzer:
         """
         try:
             url = f"https://newsapi.org/v2/everything?q={symbol}+economic+times&apiKey=YOUR_NEWSAPI_KEY"
-            response = requests.get(url, timeout=5)
+            response = requests.get(
+                url, timeout=self._source_setting('economic_times', 'timeout'))
             if response.status_code == 200:
                 data = response.json()
                 return [{"title": article["title"]} for article in data.get("articles", [])]
@@ -1,6 +1,7 @@
 # phases/1_morning_screening/wyckoff_phase.py
 from typing import Dict, Any, Sequence
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 class WyckoffAnalyzer:
@@ -100,3 +101,64 @@ class WyckoffAnalyzer:
             'support': support,
             'resistance': resistance
         }
+
+    def detect_series(self, price_data: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+        """
+        Run detect() for every bar in one pass.
+
+        Entry t of each output array equals detect() called on the data up to
+        and including bar t. Support/resistance and the recent volume mean are
+        rolling-window reductions, so the cost is linear in the number of bars.
+
+        Args:
+            price_data (dict): Dictionary with 'close' and 'volume' lists/arrays.
+
+        Returns:
+            dict: Arrays aligned with the input bars: phase (object, None where
+            fewer than `window` bars are available), score, support and
+            resistance (float, NaN there), and a boolean 'valid' mask.
+        """
+        closes = np.asarray(price_data.get('close', []), dtype=float)
+        volumes = np.asarray(price_data.get('volume', []), dtype=float)
+        n = min(len(closes), len(volumes))
+        closes, volumes = closes[:n], volumes[:n]
+
+        phase = np.full(n, None, dtype=object)
+        score = np.full(n, np.nan)
+        support = np.full(n, np.nan)
+        resistance = np.full(n, np.nan)
+        valid = np.zeros(n, dtype=bool)
+        if n < self.window:
+            return {'phase': phase, 'score': score, 'support': support,
+                    'resistance': resistance, 'valid': valid}
+
+        # detect() only ever looks inside its last `window` bars
+        band = min(self.band, self.window)
+        vol_span = min(5, self.window)
+        first = self.window - 1
+        valid[first:] = True
+
+        support[first:] = _rolling(closes, band, np.min)[first:]
+        resistance[first:] = _rolling(closes, band, np.max)[first:]
+        mean_recent_vol = _rolling(volumes, vol_span, np.mean)[first:]
+        mean_recent_vol[mean_recent_vol == 0] = 1e-8
+
+        midpoint = (support[first:] + resistance[first:]) / 2
+        last_close = closes[first:]
+        accumulation = (last_close > midpoint) & (
+            volumes[first:] > mean_recent_vol)
+        distribution = ~accumulation & (last_close < midpoint)
+
+        phase[first:] = np.select(
+            [accumulation, distribution], ['accumulation', 'distribution'], 'neutral')
+        score[first:] = np.select([accumulation, distribution], [8, 4], 5)
+        return {'phase': phase, 'score': score, 'support': support,
+                'resistance': resistance, 'valid': valid}
+
+
+def _rolling(values: np.ndarray, period: int, reducer) -> np.ndarray:
+    """Apply `reducer` over trailing windows of `period`; NaN for the first period-1 bars."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1:] = reducer(sliding_window_view(values, period), axis=-1)
+    return out
@@ -0,0 +1,35 @@
+# scripts/backfill_nsdl.py
+"""
+Load historical FII/DII data from the NSDL archives into the local store.
+
+    python -m scripts.backfill_nsdl --start 2018-01-01
+    python -m scripts.backfill_nsdl --start 2023-01-01 --segment derivatives
+
+Safe to re-run: pages already covered by the store are skipped.
+"""
+import argparse
+import logging
+
+from data_providers.nsdl_fetcher import NSDLFetcher
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(message)s"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill NSDL FII/DII history")
+    parser.add_argument("--start", required=True, help="Oldest date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Newest date (YYYY-MM-DD); default: current trading date")
+    parser.add_argument("--segment", action="append",
+                        help="Segment to load (repeatable); default: all configured")
+    args = parser.parse_args()
+
+    added = NSDLFetcher().backfill(args.start, args.end, args.segment)
+    for segment, count in added.items():
+        print(f"{segment}: {count} new day(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 # strategies/institutional/fii_dii_flow.py
 from typing import Optional, Dict, Any
+import numpy as np
 from .hedge_detector import HedgeDetector
-from config import constraints, hedge_constraints
+from config.json_config import load_json_config
+
+constraints = load_json_config('constraints.json')
+hedge_constraints = load_json_config('hedge_constraints.json')
 
 
 class InstitutionalStrategy:
@@ -79,13 +83,16 @@ class InstitutionalStrategy:
     and optionally adjusts for hedging activity using HedgeDetector.
     """
 
-    def __init__(self, use_hedge_detection: bool = True):
+    def __init__(self, use_hedge_detection: bool = True,
+                 hedge_detector: Optional[HedgeDetector] = None):
         """
         Args:
             use_hedge_detection (bool): If True, use hedge detection logic; else use simple flow logic.
+            hedge_detector (HedgeDetector, optional): Used when the data carries
+                no 'hedge_flags'; built on first such use by default.
         """
         self.use_hedge_detection = use_hedge_detection
-        self.hedge_detector = HedgeDetector() if use_hedge_detection else None
+        self.hedge_detector = hedge_detector
         self.min_net_buy = constraints['CAP_THRESHOLDS']['large']
 
     def analyze(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -98,6 +105,8 @@ class InstitutionalStrategy:
                 - 'close'
                 - 'fii_flows' (dict with 'net_3day', etc.)
                 - 'oi_changes' (dict)
+                and may carry 'hedge_flags' from a hedge check the caller
+                already ran (StrategyRouter does), which is then not repeated.
             For simple mode, must include:
                 - 'fii_net'
                 - 'dii_net'
@@ -120,11 +129,15 @@ class InstitutionalStrategy:
             if fii_data['net_3day'] < self.min_net_buy:
                 return None
 
-            hedge_flags = self.hedge_detector.detect_hedges(
-                data['symbol'],
-                fii_data,
-                oi_data
-            )
+            hedge_flags = data.get('hedge_flags')
+            if hedge_flags is None:
+                if self.hedge_detector is None:
+                    self.hedge_detector = HedgeDetector()
+                hedge_flags = self.hedge_detector.detect_hedges(
+                    data['symbol'],
+                    fii_data,
+                    oi_data
+                )
             return self._generate_signal(data, hedge_flags)
         else:
             # Simple mode: only FII/DII net flows
@@ -150,17 +163,19 @@ class InstitutionalStrategy:
         Generate a trade signal, adjusting for hedge detection.
 
         Args:
-            data (dict): Symbol data.
+            data (dict): Symbol data; 'close' is a price or a series of
+                closes, of which the last is used.
             hedge_flags (dict): Output from HedgeDetector.detect_hedges().
 
         Returns:
             dict: Signal dictionary.
         """
+        close = float(np.ravel(data['close'])[-1])
         base_signal = {
             'symbol': data['symbol'],
-            'entry': data['close'],
-            'sl': round(data['close'] * 0.9, 2),
-            'target': round(data['close'] * 1.1, 2),
+            'entry': close,
+            'sl': round(close * 0.9, 2),
+            'target': round(close * 1.1, 2),
             'score': 8  # Base score
         }
 
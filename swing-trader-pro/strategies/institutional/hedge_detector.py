@@ -1,6 +1,15 @@
 # strategies/institutional/hedge_detector.py
+from typing import Dict, Iterable, Optional
+import logging
+import os
+
 import numpy as np
-from config import hedge_constraints
+import pandas as pd
+from config.json_config import load_json_config
+from data.oi_chain_store import OIChainStore, default_oi_store
+from core.rolling_correlation import RollingCorrelation
+
+hedge_constraints = load_json_config('hedge_constraints.json')
 
 
 class HedgeDetector:
@@ -109,10 +118,22 @@ class HedgeDetector:
 
 # method 3 final version after todo
 
+logger = logging.getLogger(__name__)
+
+SECTORS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "sectors.csv")
+
+HEDGE_FLAGS = ['index_hedge', 'sector_hedge', 'pair_trade']
+
 
 class HedgeDetector:
     """
     Detects various forms of institutional hedging activity using FII and OI data.
+
+    detect_hedges_many() evaluates a whole universe per cycle: the market-wide
+    index-hedge and pair-trade conditions are computed once, sector flows are
+    joined through the symbol -> sector map, and pair membership is a dict
+    lookup (PAIR_LIST) or a top-k partner lookup (pair_engine).
     """
 
     # Example: Known pairs for pair trading (can be expanded)
@@ -123,8 +144,47 @@ class HedgeDetector:
         ("SBIN", "PNB"),
     ]
 
-    def __init__(self):
+    def __init__(self, oi_store: OIChainStore = None, sectors_path: str = SECTORS_PATH,
+                 sector_flows: Optional[Dict[str, float]] = None,
+                 pair_engine: Optional[RollingCorrelation] = None):
+        """
+        Args:
+            oi_store (OIChainStore, optional): Source of OI changes when the
+                caller's oi_data lacks them; defaults to the process-wide store.
+            sectors_path (str): CSV with 'symbol' and 'sector' columns.
+            sector_flows (dict, optional): Sector -> net FII flow (see
+                NSDLFetcher.get_sector_flows), in the unit of the
+                'sector_flow_threshold' constraint.
+            pair_engine (RollingCorrelation, optional): Discovers pairs from
+                rolling return correlations, in addition to PAIR_LIST. The
+                caller keeps it fitted and updated with closes.
+        """
         self.constraints = hedge_constraints
+        self.oi_store = oi_store or default_oi_store()
+        self.sectors = self._load_sectors(sectors_path)
+        self._sector_of = self.sectors.to_dict()
+        self.sector_flows = pd.Series(dtype=float)
+        self.update_sector_flows(sector_flows or {})
+        # Symbol -> pair partners, for O(1) membership checks
+        self.pairs: Dict[str, set] = {}
+        for s1, s2 in self.PAIR_LIST:
+            self.pairs.setdefault(s1, set()).add(s2)
+            self.pairs.setdefault(s2, set()).add(s1)
+        self.pair_engine = pair_engine
+
+    @staticmethod
+    def _load_sectors(path: str) -> pd.Series:
+        try:
+            table = pd.read_csv(path, comment='#')
+        except Exception as e:
+            logger.warning(f"Could not load sector map {path}: {e}")
+            return pd.Series(dtype=object, name='sector')
+        table['symbol'] = table['symbol'].astype(str).str.strip().str.upper()
+        return table.drop_duplicates('symbol', keep='last').set_index('symbol')['sector']
+
+    def update_sector_flows(self, sector_flows: Dict[str, float]) -> None:
+        """Replace the sector -> net flow vector used for sector hedges."""
+        self.sector_flows = pd.Series(sector_flows, dtype=float)
 
     def detect_hedges(self, symbol, fii_data, oi_data):
         """
@@ -133,17 +193,54 @@ class HedgeDetector:
         Args:
             symbol (str): Trading symbol.
             fii_data (dict): FII flow data, must include 'net_cash' and 'net_fno'.
-            oi_data (dict): OI data, must include 'nifty_oi_pct_change'.
+            oi_data (dict): OI data with 'nifty_oi_pct_change'; missing keys
+                are filled from the OI store.
 
         Returns:
             dict: Flags for 'index_hedge', 'sector_hedge', and 'pair_trade'.
         """
+        if not oi_data or 'nifty_oi_pct_change' not in oi_data:
+            oi_data = {**self.oi_store.oi_changes(symbol), **(oi_data or {})}
         return {
             'index_hedge': self._check_index_hedge(fii_data, oi_data),
             'sector_hedge': self._check_sector_hedge(symbol, fii_data),
             'pair_trade': self._check_pair_trade(symbol, fii_data, oi_data)
         }
 
+    def detect_hedges_many(self, symbols: Iterable[str], fii_data, oi_data=None,
+                           sector_flows: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Hedge flags for a whole universe in one pass.
+
+        Args:
+            symbols (iterable): Trading symbols.
+            fii_data (dict): Market-wide FII flow data with 'net_cash' and 'net_fno'.
+            oi_data (dict, optional): Index OI data with 'nifty_oi_pct_change';
+                filled from the OI store if missing.
+            sector_flows (dict, optional): Sector -> net flow for this cycle;
+                replaces the stored vector when given.
+
+        Returns:
+            pd.DataFrame: Boolean flags indexed by symbol, columns
+            'index_hedge', 'sector_hedge' and 'pair_trade'.
+        """
+        index = pd.Index(list(symbols), name='symbol')
+        fii_data = fii_data or {}
+        if not oi_data or 'nifty_oi_pct_change' not in oi_data:
+            oi_data = {**self.oi_store.oi_changes(), **(oi_data or {})}
+        if sector_flows is not None:
+            self.update_sector_flows(sector_flows)
+
+        flows = self.sectors.reindex(index).map(self.sector_flows).astype(float).fillna(0.0)
+        in_pair = index.isin(list(self.pairs))
+        if self.pair_engine is not None:
+            in_pair |= self.pair_engine.has_partners(index)
+        return pd.DataFrame({
+            'index_hedge': self._check_index_hedge(fii_data, oi_data),
+            'sector_hedge': flows.to_numpy() < self.constraints['sector_flow_threshold'],
+            'pair_trade': in_pair & self._pair_trade_condition(fii_data, oi_data),
+        }, index=index, columns=HEDGE_FLAGS).astype(bool)
+
     def _check_index_hedge(self, fii_data, oi_data):
         """
         Detect index-level hedging via cash/derivatives ratio and OI change.
@@ -174,13 +271,14 @@ class HedgeDetector:
 
     def _get_sector_flow(self, symbol):
         """
-        Placeholder for sector ETF flow lookup.
+        Net flow of the symbol's sector.
 
         Returns:
-            float: Net sector flow value.
+            float: Net sector flow value; 0 for symbols without a known sector
+            or sector flow.
         """
-        # TODO: Replace with actual sector ETF flow lookup
-        return -3.2e7  # Mock value
+        flow = self.sector_flows.get(self._sector_of.get(symbol), 0.0)
+        return 0.0 if pd.isna(flow) else float(flow)
 
     def _check_pair_trade(self, symbol, fii_data, oi_data):
         """
@@ -192,22 +290,19 @@ class HedgeDetector:
         # Example logic:
         # If symbol is in a known pair and both FII and OI data show opposite flows for the pair,
         # flag as pair trade. This is a simplified approach.
-
-        # Simulate fetching the pair symbol (in real use, fetch actual pair data)
-        pair_symbol = None
-        for s1, s2 in self.PAIR_LIST:
-            if symbol == s1:
-                pair_symbol = s2
-                break
-            elif symbol == s2:
-                pair_symbol = s1
-                break
-
-        if not pair_symbol:
+        if symbol not in self.pairs and not (
+                self.pair_engine is not None and self.pair_engine.partners(symbol)):
             return False
+        return self._pair_trade_condition(fii_data, oi_data)
 
-        # Simulate fetching FII and OI data for the pair symbol (in real use, pass these in)
-        # Here, we just check if the current symbol's FII and OI flows are in opposite directions
+    def _pair_trade_condition(self, fii_data, oi_data):
+        """
+        Market-wide part of pair-trade detection, shared by every paired symbol.
+
+        Returns:
+            bool: True if FII flows and OI change indicate pair trading.
+        """
+        # Here, we just check if the FII cash and F&O flows are in opposite directions
         net_cash = fii_data.get('net_cash', 0)
         net_fno = fii_data.get('net_fno', 0)
         oi_change = oi_data.get('nifty_oi_pct_change', 0)
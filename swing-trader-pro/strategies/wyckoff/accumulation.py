@@ -1,5 +1,6 @@
 # strategies/wyckoff/accumulation.py
 from typing import Optional, Dict, Any
+import numpy as np
 from phases.morning_screening.wyckoff_phase import WyckoffAnalyzer
 
 
@@ -64,3 +65,27 @@ class WyckoffAccumulationStrategy:
                 'score': score
             }
         return None
+
+    def analyze_series(self, price_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the strategy at every bar with a single detect_series() pass.
+
+        Args:
+            price_data (dict): Must contain 'close' and 'volume' lists/arrays.
+
+        Returns:
+            dict: Arrays aligned with the input bars: 'signal' (True where
+            analyze() on the data up to that bar would return a setup) and
+            entry, sl, target, score (NaN where there is no signal).
+        """
+        wyckoff = self.analyzer.detect_series(price_data)
+        signal = wyckoff['phase'] == 'accumulation'
+        support = np.where(signal, wyckoff['support'], np.nan)
+        resistance = np.where(signal, wyckoff['resistance'], np.nan)
+        return {
+            'signal': signal,
+            'entry': resistance * 0.99,
+            'sl': support * 0.98,
+            'target': resistance * 1.1,
+            'score': np.where(signal, wyckoff['score'], np.nan),
+        }
@@ -1,7 +1,7 @@
 # strategies/wyckoff/distribution.py
 from phases.morning_screening.wyckoff_phase import WyckoffAnalyzer
 from typing import Optional, Dict, Any
-import phases.morning_screening.wyckoff_phase as WyckoffAnalyzer
+import numpy as np
 
 
 class WyckoffDistributionStrategy:
@@ -67,3 +67,29 @@ class WyckoffDistributionStrategy:
                 'direction': 'short'
             }
         return None
+
+    def analyze_series(self, price_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the strategy at every bar with a single detect_series() pass.
+
+        Args:
+            price_data (dict): Must contain 'close' and 'volume' lists/arrays.
+
+        Returns:
+            dict: Arrays aligned with the input bars: 'signal' (True where
+            analyze() on the data up to that bar would return a setup),
+            entry, sl, target, score (NaN where there is no signal) and
+            direction.
+        """
+        wyckoff = self.analyzer.detect_series(price_data)
+        signal = wyckoff['phase'] == 'distribution'
+        support = np.where(signal, wyckoff['support'], np.nan)
+        resistance = np.where(signal, wyckoff['resistance'], np.nan)
+        return {
+            'signal': signal,
+            'entry': support * 1.01,
+            'sl': resistance * 1.02,
+            'target': support * 0.94,
+            'score': np.where(signal, wyckoff['score'], np.nan),
+            'direction': np.full(len(signal), 'short', dtype=object),
+        }
@@ -0,0 +1,109 @@
+# technicals/indicators.py
+"""
+Panel (symbols x bars) versions of the TA-Lib indicators used by the
+classifiers. Every function takes a 2D float array with one row per symbol
+and computes across all rows at once; outputs follow TA-Lib's lookback and
+seeding conventions so results match the per-symbol talib calls (leading
+values are NaN).
+"""
+import numpy as np
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Simple moving average along the last axis (talib.SMA semantics).
+
+    Args:
+        values (np.ndarray): 2D array (symbols x bars).
+        period (int): Window length.
+
+    Returns:
+        np.ndarray: Same shape as `values`, NaN for the first period-1 bars.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return out
+    csum = np.cumsum(values, axis=-1)
+    out[..., period - 1] = csum[..., period - 1]
+    out[..., period:] = csum[..., period:] - csum[..., :-period]
+    out[..., period - 1:] /= period
+    return out
+
+
+def _ema_from(values: np.ndarray, period: int, first: int, seed_start: int) -> np.ndarray:
+    """EMA whose first output is at `first`, seeded with the SMA of values[seed_start:first+1]."""
+    out = np.full(values.shape, np.nan)
+    if first >= values.shape[-1]:
+        return out
+    k = 2.0 / (period + 1)
+    prev = values[..., seed_start:first + 1].mean(axis=-1)
+    out[..., first] = prev
+    for t in range(first + 1, values.shape[-1]):
+        prev = prev + k * (values[..., t] - prev)
+        out[..., t] = prev
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with an SMA (talib.EMA semantics)."""
+    values = np.asarray(values, dtype=float)
+    return _ema_from(values, period, period - 1, 0)
+
+
+def rsi(values: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Wilder's RSI (talib.RSI semantics, first value at index `period`).
+
+    Args:
+        values (np.ndarray): 2D array of closes.
+        period (int): RSI period.
+
+    Returns:
+        np.ndarray: RSI in [0, 100], NaN during the lookback.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    n_bars = values.shape[-1]
+    if n_bars <= period:
+        return out
+    delta = np.diff(values, axis=-1)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    avg_gain = gains[..., :period].mean(axis=-1)
+    avg_loss = losses[..., :period].mean(axis=-1)
+
+    def _value(g, l):
+        total = g + l
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total != 0, 100.0 * g / total, 0.0)
+
+    out[..., period] = _value(avg_gain, avg_loss)
+    for t in range(period + 1, n_bars):
+        avg_gain = (avg_gain * (period - 1) + gains[..., t - 1]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[..., t - 1]) / period
+        out[..., t] = _value(avg_gain, avg_loss)
+    return out
+
+
+def macd_line(values: np.ndarray, fast: int = 12, slow: int = 26) -> np.ndarray:
+    """
+    MACD line (fast EMA - slow EMA) with talib.MACD's alignment: both EMAs
+    start at index slow-1, the fast one seeded from the `fast` bars ending
+    there. talib additionally blanks the first signal-1 MACD values; callers
+    that only look at the tail (as the classifiers do) are unaffected.
+
+    Args:
+        values (np.ndarray): 2D array of closes.
+        fast (int): Fast EMA period.
+        slow (int): Slow EMA period.
+
+    Returns:
+        np.ndarray: MACD line, NaN before index slow-1.
+    """
+    values = np.asarray(values, dtype=float)
+    first = slow - 1
+    slow_ema = _ema_from(values, slow, first, 0)
+    fast_ema = _ema_from(values, fast, first, first - fast + 1)
+    return fast_ema - slow_ema
@@ -0,0 +1,181 @@
+# technicals/swings.py
+"""
+Swing point (peak/trough) detection.
+
+find_swings() works on a full price series with array operations; a bar is a
+candidate peak (trough) when the sign of the first difference flips from
+positive to negative (negative to positive) across it, i.e. it is strictly
+above (below) both neighbours. Candidates can optionally be thinned with a
+ZigZag filter: a reversal only counts once price has moved a minimum percent
+and/or a multiple of ATR away from the previous swing, and consecutive swings
+then alternate peak/trough.
+
+SwingDetector keeps the same state incrementally so a new bar can be folded
+in without rescanning the history.
+"""
+from typing import Optional, Tuple, List
+import numpy as np
+
+
+def swing_masks(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Boolean peak/trough masks along the last axis (1D series or symbols x bars).
+
+    Args:
+        values (np.ndarray): Price series or 2D panel.
+
+    Returns:
+        tuple: (is_peak, is_trough), same shape as `values`. The first and last
+        bar are never swings.
+    """
+    values = np.asarray(values, dtype=float)
+    is_peak = np.zeros(values.shape, dtype=bool)
+    is_trough = np.zeros(values.shape, dtype=bool)
+    if values.shape[-1] < 3:
+        return is_peak, is_trough
+    step = np.sign(np.diff(values, axis=-1))
+    is_peak[..., 1:-1] = (step[..., :-1] > 0) & (step[..., 1:] < 0)
+    is_trough[..., 1:-1] = (step[..., :-1] < 0) & (step[..., 1:] > 0)
+    return is_peak, is_trough
+
+
+class _ZigZag:
+    """
+    Reversal filter over a stream of candidate swings. The latest swing stays
+    `pending` (it can still be extended by a more extreme candidate of the same
+    kind) until price reverses by the threshold, at which point it is confirmed.
+    """
+
+    def __init__(self, pct: Optional[float] = None, atr_mult: Optional[float] = None):
+        self.pct = pct
+        self.atr_mult = atr_mult
+        self.peaks: List[int] = []
+        self.troughs: List[int] = []
+        self.pending: Optional[Tuple[int, float, bool]] = None  # (index, value, is_peak)
+
+    def _threshold(self, ref: float, atr: Optional[float]) -> float:
+        threshold = 0.0
+        if self.pct is not None:
+            threshold = max(threshold, abs(ref) * self.pct)
+        if self.atr_mult is not None and atr is not None and np.isfinite(atr):
+            threshold = max(threshold, atr * self.atr_mult)
+        return threshold
+
+    def feed(self, index: int, value: float, is_peak: bool, atr: Optional[float] = None) -> None:
+        if self.pending is None:
+            self.pending = (index, value, is_peak)
+            return
+        p_index, p_value, p_is_peak = self.pending
+        if is_peak == p_is_peak:
+            # Same direction: keep the more extreme of the two
+            if (value > p_value) if is_peak else (value < p_value):
+                self.pending = (index, value, is_peak)
+            return
+        if abs(value - p_value) >= self._threshold(p_value, atr):
+            (self.peaks if p_is_peak else self.troughs).append(p_index)
+            self.pending = (index, value, is_peak)
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        peaks, troughs = list(self.peaks), list(self.troughs)
+        if self.pending is not None:
+            (peaks if self.pending[2] else troughs).append(self.pending[0])
+        return np.asarray(peaks, dtype=int), np.asarray(troughs, dtype=int)
+
+
+def find_swings(values, pct: Optional[float] = None,
+                atr: Optional[np.ndarray] = None,
+                atr_mult: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find swing highs and lows in a price series.
+
+    Args:
+        values (array-like): 1D price series (e.g. closes).
+        pct (float, optional): ZigZag filter; minimum fractional move from the
+            previous swing for a reversal to count (0.03 = 3%).
+        atr (array-like, optional): ATR per bar, aligned with `values`.
+        atr_mult (float, optional): Minimum reversal as a multiple of ATR.
+
+    Returns:
+        tuple: (peak_indices, trough_indices) as sorted int arrays. With a
+        filter the most recent swing is included even if not yet confirmed.
+    """
+    values = np.asarray(values, dtype=float)
+    is_peak, is_trough = swing_masks(values)
+    if pct is None and atr_mult is None:
+        return np.flatnonzero(is_peak), np.flatnonzero(is_trough)
+
+    atr = None if atr is None else np.asarray(atr, dtype=float)
+    zigzag = _ZigZag(pct, atr_mult)
+    # Only the candidates go through the sequential filter
+    for i in np.flatnonzero(is_peak | is_trough):
+        zigzag.feed(int(i), values[i], bool(is_peak[i]),
+                    None if atr is None else atr[i])
+    return zigzag.result()
+
+
+class SwingDetector:
+    """
+    Incremental swing detector. Feed bars one at a time with update(); a bar
+    becomes a swing candidate once the following bar is known.
+    """
+
+    def __init__(self, pct: Optional[float] = None, atr_mult: Optional[float] = None):
+        """
+        Args:
+            pct (float, optional): ZigZag percent filter (see find_swings).
+            atr_mult (float, optional): ZigZag ATR-multiple filter.
+        """
+        self._zigzag = _ZigZag(pct, atr_mult)
+        self._filtered = pct is not None or atr_mult is not None
+        self._peaks: List[int] = []
+        self._troughs: List[int] = []
+        self._values: List[float] = []
+        self._prev_atr: Optional[float] = None
+        self.count = 0
+
+    @classmethod
+    def from_series(cls, values, atr=None, **kwargs) -> 'SwingDetector':
+        """Build a detector primed with an existing history."""
+        detector = cls(**kwargs)
+        atr = None if atr is None else np.asarray(atr, dtype=float)
+        for i, value in enumerate(np.asarray(values, dtype=float)):
+            detector.update(value, None if atr is None else atr[i])
+        return detector
+
+    def update(self, value: float, atr: Optional[float] = None) -> Optional[str]:
+        """
+        Add a new bar.
+
+        Args:
+            value (float): The new price.
+            atr (float, optional): ATR at this bar, for the ATR filter.
+
+        Returns:
+            str or None: 'peak' or 'trough' if the previous bar just became a
+            swing candidate, else None.
+        """
+        self._values.append(float(value))
+        if len(self._values) > 3:
+            self._values.pop(0)
+        self.count += 1
+        found = None
+        if len(self._values) == 3:
+            left, mid, right = self._values
+            index = self.count - 2
+            if mid > left and mid > right:
+                found = 'peak'
+            elif mid < left and mid < right:
+                found = 'trough'
+            if found:
+                (self._peaks if found == 'peak' else self._troughs).append(index)
+                self._zigzag.feed(index, mid, found == 'peak', self._prev_atr)
+        self._prev_atr = atr
+        return found
+
+    @property
+    def swings(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(peak_indices, trough_indices) seen so far, as in find_swings()."""
+        if self._filtered:
+            return self._zigzag.result()
+        return (np.asarray(self._peaks, dtype=int),
+                np.asarray(self._troughs, dtype=int))
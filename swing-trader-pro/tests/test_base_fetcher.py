@@ -0,0 +1,129 @@
+# tests/test_base_fetcher.py
+"""
+Conditional GETs of BaseFetcher and the per-trading-date payload memo of
+InstitutionalScreener against a local server with an ETag.
+"""
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('tenacity')
+pytest.importorskip('requests_cache')
+
+import tenacity  # noqa: E402
+
+from data_providers import base_fetcher  # noqa: E402
+from data_providers.base_fetcher import BaseFetcher  # noqa: E402
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serves server.payload with an ETag; answers 304 to a matching If-None-Match."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get('If-None-Match'))
+        if server.failures:
+            server.failures -= 1
+            self.send_error(503)
+            return
+        etag = f'"v{server.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        body = json.dumps(server.payload).encode()
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    server.requests, server.failures, server.version = [], 0, 1
+    server.payload = {'INFY': {'net_3day': 5e7}}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/fii"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(BaseFetcher._fetch_conditional.retry, 'wait', tenacity.wait_none())
+    monkeypatch.setattr(BaseFetcher, '_validators', base_fetcher.OrderedDict())
+
+
+def test_unchanged_resource_costs_a_304(server):
+    fetcher = BaseFetcher()
+
+    body, modified = fetcher.fetch_conditional(server.url)
+    assert modified and json.loads(body) == server.payload
+    again, modified = fetcher.fetch_conditional(server.url)
+    assert not modified and again == body
+
+    server.version, server.payload = 2, {'TCS': {'net_3day': 1e7}}
+    body, modified = fetcher.fetch_conditional(server.url)
+    assert modified and json.loads(body) == server.payload
+    assert server.requests == [None, '"v1"', '"v1"']
+
+
+def test_transient_errors_are_retried(server):
+    server.failures = 2
+    body, modified = BaseFetcher().fetch_conditional(server.url)
+    assert modified and json.loads(body) == server.payload
+    assert len(server.requests) == 3
+
+
+def test_fallback_after_the_last_retry(server, monkeypatch):
+    server.failures = 10
+    fetcher = BaseFetcher()
+    with pytest.raises(tenacity.RetryError):
+        fetcher.fetch_conditional(server.url)
+    assert len(server.requests) == 3
+
+    fallback = type('Fallback', (), {'content': b'{"SBIN": {}}'})()
+    monkeypatch.setattr(fetcher, '_load_fallback_data', lambda cache_key: fallback)
+    assert fetcher.fetch_conditional(server.url) == (b'{"SBIN": {}}', True)
+
+
+def test_validators_are_bounded(server, monkeypatch):
+    monkeypatch.setattr(BaseFetcher, 'MAX_VALIDATORS', 2)
+    fetcher = BaseFetcher()
+    for i in range(4):
+        fetcher.fetch_conditional(f"{server.url}?page={i}")
+    assert list(BaseFetcher._validators) == [f"{server.url}?page=2", f"{server.url}?page=3"]
+
+
+def test_screener_memoizes_per_trading_date(server, monkeypatch):
+    from phases.morning_screening import institutional_flow
+
+    day = [date(2026, 10, 16)]
+    monkeypatch.setattr(institutional_flow, 'trading_date', lambda: day[0])
+    screener = institutional_flow.InstitutionalScreener(
+        api_endpoint=server.url, fetcher=BaseFetcher(), revalidate_seconds=3600)
+
+    first = screener.fetch_institutional_data()
+    assert screener.fetch_institutional_data() is first
+    assert len(server.requests) == 1  # within revalidate_seconds: no request
+
+    screener.revalidate_seconds = 0
+    assert screener.fetch_institutional_data() is first  # 304: not re-parsed
+    assert server.requests[-1] == '"v1"'
+
+    day[0] = date(2026, 10, 19)
+    server.version, server.payload = 2, {'TCS': {'net_3day': 1e7}}
+    assert screener.fetch_institutional_data() == server.payload
+    assert list(screener._payloads) == [day[0]]
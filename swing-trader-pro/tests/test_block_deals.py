@@ -0,0 +1,101 @@
+# tests/test_block_deals.py
+"""Parsing of the NSE block-deal payload and the deduplicated deal store."""
+import pandas as pd
+import pytest
+
+pytest.importorskip('tenacity')
+pytest.importorskip('requests_cache')
+
+from data.block_deal_store import BlockDealStore  # noqa: E402
+from data_providers import block_deal_fetcher  # noqa: E402
+from data_providers.block_deal_fetcher import BlockDealFetcher  # noqa: E402
+
+PAYLOAD = {'data': [
+    {'symbol': 'INFY', 'tradeDate': '02-Jan-2026', 'clientName': 'Goldman Sachs (Singapore) Pte',
+     'buySell': 'buy', 'quantity': '150000', 'price': '1510.5'},
+    {'symbol': 'INFY', 'tradeDate': '05-Jan-2026', 'clientName': 'HDFC Mutual Fund',
+     'buySell': 'SELL', 'quantity': 80000, 'price': 1498.0},
+    {'symbol': 'TCS', 'tradeDate': '05-Jan-2026', 'clientName': 'Promoter Group',
+     'buySell': 'BUY', 'quantity': 1000, 'price': 'n/a'},
+    {'symbol': 'TCS', 'tradeDate': 'not a date', 'clientName': 'Nomura',
+     'buySell': 'BUY', 'quantity': 10, 'price': 1.0},
+    {'tradeDate': '05-Jan-2026', 'clientName': 'Nomura', 'buySell': 'BUY',
+     'quantity': 10, 'price': 1.0},
+]}
+
+
+@pytest.fixture
+def fetcher():
+    return BlockDealFetcher(store=BlockDealStore(':memory:'))
+
+
+def test_parse_deals(fetcher):
+    deals = fetcher.parse_deals(PAYLOAD)
+
+    assert deals['symbol'].tolist() == ['INFY', 'INFY', 'TCS']
+    assert deals['date'].tolist() == [pd.Timestamp('2026-01-02'), pd.Timestamp('2026-01-05'),
+                                      pd.Timestamp('2026-01-05')]
+    assert deals['client_type'].tolist() == ['FII', 'DII', 'PROMOTER']
+    assert deals['is_fii'].tolist() == [True, False, False]
+    assert deals['side'].tolist() == ['BUY', 'SELL', 'BUY']
+    assert deals['qty'].tolist() == [150000, 80000, 1000]
+    assert deals.loc[:1, 'price'].tolist() == [1510.5, 1498.0]
+    assert pd.isna(deals.loc[2, 'price'])
+    # A bare list and an empty payload parse too
+    assert len(fetcher.parse_deals(PAYLOAD['data'])) == 3
+    assert fetcher.parse_deals({'data': []}).empty
+
+
+def test_store_skips_duplicates(fetcher):
+    deals = fetcher.parse_deals(PAYLOAD)
+    fetcher._store_deals(deals)  # the unpriced TCS deal is not stored
+    fetcher._store_deals(deals)
+
+    stored = fetcher.get_deals()
+    assert len(stored) == 2
+    assert fetcher.store.add(deals.dropna(subset=['price'])) == 0
+    overlapping = fetcher.parse_deals({'data': PAYLOAD['data'][1:2] + [
+        {'symbol': 'INFY', 'tradeDate': '06-Jan-2026', 'clientName': 'Nomura',
+         'buySell': 'BUY', 'quantity': 5000, 'price': 1505.0}]})
+    assert fetcher.store.add(overlapping) == 1
+
+
+def test_range_queries(fetcher):
+    store = fetcher.store
+    store.add(pd.DataFrame({
+        'symbol': ['INFY', 'INFY', 'INFY', 'TCS'],
+        'date': pd.to_datetime(['2026-01-02', '2026-01-05', '2026-01-09', '2026-01-05']),
+        'clientName': ['Nomura', 'HDFC Mutual Fund', 'Nomura', 'Nomura'],
+        'client_type': ['FII', 'DII', 'FII', 'FII'],
+        'side': ['BUY', 'SELL', 'SELL', 'BUY'],
+        'qty': [1.0, 2.0, 3.0, 4.0],
+        'price': [10.0, 20.0, 30.0, 40.0],
+        'is_fii': [True, False, True, True],
+    }))
+
+    inside = fetcher.get_deals('INFY', start='2026-01-05', end='2026-01-09')
+    assert inside['qty'].tolist() == [2.0, 3.0]
+    assert fetcher.get_deals('INFY', end='2026-01-04')['qty'].tolist() == [1.0]
+    assert fetcher.get_deals(start='2026-01-05', end='2026-01-05')['symbol'].tolist() == \
+        ['INFY', 'TCS']
+    assert fetcher.get_deals('INFY', fii_only=True)['qty'].tolist() == [1.0, 3.0]
+    assert fetcher.get_deals(client_type='DII')['clientName'].tolist() == ['HDFC Mutual Fund']
+    assert fetcher.get_deals('WIPRO').empty
+    assert [d['qty'] for d in store.iter_by_date('2026-01-03')] == [2.0, 4.0, 3.0]
+
+
+def test_store_is_opened_on_first_use(monkeypatch):
+    opened = []
+
+    def open_store():
+        opened.append(True)
+        return BlockDealStore(':memory:')
+
+    monkeypatch.setattr(block_deal_fetcher, 'BlockDealStore', open_store)
+    fetcher = BlockDealFetcher()
+    assert opened == []
+
+    assert fetcher.get_deals().empty
+    fetcher._store_deals(fetcher.parse_deals(PAYLOAD))
+    assert opened == [True]
+    assert len(fetcher.get_deals()) == 2
@@ -0,0 +1,60 @@
+# tests/test_client_classifier.py
+import pandas as pd
+import pytest
+
+from core.client_classifier import OTHER, ClientClassifier
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return ClientClassifier()
+
+
+@pytest.mark.parametrize('name,category', [
+    ('Goldman Sachs (Singapore) Pte Ltd', 'FII'),
+    ('Copthall Mauritius Investment Limited', 'FII'),
+    ('Societe Generale - ODI', 'FII'),
+    ('HDFC Mutual Fund', 'DII'),
+    ('Life Insurance Corporation of India', 'DII'),
+    ('Promoter Group', 'PROMOTER'),
+    # Generic fragments no longer make a name foreign
+    ('Xyz Holdings Mauritius Pte Ltd', OTHER),
+    ('Abc Emerging Markets Opportunities Fund', OTHER),
+    ('Pqr Trading Pte Ltd', OTHER),
+    # Aliases match whole words only
+    ('Lichfield Traders', OTHER),
+    ('Fund Managers Llp', OTHER),
+])
+def test_classify_name(classifier, name, category):
+    assert classifier.classify_name(name) == category
+
+
+def test_longest_alias_wins_across_categories(classifier):
+    # "Pension Fund" is DII, "Government Pension Fund Global" is FII
+    assert classifier.classify_name('Government Pension Fund Global') == 'FII'
+    assert classifier.classify_name('Maharashtra Pension Fund') == 'DII'
+    # "Life Insurance" is DII, "Nippon Life India" is a longer DII alias
+    assert classifier.classify_name('Nippon Life India Trustee Ltd') == 'DII'
+
+
+def test_category_order_breaks_ties():
+    aliases = {'DII': ['Capital'], 'FII': ['Capital', 'Capital Partners']}
+    assert ClientClassifier(aliases).classify_name('Xyz Capital') == 'DII'
+    assert ClientClassifier(aliases).classify_name('Xyz Capital Partners') == 'FII'
+    reordered = {'FII': aliases['FII'], 'DII': aliases['DII']}
+    assert ClientClassifier(reordered).classify_name('Xyz Capital') == 'FII'
+
+
+def test_category_label_matches_itself():
+    classifier = ClientClassifier({'FII': ['Nomura'], 'DII': ['UTI']})
+    assert classifier.classify_name('Abc FII Fund') == 'FII'
+    assert classifier.classify_name('Abc dii Fund') == 'DII'
+
+
+def test_classify_column_keeps_index_and_handles_missing(classifier):
+    names = pd.Series(['HDFC Mutual Fund', None, 'Nomura Singapore Ltd',
+                       'HDFC Mutual Fund', 'Retail Investor'], index=list('abcde'))
+    result = classifier.classify(names)
+    assert result.index.tolist() == list('abcde')
+    assert result.tolist() == ['DII', OTHER, 'FII', 'DII', OTHER]
+    assert classifier.classify(['Promoter']).tolist() == ['PROMOTER']
@@ -0,0 +1,63 @@
+# tests/test_fii_dii_store.py
+import os
+from datetime import date
+
+import numpy as np
+
+from data.fii_dii_store import COLUMNS, FiiDiiStore
+
+
+def rows(days):
+    return [(date(2024, 1, d), float(d), -float(d)) for d in days]
+
+
+def test_append_and_backfill_keep_date_order(tmp_path):
+    store = FiiDiiStore(str(tmp_path))
+    assert store.update(rows([10, 11, 12])) == 3
+    assert store.update(rows([12, 13])) == 1          # appended, 12 deduplicated
+    assert store.update(rows([2, 3, 11])) == 2        # backfill rewrite
+
+    columns = store.columns()
+    assert [d.day for d in columns['date'].astype(date)] == [2, 3, 10, 11, 12, 13]
+    np.testing.assert_array_equal(columns['fii_net'], [2, 3, 10, 11, 12, 13])
+    np.testing.assert_array_equal(columns['dii_net'], -columns['fii_net'])
+
+    window = store.range(date(2024, 1, 3), date(2024, 1, 11))
+    np.testing.assert_array_equal(window['fii_net'], [3, 10, 11])
+    assert list(store.tail(2)['fii_net']) == [13, 12]
+
+
+def test_rewrite_interrupted_after_commit_is_completed(tmp_path):
+    store = FiiDiiStore(str(tmp_path))
+    store.update(rows([10, 11]))
+    # Simulate a crash after the commit marker, with only 'date' renamed
+    new = {'date': np.array(['2024-01-05', '2024-01-10', '2024-01-11'], dtype=COLUMNS['date']),
+           'fii_net': np.array([5.0, 10.0, 11.0]), 'dii_net': np.array([-5.0, -10.0, -11.0])}
+    for column in COLUMNS:
+        with open(store._path('cash', column) + '.tmp', 'wb') as f:
+            f.write(new[column].tobytes())
+    open(store._marker('cash'), 'wb').close()
+    os.replace(store._path('cash', 'date') + '.tmp', store._path('cash', 'date'))
+
+    reopened = FiiDiiStore(str(tmp_path))
+    columns = reopened.columns()
+    np.testing.assert_array_equal(columns['fii_net'], [5, 10, 11])
+    np.testing.assert_array_equal(columns['date'], new['date'])
+    assert not os.path.exists(store._marker('cash'))
+
+    # Appending afterwards keeps every column
+    assert reopened.update(rows([12])) == 1
+    np.testing.assert_array_equal(reopened.columns()['fii_net'], [5, 10, 11, 12])
+
+
+def test_uncommitted_rewrite_is_ignored(tmp_path):
+    store = FiiDiiStore(str(tmp_path))
+    store.update(rows([10, 11]))
+    # Crash while writing the .tmp files: no marker, old columns untouched
+    with open(store._path('cash', 'date') + '.tmp', 'wb') as f:
+        f.write(np.array(['2024-01-01'], dtype=COLUMNS['date']).tobytes())
+
+    columns = FiiDiiStore(str(tmp_path)).columns()
+    np.testing.assert_array_equal(columns['fii_net'], [10, 11])
+    assert store.update(rows([1])) == 1
+    np.testing.assert_array_equal(store.columns()['fii_net'], [1, 10, 11])
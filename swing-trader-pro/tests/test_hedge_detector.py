@@ -0,0 +1,21 @@
+# tests/test_hedge_detector.py
+from data.oi_chain_store import OIChainStore
+from strategies.institutional.hedge_detector import HEDGE_FLAGS, HedgeDetector
+
+
+def test_detect_hedges_many_matches_per_symbol():
+    detector = HedgeDetector(OIChainStore(None), sector_flows={'BANKING': -6e7, 'IT': 1e7})
+    symbols = ['HDFCBANK', 'INFY', 'RELIANCE', 'UNLISTED']
+    fii_data = {'net_cash': -1e7, 'net_fno': 5e7}
+    oi_data = {'nifty_oi_pct_change': 0.2}
+
+    flags = detector.detect_hedges_many(symbols, fii_data, oi_data)
+
+    assert list(flags.columns) == HEDGE_FLAGS
+    assert list(flags.index) == symbols
+    assert (flags.dtypes == bool).all()
+    assert flags.loc['HDFCBANK', 'sector_hedge']
+    assert not flags.loc['INFY', 'sector_hedge']
+    assert flags['index_hedge'].all()
+    for symbol in symbols:
+        assert detector.detect_hedges(symbol, fii_data, oi_data) == flags.loc[symbol].to_dict()
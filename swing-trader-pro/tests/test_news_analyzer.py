@@ -0,0 +1,159 @@
+# tests/test_news_analyzer.py
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('textblob')
+
+from config.news_config import (  # noqa: E402
+    NEWS_FETCH_CONFIG, SENTIMENT_CACHE_CONFIG, SENTIMENT_TIMELINE_CONFIG)
+from core.metrics import REGISTRY as METRICS  # noqa: E402
+from core.sentiment_backends import SentimentBackend  # noqa: E402
+from core.sentiment_store import SentimentTimeline  # noqa: E402
+from phases.morning_screening.news_analyzer import NewsAnalyzer  # noqa: E402
+
+
+class WordBackend(SentimentBackend):
+    """+1 for "rally", -1 for "slump", 0 otherwise."""
+
+    name = "word"
+
+    def score_many(self, texts):
+        return [1.0 if 'rally' in t else -1.0 if 'slump' in t else 0.0 for t in texts]
+
+
+class FakeNewsAnalyzer(NewsAnalyzer):
+    """Per-symbol sources answer from `headlines`, optionally after a delay."""
+
+    def __init__(self, sources, tmp_path, delays=None):
+        path = tmp_path / 'news_sources.json'
+        path.write_text(json.dumps(sources))
+        super().__init__(str(path), backend=WordBackend())
+        self.timeline = SentimentTimeline(str(tmp_path / 'timeline'))
+        self.delays = delays or {}
+        self.headlines = {}
+        self.fetched = []
+        self.in_flight = {source: 0 for source in sources}
+        self.peak = {source: 0 for source in sources}
+        self._lock = threading.Lock()
+
+    def _fetch_news(self, source, symbol):
+        with self._lock:
+            self.fetched.append((source, symbol))
+            self.in_flight[source] += 1
+            self.peak[source] = max(self.peak[source], self.in_flight[source])
+        try:
+            time.sleep(self.delays.get(source, 0.0))
+            return [{'title': title} for title in self.headlines.get(symbol, [])]
+        finally:
+            with self._lock:
+                self.in_flight[source] -= 1
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    # Keep the shared cache/timeline (and their files) out of the tests
+    monkeypatch.setitem(SENTIMENT_CACHE_CONFIG, 'enabled', False)
+    monkeypatch.setitem(SENTIMENT_TIMELINE_CONFIG, 'enabled', False)
+    monkeypatch.setitem(SENTIMENT_TIMELINE_CONFIG, 'refresh_minutes', 60)
+
+
+def test_analyze_many_answers_fresh_symbols_from_the_timeline(tmp_path):
+    analyzer = FakeNewsAnalyzer({'wire': {}}, tmp_path)
+    analyzer.headlines = {'TCS': ['TCS shares rally'], 'INFY': ['INFY shares slump']}
+    analyzer.timeline.append('INFY', 0.5)
+
+    scores = analyzer.analyze_many(['TCS', 'INFY', 'TCS'])
+
+    assert list(scores) == ['TCS', 'INFY']
+    assert analyzer.fetched == [('wire', 'TCS')]
+    assert scores['INFY'] == pytest.approx(0.5)
+    assert scores['TCS'] == pytest.approx(1.0)
+    assert len(analyzer.timeline.history('INFY')) == 1
+    # Once the last observation is older than refresh_minutes, fetch again
+    SENTIMENT_TIMELINE_CONFIG['refresh_minutes'] = 0
+    analyzer.analyze_many(['INFY'])
+    assert ('wire', 'INFY') in analyzer.fetched
+
+
+def test_analyze_bulk_skips_feeds_when_every_symbol_is_fresh(tmp_path, monkeypatch):
+    analyzer = FakeNewsAnalyzer({'feed': {'url': 'https://example.invalid/rss'},
+                                 'wire': {}}, tmp_path)
+    feeds = []
+    monkeypatch.setattr(analyzer, '_feed_articles', lambda source: feeds.append(source) or [
+        {'title': 'INFY shares rally'}, {'title': 'TCS shares slump'}])
+    analyzer.timeline.append('INFY', 0.25)
+    analyzer.timeline.append('TCS', -0.25)
+
+    assert analyzer.analyze_bulk(['INFY', 'TCS']) == pytest.approx({'INFY': 0.25, 'TCS': -0.25})
+    assert feeds == [] and analyzer.fetched == []
+
+    # Only the stale symbol is fetched and recorded
+    analyzer.timeline = SentimentTimeline(str(tmp_path / 'other'))
+    analyzer.timeline.append('INFY', 0.25)
+    scores = analyzer.analyze_bulk(['INFY', 'TCS'])
+    assert feeds == ['feed']
+    assert analyzer.fetched == [('wire', 'TCS')]
+    assert scores['INFY'] == pytest.approx(0.25)
+    assert len(analyzer.timeline.history('INFY')) == 1
+    assert len(analyzer.timeline.history('TCS')) == 1
+
+
+def test_fan_out_deadline_drops_slow_sources(tmp_path):
+    analyzer = FakeNewsAnalyzer({'fast': {}, 'slow': {'weight': 3.0}}, tmp_path,
+                                delays={'slow': 2.0})
+    analyzer.timeline = None
+    analyzer.headlines = {'INFY': ['INFY shares rally']}
+    failures = METRICS.counter_value('swing_fetch_failures_total', source='slow')
+
+    start = time.monotonic()
+    scores = analyzer.analyze_many(['INFY', 'TCS'], deadline_seconds=0.3)
+
+    assert time.monotonic() - start < 1.5
+    # Scored from the source that answered, ignoring the slow one's weight
+    assert scores == {'INFY': pytest.approx(1.0), 'TCS': 0.0}
+    if METRICS.enabled:
+        assert METRICS.counter_value('swing_fetch_failures_total', source='slow') == \
+            failures + 2
+
+
+def test_fan_out_respects_per_source_concurrency(tmp_path, monkeypatch):
+    monkeypatch.setitem(NEWS_FETCH_CONFIG, 'default_max_concurrency', 4)
+    analyzer = FakeNewsAnalyzer({'narrow': {'max_concurrency': 2}, 'wide': {}}, tmp_path,
+                                delays={'narrow': 0.05, 'wide': 0.05})
+    analyzer.timeline = None
+    symbols = [f'SYM{i}' for i in range(12)]
+
+    scores = analyzer.analyze_many(symbols, deadline_seconds=30)
+
+    assert set(scores) == set(symbols)
+    assert len(analyzer.fetched) == 2 * len(symbols)
+    assert analyzer.peak['narrow'] == 2
+    assert 2 < analyzer.peak['wide'] <= 4
+
+
+def test_analyze_bulk_assigns_feed_articles_to_the_right_symbols(tmp_path, monkeypatch):
+    analyzer = FakeNewsAnalyzer({'feed': {'url': 'https://example.invalid/rss', 'weight': 2.0},
+                                 'wire': {}}, tmp_path)
+    analyzer.timeline = None
+    analyzer.headlines = {'TCS': ['TCS wins large deal']}
+    articles = [
+        {'title': 'SBI Life shares slump after results'},
+        {'title': 'State Bank of India shares rally', 'summary': 'SBI raises deposit rates'},
+        {'title': 'Tata Consultancy Services shares rally'},
+        {'title': 'Broader market slump'},
+    ]
+    feeds = []
+    monkeypatch.setattr(analyzer, '_feed_articles',
+                        lambda source: feeds.append(source) or articles)
+
+    scores = analyzer.analyze_bulk(['SBIN', 'TCS', 'INFY'])
+
+    assert feeds == ['feed']
+    assert sorted(analyzer.fetched) == [('wire', 'INFY'), ('wire', 'SBIN'), ('wire', 'TCS')]
+    # feed (weight 2) and wire (weight 1); the SBI Life slump is not SBIN's
+    assert scores['SBIN'] == pytest.approx((2 * 1.0 + 0.0) / 3)
+    assert scores['TCS'] == pytest.approx((2 * 1.0 + 0.0) / 3)
+    assert scores['INFY'] == pytest.approx(0.0)
@@ -0,0 +1,134 @@
+# tests/test_nsdl_fetcher.py
+"""
+NSDLFetcher backfill/refresh against a local fixture server standing in for
+the NSDL archive pages.
+"""
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+pytest.importorskip('tenacity')
+pytest.importorskip('requests_cache')
+pytest.importorskip('bs4')
+
+import tenacity  # noqa: E402
+
+from data_providers.nsdl_fetcher import NSDLFetcher  # noqa: E402
+
+
+def amounts(day):
+    return float(day.toordinal() % 1000), -float(day.toordinal() % 700)
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    """Serves one <table> of weekday rows, newest first, for ?from=&to=."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        if any(fragment in self.path for fragment in server.failing):
+            self.send_error(500)
+            return
+        query = parse_qs(urlparse(self.path).query)
+        start = datetime.strptime(query['from'][0], '%d-%m-%Y').date()
+        end = datetime.strptime(query['to'][0], '%d-%m-%Y').date()
+        cells = ['<tr><th>Date</th><th>FII Net</th><th>DII Net</th></tr>']
+        day = end
+        while day >= start:
+            if day.weekday() < 5:
+                fii, dii = amounts(day)
+                cells.append(f"<tr><td>{day:%d-%b-%Y}</td><td>{fii:,.2f}</td>"
+                             f"<td>{dii:,.2f}</td></tr>")
+            day -= timedelta(days=1)
+        body = f"<html><body><table>{''.join(cells)}</table></body></html>".encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def archive():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ArchiveHandler)
+    server.requests, server.failing = [], set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher(archive, tmp_path, monkeypatch):
+    monkeypatch.setattr(NSDLFetcher._open_stream.retry, 'wait', tenacity.wait_none())
+    monkeypatch.setattr(NSDLFetcher._open_stream.retry, 'stop', tenacity.stop_after_attempt(1))
+    config = {
+        'store_path': str(tmp_path / 'nsdl'),
+        'archive_urls': {
+            'cash': '{base}/fii_dii_archive.php?from={start}&to={end}',
+            'derivatives': '{base}/fii_fno_archive.php?from={start}&to={end}',
+        },
+        'archive_base': f"http://127.0.0.1:{archive.server_address[1]}",
+        'page_days': 10,
+        'page_interval_seconds': 0,
+    }
+    return NSDLFetcher(config=config, chunk_size=64)
+
+
+def weekdays(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)
+            if (start + timedelta(days=i)).weekday() < 5]
+
+
+def test_backfill_loads_every_page(fetcher):
+    start, end = date(2024, 1, 1), date(2024, 2, 29)
+    added = fetcher.backfill(start, end)
+
+    expected = weekdays(start, end)
+    assert added == {'cash': len(expected), 'derivatives': len(expected)}
+    history = fetcher.get_fii_dii_range(start, end)
+    assert list(history['date'].astype(date)) == expected
+    np.testing.assert_array_equal(history['fii_net'], [amounts(d)[0] for d in expected])
+    np.testing.assert_array_equal(history['dii_net'], [amounts(d)[1] for d in expected])
+
+
+def test_backfill_stops_segment_on_error_and_resumes(fetcher, archive):
+    start, end = date(2024, 1, 1), date(2024, 2, 29)
+    # Pages go newest first; fail the third cash page
+    archive.failing.add('fii_dii_archive.php?from=31-01-2024')
+    added = fetcher.backfill(start, end)
+
+    loaded = fetcher.get_fii_dii_range(segment='cash')['date'].astype(date)
+    assert added['cash'] == len(loaded) > 0
+    assert loaded[0] > date(2024, 1, 31)              # contiguous up to the failure
+    assert added['derivatives'] == len(weekdays(start, end))
+
+    archive.failing.clear()
+    archive.requests.clear()
+    added = fetcher.backfill(start, end, segments=['cash'])
+    assert list(fetcher.get_fii_dii_range(segment='cash')['date'].astype(date)) == weekdays(start, end)
+    assert added['cash'] == len(weekdays(start, loaded[0] - timedelta(days=1)))
+    # Pages already covered by the store are not requested again
+    assert not any('to=29-02-2024' in path for path in archive.requests)
+
+
+def test_refresh_stops_at_stored_history(fetcher, archive, monkeypatch):
+    fetcher.BASE_URL = fetcher.config['archive_urls']['cash'].format(
+        base=fetcher.config['archive_base'], start='01-02-2024', end='29-02-2024')
+    monkeypatch.setattr('data_providers.nsdl_fetcher.trading_date', lambda: date(2024, 2, 29))
+    fetcher.backfill(date(2024, 2, 1), date(2024, 2, 20), segments=['cash'])
+
+    added = fetcher.refresh(days=3)
+    assert added == len(weekdays(date(2024, 2, 21), date(2024, 2, 29)))
+    assert fetcher.store.latest() == date(2024, 2, 29)
+    recent = fetcher.get_fii_dii_activity(days=3)
+    assert list(recent['fii_net']) == [amounts(d)[0] for d in
+                                       reversed(weekdays(date(2024, 2, 27), date(2024, 2, 29)))]
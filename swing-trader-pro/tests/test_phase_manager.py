@@ -0,0 +1,213 @@
+# tests/test_phase_manager.py
+import sys
+import types
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('schedule')
+pytest.importorskip('tenacity')
+pytest.importorskip('requests_cache')
+pytest.importorskip('bs4')
+
+from config.strategy_config import STRATEGY_CONFIG
+from data.fii_dii_store import FiiDiiStore
+from data.oi_chain_store import OIChainStore
+
+
+class Placeholder:
+    """Stands in for the phase facades and broker adapter PhaseManager builds."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class FakeBroker:
+    def __init__(self):
+        self.orders = []
+
+    def place_gtt_order(self, **order):
+        self.orders.append(order)
+
+
+class FakePipeline:
+    """DataPipeline stand-in returning fixed institutional data."""
+
+    def __init__(self, store, closes, fii_net):
+        self.nsdl = types.SimpleNamespace(store=store, get_sector_flows=lambda: {})
+        self.nse = types.SimpleNamespace(get_option_chain=self.get_option_chain)
+        self.closes = closes
+        self.fii_net = fii_net
+        self.end = pd.Timestamp(date.today())
+        self.calls = []
+        self.events = []
+
+    def get_option_chain(self, underlying):
+        self.events.append(('chain', underlying))
+
+    def get_institutional_data(self, symbol, sources=None):
+        self.calls.append(symbol)
+        self.events.append(('data', symbol))
+        self.sources = sources
+        closes = self.closes[symbol] if isinstance(self.closes, dict) else self.closes
+        days = pd.bdate_range(end=self.end, periods=len(closes))
+        data = {
+            'ohlc': pd.DataFrame({'Close': closes,
+                                  'Volume': np.full(len(closes), 1e5)}, index=days),
+            'fii_flows': pd.DataFrame({'date': days[::-1][:3],
+                                       'fii_net': self.fii_net, 'dii_net': 100.0}),
+            'block_deals': [],
+            'derivatives_oi': None,
+            'sector_flows': {},
+        }
+        return {source: data[source] for source in sources or data}
+
+
+@pytest.fixture
+def phase_manager_module(monkeypatch):
+    phases = pytest.importorskip('phases')
+    for name in ('MorningScreening', 'DynamicMonitor', 'ReportingEngine'):
+        monkeypatch.setattr(phases, name, Placeholder, raising=False)
+    monkeypatch.setitem(sys.modules, 'brokers.broker_adapter',
+                        types.SimpleNamespace(BrokerAdapter=Placeholder))
+    monkeypatch.delitem(sys.modules, 'core.phase_manager', raising=False)
+    monkeypatch.setitem(STRATEGY_CONFIG, 'enabled', ['institutional'])
+    monkeypatch.setitem(STRATEGY_CONFIG, 'min_score', 3.0)
+    monkeypatch.setitem(STRATEGY_CONFIG, 'capital', 1e6)
+    import core.phase_manager as module
+    yield module
+    sys.modules.pop('core.phase_manager', None)
+
+
+@pytest.fixture
+def nsdl_store(tmp_path):
+    store = FiiDiiStore(str(tmp_path))
+    store.update([(date.today() - timedelta(days=1), -800.0, 300.0)], 'derivatives')
+    return store
+
+
+def run_signals(module, pipeline, symbols=('INFY',)):
+    broker = FakeBroker()
+    manager = module.PhaseManager({'broker_name': 'fake'}, pipeline=pipeline,
+                                  oi_store=OIChainStore(None))
+    manager.get_broker_adapter = lambda: broker
+    manager.active_symbols = list(symbols)
+    manager.generate_signals()
+    return manager, broker
+
+
+def test_institutional_order_reaches_the_broker(phase_manager_module, nsdl_store):
+    closes = np.linspace(1400.0, 1500.0, 60)
+    pipeline = FakePipeline(nsdl_store, closes, fii_net=[2000.0, 1500.0, 1000.0])
+
+    manager, broker = run_signals(phase_manager_module, pipeline)
+
+    assert pipeline.calls == ['INFY']
+    [order] = broker.orders
+    assert order['symbol'] == 'INFY'
+    assert order['entry'] == pytest.approx(1500.0)
+    assert order['sl'] == pytest.approx(1350.0)
+    assert order['quantity'] == int(1e6 * STRATEGY_CONFIG['risk_per_trade'] / 150.0)
+
+
+def test_fii_flows_reach_strategies_in_rupees(phase_manager_module, nsdl_store):
+    pipeline = FakePipeline(nsdl_store, np.full(60, 100.0), fii_net=[1.0, 1.0, 1.0])
+    manager = phase_manager_module.PhaseManager(
+        {'broker_name': 'fake'}, pipeline=pipeline, oi_store=OIChainStore(None))
+
+    flows = manager._symbol_data('INFY')['fii_flows']
+
+    assert flows['net_3day'] == pytest.approx(3e7)
+    assert flows['net_cash'] == pytest.approx(1e7)
+    assert flows['net_fno'] == pytest.approx(-800 * 1e7)
+    # Rs 3 crore over three sessions is below the large-cap minimum of 4 crore
+    _, broker = run_signals(phase_manager_module, pipeline)
+    assert broker.orders == []
+
+
+def test_option_chains_are_fetched_per_symbol_not_up_front(phase_manager_module, nsdl_store):
+    pipeline = FakePipeline(nsdl_store, np.full(60, 100.0), fii_net=[1.0, 1.0, 1.0])
+
+    manager, _ = run_signals(phase_manager_module, pipeline, symbols=['INFY', 'TCS'])
+
+    assert pipeline.events == [('chain', 'NIFTY'),
+                               ('chain', 'INFY'), ('data', 'INFY'),
+                               ('chain', 'TCS'), ('data', 'TCS')]
+    # The poller does not fetch chains again within its interval
+    manager.refresh_option_chains()
+    assert len(pipeline.events) == 5
+
+
+def test_sector_flows_reach_the_hedge_check(phase_manager_module, nsdl_store, tmp_path):
+    from data_providers.nsdl_fetcher import NSDLFetcher
+
+    sector_flows = NSDLFetcher(store=FiiDiiStore(str(tmp_path / 'nsdl'))).get_sector_flows()
+    closes = np.linspace(1400.0, 1500.0, 60)
+    pipeline = FakePipeline(nsdl_store, closes, fii_net=[2000.0, 1500.0, 1000.0])
+    pipeline.nsdl.get_sector_flows = lambda: sector_flows
+
+    manager, broker = run_signals(phase_manager_module, pipeline, symbols=['INFY', 'HDFCBANK'])
+
+    flags = manager.router.hedge_detector.detect_hedges('INFY', {}, {})
+    assert flags['sector_hedge']  # IT outflow of Rs 450 crore is below the threshold
+    assert not manager.router.hedge_detector.detect_hedges('HDFCBANK', {}, {})['sector_hedge']
+    # INFY's hedged flow scores 5 * 0.4, below min_score
+    assert [order['symbol'] for order in broker.orders] == ['HDFCBANK']
+
+
+def test_only_the_enabled_strategies_features_are_fetched(phase_manager_module, nsdl_store,
+                                                          monkeypatch):
+    monkeypatch.setitem(STRATEGY_CONFIG, 'enabled', ['quant'])
+    pipeline = FakePipeline(nsdl_store, np.full(60, 100.0), fii_net=[1.0, 1.0, 1.0])
+    manager = phase_manager_module.PhaseManager(
+        {'broker_name': 'fake'}, pipeline=pipeline, oi_store=OIChainStore(None))
+
+    symbol_data = manager._symbol_data('INFY')
+
+    assert pipeline.sources == ['ohlc']
+    assert sorted(symbol_data) == ['close', 'symbol']
+    assert manager.router.registry.loaded() == []
+
+
+def test_pipeline_is_built_on_first_use(phase_manager_module, monkeypatch):
+    built = []
+    pipeline_module = types.SimpleNamespace(DataPipeline=lambda: built.append(1) or 'pipeline')
+    monkeypatch.setitem(sys.modules, 'core.data_pipeline', pipeline_module)
+
+    manager = phase_manager_module.PhaseManager({'broker_name': 'fake'},
+                                                oi_store=OIChainStore(None))
+    assert built == []
+    assert manager.pipeline == 'pipeline'
+    assert manager.pipeline == 'pipeline'
+    assert built == [1]
+
+
+def test_pair_engine_is_fitted_then_updated_from_pipeline_closes(phase_manager_module,
+                                                                 nsdl_store):
+    rng = np.random.default_rng(3)
+    base = 1000 * np.cumprod(1 + rng.normal(0, 0.01, 80))
+    closes = {'HDFCBANK': base * 1.6,
+              'ICICIBANK': base * (1 + rng.normal(0, 0.001, 80)),
+              'INFY': 1500 * np.cumprod(1 + rng.normal(0, 0.01, 80))}
+    pipeline = FakePipeline(nsdl_store, {s: c[:79] for s, c in closes.items()},
+                            fii_net=[-100.0, -100.0, -100.0])
+
+    manager, _ = run_signals(phase_manager_module, pipeline, symbols=list(closes))
+    engine = manager.pair_engine
+    assert manager.router.hedge_detector.pair_engine is engine
+    assert list(engine.symbols) == sorted(closes)
+    assert engine.is_pair('HDFCBANK', 'ICICIBANK')
+    assert not engine.is_pair('HDFCBANK', 'INFY')
+
+    fit = engine.fit
+    engine.fit = lambda *args: pytest.fail('refit on an unchanged universe')
+    pipeline.closes = closes
+    pipeline.end += pd.offsets.BDay()
+    manager.generate_signals()
+    engine.fit = fit
+
+    prices = pd.DataFrame(closes)[sorted(closes)]
+    expected = prices.pct_change().iloc[1:].tail(engine.window).corr()
+    np.testing.assert_allclose(engine.correlation(), expected, atol=1e-12)
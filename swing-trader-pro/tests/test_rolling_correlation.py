@@ -0,0 +1,49 @@
+# tests/test_rolling_correlation.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.rolling_correlation import RollingCorrelation
+
+
+def price_panel(n_bars=120, n_symbols=12, seed=7):
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.01, (n_bars, 1))
+    returns = factor * rng.uniform(0, 2, n_symbols) + rng.normal(0, 0.01, (n_bars, n_symbols))
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    return pd.DataFrame(prices, index=pd.bdate_range('2026-01-01', periods=n_bars),
+                        columns=[f'S{i}' for i in range(n_symbols)])
+
+
+def window_corr(prices, end, window):
+    return prices.iloc[:end].pct_change().iloc[1:].tail(window).corr()
+
+
+@pytest.mark.parametrize('resync_every', [None, 7])
+def test_matches_pandas_corr_on_the_window(resync_every):
+    prices = price_panel()
+    window = 30
+    engine = RollingCorrelation(window=window, block_size=5, resync_every=resync_every)
+    engine.fit(prices.iloc[:40])
+    np.testing.assert_allclose(engine.correlation(), window_corr(prices, 40, window),
+                               atol=1e-12)
+
+    for end in range(41, len(prices) + 1):
+        engine.update(prices.iloc[end - 1])
+        np.testing.assert_allclose(engine.correlation(), window_corr(prices, end, window),
+                                   atol=1e-12)
+
+
+def test_partners_are_the_most_correlated_symbols():
+    prices = price_panel()
+    prices['TWIN'] = prices['S3'] * 1.5
+    engine = RollingCorrelation(window=60, top_k=3, min_corr=0.5).fit(prices)
+
+    corr = window_corr(prices, len(prices), 60)
+    partners = engine.partners('S3')
+    assert partners[0][0] == 'TWIN'
+    expected = corr['S3'].drop('S3').sort_values(ascending=False)
+    expected = expected[expected >= 0.5].head(3)
+    assert [name for name, _ in partners] == list(expected.index)
+    assert engine.is_pair('TWIN', 'S3')
+    assert engine.partners('UNKNOWN') == []
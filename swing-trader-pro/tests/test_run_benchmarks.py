@@ -0,0 +1,23 @@
+# tests/test_run_benchmarks.py
+import pytest
+
+from benchmarks import harness, run_benchmarks
+
+
+def test_fail_on_regression_without_baseline_exits_non_zero(monkeypatch, tmp_path):
+    monkeypatch.setattr(harness, 'run_suite',
+                        lambda **kwargs: pytest.fail('suite ran without a baseline'))
+
+    with pytest.raises(SystemExit) as exc:
+        run_benchmarks.main(['--fail-on-regression',
+                             '--baseline', str(tmp_path / 'missing.json')])
+
+    assert exc.value.code != 0
+
+
+def test_missing_baseline_is_skipped_without_fail_on_regression(monkeypatch, tmp_path):
+    monkeypatch.setattr(harness, 'run_suite', lambda **kwargs: {'results': []})
+    monkeypatch.setattr(harness, 'save_results', lambda report, path: None)
+
+    assert run_benchmarks.main(['--baseline', str(tmp_path / 'missing.json'),
+                                '--output', str(tmp_path / 'out.json')]) == 0
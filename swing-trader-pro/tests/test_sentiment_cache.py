@@ -0,0 +1,56 @@
+# tests/test_sentiment_cache.py
+import pytest
+
+from core import sentiment_cache
+from core.sentiment_cache import SentimentCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(sentiment_cache.time, 'time', lambda: now[0])
+    return now
+
+
+def scorer(value):
+    calls = []
+
+    def score(texts):
+        calls.extend(texts)
+        return [value] * len(texts)
+    score.calls = calls
+    return score
+
+
+def indexed_keys(cache):
+    return {key for bands in cache._bands for bucket in bands.values() for key in bucket}
+
+
+def test_expired_scores_leave_the_indexes(clock):
+    cache = SentimentCache(ttl_seconds=100, max_distance=3)
+    cache.score_many(['Infosys shares rise on strong quarterly results'], scorer(0.5))
+    assert len(cache._entries) == 1 and indexed_keys(cache)
+
+    clock[0] += 101
+    cache.score_many(['Unrelated headline about monsoon rainfall'], scorer(0.1))
+    assert len(cache._entries) == 1
+    assert len(indexed_keys(cache)) == 1
+
+
+def test_near_duplicate_skips_expired_candidate(clock):
+    cache = SentimentCache(ttl_seconds=100, max_distance=8)
+    headline = 'Infosys shares rise on strong quarterly results and upbeat guidance today'
+    cache.score_many([headline], scorer(0.5))
+    clock[0] += 101
+    rescore = scorer(-0.2)
+    assert cache.score_many([headline + ' again'], rescore) == [-0.2]
+    assert rescore.calls == [headline + ' again']
+    # The fresh score is found for the next near-duplicate
+    assert cache.score_many([headline + ' again now'], scorer(0.9)) == [-0.2]
+
+
+def test_memory_only_lru_eviction_prunes_indexes(clock):
+    cache = SentimentCache(max_memory=2, max_distance=3)
+    cache.score_many([f'headline number {i} about market {i * 7}' for i in range(5)], scorer(0.0))
+    assert len(cache._lru) == 2
+    assert set(cache._entries) == set(cache._lru) == indexed_keys(cache)
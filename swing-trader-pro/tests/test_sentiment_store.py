@@ -0,0 +1,34 @@
+# tests/test_sentiment_store.py
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.sentiment_store import SentimentTimeline
+
+
+@pytest.fixture
+def ist(monkeypatch):
+    """Run with the local timezone set to IST, where UTC/local mixups show."""
+    monkeypatch.setenv('TZ', 'Asia/Kolkata')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_asof_datetimeindex_matches_datetime_list(tmp_path, ist):
+    timeline = SentimentTimeline(str(tmp_path))
+    timeline.append('INFY', 0.5, datetime(2024, 1, 2, 10, 0))
+    queries = [datetime(2024, 1, 2, 9, 0), datetime(2024, 1, 2, 11, 0)]
+
+    from_list = timeline.asof('INFY', queries)
+    from_index = timeline.asof('INFY', pd.DatetimeIndex(queries))
+    from_timestamps = timeline.asof('INFY', [pd.Timestamp(t) for t in queries])
+
+    assert np.isnan(from_list[0])
+    assert from_list[1] == pytest.approx(0.5)
+    np.testing.assert_array_equal(from_index, from_list)
+    np.testing.assert_array_equal(from_timestamps, from_list)
@@ -0,0 +1,37 @@
+# tests/test_signal_aggregator.py
+import numpy as np
+import pytest
+
+from core.signal_aggregator import SignalAggregator
+
+
+def signals():
+    return {
+        'institutional': {'INFY': {'score': 8}, 'TCS': {'score': 4}},
+        'wyckoff': {'INFY': {'score': 6}, 'SBIN': {'score': 9}},
+        'quant': {'TCS': {'score': 7}},
+    }
+
+
+def columnar(signals, symbols):
+    return {strategy: np.array([per_symbol[s]['score'] if s in per_symbol else np.nan
+                                for s in symbols])
+            for strategy, per_symbol in signals.items()}
+
+
+def test_columnar_matches_dict_aggregation_after_weight_change():
+    aggregator = SignalAggregator()
+    symbols = ['INFY', 'SBIN', 'TCS']
+    aggregator.aggregate_scores(columnar(signals(), symbols), symbols)
+
+    aggregator.strategy_weights['quant'] = 0.9
+    expected = aggregator.aggregate_signals(signals())
+    composite = aggregator.aggregate_scores(columnar(signals(), symbols), symbols)
+
+    for symbol in symbols:
+        assert composite[symbol] == pytest.approx(expected[symbol]['composite_score'])
+        assert aggregator.aggregate_symbol(
+            {strategy: per_symbol.get(symbol) for strategy, per_symbol in signals().items()}
+        )['composite_score'] == pytest.approx(expected[symbol]['composite_score'])
+    top = aggregator.aggregate_scores(columnar(signals(), symbols), symbols, top_k=2)
+    assert list(top.index) == sorted(expected, key=lambda s: -expected[s]['composite_score'])[:2]
@@ -0,0 +1,75 @@
+# tests/test_signal_stream.py
+import pytest
+
+from core.metrics import REGISTRY as METRICS
+from core.signal_stream import SignalStream, strategy_orders
+
+
+@pytest.fixture
+def metrics():
+    enabled = METRICS.enabled
+    METRICS.enabled = True
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+    METRICS.enabled = enabled
+
+
+def latency_count(registry):
+    for line in registry.render_prometheus().splitlines():
+        if line.startswith('swing_order_latency_seconds_count'):
+            return int(line.split()[-1])
+    return 0
+
+
+def test_failed_orders_are_counted_and_not_timed(metrics):
+    placed = []
+
+    def execute(order):
+        if order['symbol'] == 'TCS':
+            raise RuntimeError("broker rejected the order")
+        placed.append(order['symbol'])
+
+    stats = SignalStream(lambda symbol: {'symbol': symbol} if symbol != 'SBIN' else None,
+                         execute).run(['INFY', 'SBIN', 'TCS', 'WIPRO'])
+
+    assert stats == {'symbols': 4, 'orders': 3, 'executed': 2, 'failed': 1}
+    assert sorted(placed) == ['INFY', 'WIPRO']
+    assert metrics.counter_value('swing_order_failures_total') == 1
+    assert latency_count(metrics) == 2
+
+
+def test_single_worker_executes_in_input_order():
+    placed = []
+    stats = SignalStream(lambda symbol: {'symbol': symbol},
+                         lambda order: placed.append(order['symbol'])).run(
+        f'SYM{i}' for i in range(50))
+
+    assert stats['executed'] == 50
+    assert placed == [f'SYM{i}' for i in range(50)]
+
+
+class FakeRouter:
+    def __init__(self, signals):
+        self.signals = signals
+
+    def stream_signals(self, symbol_data):
+        yield from self.signals[symbol_data['symbol']].items()
+
+
+def test_strategy_orders_streams_router_signals_to_execution():
+    router = FakeRouter({
+        'INFY': {'quant': {'entry': 100, 'sl': 95, 'target': 110, 'score': 7},
+                 'wyckoff': {'entry': 101, 'sl': 97, 'target': 112, 'score': 9}},
+        'TCS': {'quant': {'entry': 50, 'sl': 48, 'target': 55, 'score': 2},
+                'wyckoff': None},
+    })
+    placed = []
+    stats = SignalStream(strategy_orders(router, min_score=4.0), placed.append).run(
+        [{'symbol': 'INFY'}, {'symbol': 'TCS'}])
+
+    assert stats == {'symbols': 2, 'orders': 1, 'executed': 1, 'failed': 0}
+    [order] = placed
+    assert order['symbol'] == 'INFY'
+    assert (order['entry'], order['sl'], order['score']) == (101, 97, 9)
+    assert len(order['signals']) == 2
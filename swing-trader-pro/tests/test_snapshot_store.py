@@ -0,0 +1,64 @@
+# tests/test_snapshot_store.py
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from core import snapshot_store
+from core.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / 'snapshots'))
+
+
+def test_put_and_asof(store):
+    first = datetime(2026, 10, 14, 9, 30)
+    second = datetime(2026, 10, 14, 15, 0)
+    third = datetime(2026, 10, 16, 10, 0)
+    for ts, price in ((first, 100), (second, 101), (third, 102)):
+        store.put('INFY/NS', {'timestamp': ts, 'close': price})
+    store.put('TCS', {'timestamp': second, 'close': 900})
+
+    assert store.asof('INFY/NS', datetime(2026, 10, 14, 9, 29)) is None
+    assert store.asof('INFY/NS', first)['close'] == 100
+    assert store.asof('INFY/NS', datetime(2026, 10, 15, 12, 0))['close'] == 101
+    assert store.asof('INFY/NS', date(2026, 10, 14))['close'] == 101
+    assert store.asof('INFY/NS')['close'] == 102
+    assert store.asof_time('TCS') == second
+    assert [ts for ts, _ in store.history('INFY/NS', end=date(2026, 10, 15))] == [first, second]
+
+    # A fresh instance reads the same partitions from disk
+    reopened = SnapshotStore(store.root)
+    assert reopened.asof('INFY/NS', datetime(2026, 10, 15))['close'] == 101
+
+
+def test_snapshots_are_write_once(store):
+    ts = datetime(2026, 10, 14, 9, 30)
+    path = store.put('INFY', {'timestamp': ts, 'close': 100})
+
+    with pytest.raises(FileExistsError):
+        store.put('INFY', {'timestamp': ts, 'close': 999})
+    assert store.load('INFY', ts)['close'] == 100
+    assert not os.stat(path).st_mode & 0o222
+    assert [name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')] == []
+
+
+def test_asof_does_not_rewalk_the_partition_tree(store, monkeypatch):
+    store.put('INFY', {'timestamp': datetime(2026, 10, 14, 9, 30), 'close': 100})
+    walks = []
+    subdirs = snapshot_store._subdirs
+    monkeypatch.setattr(snapshot_store, '_subdirs', lambda path: walks.append(path) or subdirs(path))
+
+    reader = SnapshotStore(store.root)
+    for _ in range(5):
+        assert reader.asof('INFY')['close'] == 100
+    assert walks == [reader.root, os.path.join(reader.root, '2026'),
+                     os.path.join(reader.root, '2026', '10')]
+
+    # Partitions other processes create later in the day are still found
+    now = datetime.now()
+    store.put('INFY', {'timestamp': now, 'close': 101})
+    assert reader.asof('INFY', now + timedelta(seconds=1))['close'] == 101
+    assert len(walks) == 3
@@ -0,0 +1,91 @@
+# tests/test_strategy_registry.py
+import importlib
+import sys
+from importlib import metadata
+
+import pytest
+
+import config.strategy_config
+from core import strategy_registry
+from core.strategy_registry import StrategyRegistry
+
+PLUGIN_SOURCE = '''
+LOADS = []
+
+
+class BreakoutStrategy:
+    FEATURES = ('close', 'high')
+
+    def __init__(self, lookback=20):
+        LOADS.append(lookback)
+        self.lookback = lookback
+
+    def analyze(self, data):
+        return {'score': self.lookback}
+'''
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    (tmp_path / 'swing_plugin_breakout.py').write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'swing_plugin_breakout'
+    sys.modules.pop('swing_plugin_breakout', None)
+
+
+def test_strategies_are_imported_on_first_use(plugin_module):
+    registry = StrategyRegistry(specs={}, enabled=None, entry_point_group=None)
+    registry.register('breakout', f'{plugin_module}:BreakoutStrategy',
+                      features=('close',), lookback=55)
+
+    assert registry.features() == {'close'}
+    assert plugin_module not in sys.modules
+    assert registry.loaded() == []
+
+    strategy = registry.get('breakout')
+    assert registry.get('breakout') is strategy
+    assert sys.modules[plugin_module].LOADS == [55]
+    assert registry.loaded() == ['breakout']
+
+
+def test_builtin_features_need_no_imports():
+    registry = StrategyRegistry(entry_point_group=None, enabled=['institutional', 'quant'])
+    assert registry.features() == {'symbol', 'close', 'fii_flows', 'oi_changes'}
+    assert registry.loaded() == []
+    with pytest.raises(KeyError):
+        registry.get('unknown')
+
+
+def test_swing_strategies_env_filters_enabled(monkeypatch):
+    # Reloading rebinds STRATEGY_CONFIG; keep the dict other modules imported
+    monkeypatch.setattr(config.strategy_config, 'STRATEGY_CONFIG',
+                        config.strategy_config.STRATEGY_CONFIG)
+    monkeypatch.setenv('SWING_STRATEGIES', ' quant, bogus ,wyckoff')
+    reloaded = importlib.reload(config.strategy_config).STRATEGY_CONFIG
+    assert reloaded['enabled'] == ['quant', 'bogus', 'wyckoff']
+
+    monkeypatch.setitem(strategy_registry.STRATEGY_CONFIG, 'enabled', reloaded['enabled'])
+    assert StrategyRegistry(entry_point_group=None).enabled == ['quant', 'wyckoff']
+
+    monkeypatch.delenv('SWING_STRATEGIES')
+    reloaded = importlib.reload(config.strategy_config).STRATEGY_CONFIG
+    assert reloaded['enabled'] is None
+    monkeypatch.setitem(strategy_registry.STRATEGY_CONFIG, 'enabled', reloaded['enabled'])
+    assert StrategyRegistry(entry_point_group=None).enabled == \
+        list(strategy_registry.BUILTIN_STRATEGIES)
+
+
+def test_entry_point_plugins_are_discovered(plugin_module, monkeypatch):
+    group = 'swing_trader_pro.strategies'
+    entry_points = [metadata.EntryPoint('breakout', f'{plugin_module}:BreakoutStrategy', group)]
+    monkeypatch.setattr(strategy_registry.metadata, 'entry_points',
+                        lambda group: entry_points if group == 'swing_trader_pro.strategies' else [])
+
+    registry = StrategyRegistry(enabled=['quant', 'breakout'], entry_point_group=group)
+
+    assert registry.enabled == ['quant', 'breakout']
+    assert plugin_module not in sys.modules
+    # Plugins declare features on the class, so reading them loads the plugin
+    assert registry.features() == {'close', 'high'}
+    assert registry.loaded() == ['breakout']
+    assert registry.get('breakout').analyze({}) == {'score': 20}
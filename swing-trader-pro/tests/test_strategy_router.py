@@ -0,0 +1,76 @@
+# tests/test_strategy_router.py
+import importlib
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from data.oi_chain_store import OIChainStore
+
+StrategyRouter = importlib.import_module(
+    'phases.2_signal_generation.strategy_router').StrategyRouter
+
+
+class Recorder:
+    def __init__(self):
+        self.seen = []
+
+    def analyze(self, symbol_data):
+        self.seen.append(symbol_data)
+        return None
+
+
+class FakeRegistry:
+    def __init__(self, strategies):
+        self.strategies = strategies
+        self.enabled = list(strategies)
+
+    def get(self, name):
+        return self.strategies[name]
+
+
+def chain(call_oi, put_oi):
+    return pd.DataFrame({'expiry': ['30-Oct-2026', '30-Oct-2026'],
+                         'strike': [100.0, 100.0],
+                         'type': ['CE', 'PE'],
+                         'oi': [call_oi, put_oi]})
+
+
+@pytest.fixture
+def store():
+    store = OIChainStore(None)
+    store.ingest('NIFTY', chain(100, 100), datetime(2026, 10, 15, 15, 0))
+    store.ingest('NIFTY', chain(120, 130), datetime(2026, 10, 16, 10, 0))
+    store.ingest('INFY', chain(10, 30), datetime(2026, 10, 16, 10, 0))
+    return store
+
+
+def test_router_fills_oi_changes_from_the_store(store):
+    recorder = Recorder()
+    router = StrategyRouter(FakeRegistry({'quant': recorder}), oi_store=store)
+
+    router.generate_signals({'symbol': 'INFY'})
+    router.generate_signals_many([{'symbol': 'INFY', 'oi_changes': {'pcr': 9.0}}],
+                                 fii_data={})
+
+    filled, overridden = recorder.seen
+    assert filled['oi_changes']['nifty_oi_pct_change'] == pytest.approx(0.25)
+    assert filled['oi_changes']['pcr'] == pytest.approx(3.0)
+    assert overridden['oi_changes']['pcr'] == 9.0
+    assert overridden['oi_changes']['nifty_oi_pct_change'] == pytest.approx(0.25)
+
+
+def test_institutional_strategy_reuses_the_router_hedge_check(store):
+    from core.strategy_registry import StrategyRegistry
+
+    router = StrategyRouter(StrategyRegistry(enabled=['institutional'], entry_point_group=None),
+                            oi_store=store)
+    router.update_sector_flows({'IT': -6e7})
+    symbol_data = {'symbol': 'INFY', 'close': [1450.0, 1500.0],
+                   'fii_flows': {'net_3day': 5e8, 'net_cash': 1e8, 'net_fno': 1e8}}
+
+    signal = router.generate_signals(symbol_data)['institutional']
+
+    assert router.registry.get('institutional').hedge_detector is None
+    assert signal['reason'] == 'hedged_flow'  # the router's sector flows were used
+    assert signal['entry'] == 1500.0
@@ -0,0 +1,76 @@
+# tests/test_swings.py
+import numpy as np
+import pytest
+
+from technicals.swings import SwingDetector, find_swings, swing_masks
+
+
+def random_walk(n=400, seed=5):
+    rng = np.random.default_rng(seed)
+    # Rounded so flat steps (plateaus) show up alongside strict swings
+    return np.round(100 + np.cumsum(rng.normal(0, 1, n)), 0)
+
+
+def assert_same_swings(expected, actual):
+    for e, a in zip(expected, actual):
+        np.testing.assert_array_equal(e, a)
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'pct': 0.03}, {'atr_mult': 1.5},
+                                    {'pct': 0.02, 'atr_mult': 1.0}])
+def test_detector_matches_find_swings(kwargs):
+    values = random_walk()
+    atr = np.abs(np.random.default_rng(1).normal(2, 0.5, len(values)))
+    atr[:14] = np.nan
+    if 'atr_mult' not in kwargs:
+        atr = None
+
+    expected = find_swings(values, atr=atr, **kwargs)
+    detector = SwingDetector.from_series(values, atr=atr, **kwargs)
+
+    assert detector.count == len(values)
+    assert_same_swings(expected, detector.swings)
+    # Bar by bar, the detector agrees with a full rescan of the prefix
+    detector = SwingDetector(**kwargs)
+    for i, value in enumerate(values[:120]):
+        detector.update(value, None if atr is None else atr[i])
+        prefix_atr = None if atr is None else atr[:i + 1]
+        assert_same_swings(find_swings(values[:i + 1], atr=prefix_atr, **kwargs),
+                           detector.swings)
+
+
+def test_filter_alternates_and_respects_threshold():
+    values = random_walk()
+    peaks, troughs = find_swings(values, pct=0.03)
+    kinds = sorted([(i, 'p') for i in peaks] + [(i, 't') for i in troughs])
+    assert all(a[1] != b[1] for a, b in zip(kinds, kinds[1:]))
+    confirmed = [i for i, _ in kinds]
+    for prev, cur in zip(confirmed, confirmed[1:]):
+        assert abs(values[cur] - values[prev]) >= abs(values[prev]) * 0.03
+
+
+@pytest.mark.parametrize('values', [[1, 2, 2, 1], [3, 1, 1, 3], [5, 5, 5, 5]])
+def test_plateaus_are_not_swings(values):
+    peaks, troughs = find_swings(values)
+    assert peaks.size == 0 and troughs.size == 0
+    assert_same_swings((peaks, troughs), SwingDetector.from_series(values).swings)
+
+
+@pytest.mark.parametrize('values', [[], [1.0], [1.0, 2.0], [1.0, 2.0, 1.0]])
+def test_short_series(values):
+    peaks, troughs = find_swings(values, pct=0.01)
+    detector = SwingDetector.from_series(values, pct=0.01)
+    assert_same_swings((peaks, troughs), detector.swings)
+    expected_peaks = [1] if len(values) == 3 else []
+    np.testing.assert_array_equal(peaks, expected_peaks)
+    assert troughs.size == 0
+
+
+def test_masks_work_on_a_panel():
+    panel = np.vstack([random_walk(seed=s) for s in range(4)])
+    is_peak, is_trough = swing_masks(panel)
+    for row, peak_row, trough_row in zip(panel, is_peak, is_trough):
+        peaks, troughs = find_swings(row)
+        np.testing.assert_array_equal(np.flatnonzero(peak_row), peaks)
+        np.testing.assert_array_equal(np.flatnonzero(trough_row), troughs)
+    assert not (is_peak[:, [0, -1]] | is_trough[:, [0, -1]]).any()
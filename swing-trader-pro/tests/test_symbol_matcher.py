@@ -0,0 +1,55 @@
+# tests/test_symbol_matcher.py
+import pytest
+
+from core.symbol_matcher import SymbolMatcher
+
+UNIVERSE = ['SBIN', 'LT', 'SUNPHARMA', 'ITC', 'TCS', 'M&M', 'TECHM', 'HDFCBANK']
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SymbolMatcher(UNIVERSE)
+
+
+@pytest.mark.parametrize('text,expected', [
+    ('SBI hikes lending rates', {'SBIN'}),
+    ('State Bank of India Q2 profit beats estimates', {'SBIN'}),
+    # Names of other listed companies that start with a tracked alias
+    ('SBI Life Q2 profit rises 20%', set()),
+    ('SBI Cards and Payment Services shares slump', set()),
+    ('sbi card adds 1 million customers', set()),
+    ('L&T Finance raises Rs 2,000 crore', set()),
+    ('Sun Pharma Advanced Research trial fails', set()),
+    # ...but a separate mention in the same text still counts
+    ('SBI, SBI Life shares fall after RBI policy', {'SBIN'}),
+    ('L&T Finance rallies; L&T wins metro order', {'LT'}),
+    # Whole words only, case-insensitive
+    ('Switch to ITC? Analysts split', {'ITC'}),
+    ('tcs and itc lead gains', {'TCS', 'ITC'}),
+    ('Mahindra & Mahindra and Tech Mahindra report results', {'M&M', 'TECHM'}),
+    ('HDFC Life and HDFC AMC slip', set()),
+])
+def test_match_precision(matcher, text, expected):
+    assert matcher.match(text) == expected
+
+
+def test_nested_names_when_both_are_tracked():
+    matcher = SymbolMatcher(['SBIN', 'SBILIFE'])
+    assert matcher.match('SBI Life Insurance gains') == {'SBILIFE'}
+    assert list(matcher.find('SBI and SBI Life')) == [('SBIN', 0, 3), ('SBILIFE', 8, 16)]
+
+
+def test_shared_alias_matches_every_owner():
+    matcher = SymbolMatcher(['A', 'B'], aliases={'A': ['Acme Group'], 'B': ['Acme Group']})
+    assert matcher.match('Acme Group posts loss') == {'A', 'B'}
+
+
+def test_index_maps_articles_to_symbols(matcher):
+    articles = [{'title': 'SBI Life rallies', 'summary': 'State Bank of India unit'},
+                {'title': 'L&T Finance slumps', 'summary': None},
+                {'title': 'TCS wins deal'}]
+    index = matcher.index(articles)
+    assert set(index) == set(UNIVERSE)
+    assert index['SBIN'] == [articles[0]]
+    assert index['LT'] == []
+    assert index['TCS'] == [articles[2]]
@@ -0,0 +1,58 @@
+# tests/test_trend_classifier.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from core.strategy_registry import StrategySpec
+
+TrendClassifier = StrategySpec(
+    'phases.2_signal_generation.trend_classifier:TrendClassifier').load()
+
+FACTORS = ['wyckoff_phase', 'ma_status', 'structure', 'volume_confirmation', 'momentum']
+SCORES = ['wyckoff_score', 'ma_score', 'structure_score', 'volume_score', 'momentum_score']
+
+
+@pytest.fixture
+def panel():
+    panel = synthetic.generate_panel(40, 1, seed=11)
+    close, volume = panel['close'].copy(), panel['volume'].copy()
+    close[0, :-30] = np.nan      # short history
+    volume[0, :-30] = np.nan
+    close[1, -10] = np.nan       # gap inside the window
+    return {'symbols': panel['symbols'], 'close': close, 'volume': volume}
+
+
+def test_classify_many_matches_classify(panel):
+    classifier = TrendClassifier()
+    many = classifier.classify_many(panel)
+
+    for i, symbol in enumerate(panel['symbols'][2:], start=2):
+        single = classifier.classify({'symbol': symbol, 'close': panel['close'][i],
+                                      'volume': panel['volume'][i]})
+        row = many.loc[symbol]
+        assert pd.isna(row['error'])
+        for column in FACTORS:
+            assert row[column] == single[column], (symbol, column)
+        assert row['wyckoff_score'] == single['wyckoff_score']
+        for column in SCORES[1:]:
+            assert row[column] == single['details'][column], (symbol, column)
+        assert row['composite_score'] == pytest.approx(single['composite_score'])
+
+
+def test_insufficient_rows_carry_no_factors(panel):
+    classifier = TrendClassifier()
+    many = classifier.classify_many(panel)
+
+    short = panel['close'][0]
+    single = classifier.classify({'symbol': 'SYM0000', 'close': short[~np.isnan(short)],
+                                  'volume': panel['volume'][0][~np.isnan(short)]})
+    assert single['composite_score'] == 0 and single['details'] == {}
+
+    for symbol in ('SYM0000', 'SYM0001'):
+        row = many.loc[symbol]
+        assert row['error'] == single['error']
+        assert row['composite_score'] == 0
+        assert all(row[column] is None for column in FACTORS)
+        assert row[SCORES].isna().all()
+    assert many.drop(index=['SYM0000', 'SYM0001'])[FACTORS + SCORES].notna().all().all()
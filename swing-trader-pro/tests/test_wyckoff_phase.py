@@ -0,0 +1,67 @@
+# tests/test_wyckoff_phase.py
+import numpy as np
+import pytest
+
+from phases.morning_screening.wyckoff_phase import WyckoffAnalyzer
+from strategies.wyckoff.accumulation import WyckoffAccumulationStrategy
+from strategies.wyckoff.distribution import WyckoffDistributionStrategy
+
+
+def price_data(n=150, seed=9):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.015, n))
+    volumes = rng.lognormal(12, 0.4, n)
+    volumes[::17] = 0.0
+    return {'close': closes, 'volume': volumes}
+
+
+def prefix(data, end):
+    return {key: values[:end] for key, values in data.items()}
+
+
+@pytest.mark.parametrize('window,band', [(30, 10), (20, 20), (8, 12), (4, 3)])
+def test_detect_series_matches_detect_per_bar(window, band):
+    data = price_data()
+    analyzer = WyckoffAnalyzer(window=window, band=band)
+    series = analyzer.detect_series(data)
+
+    assert not series['valid'][:window - 1].any()
+    assert all(phase is None for phase in series['phase'][:window - 1])
+    assert np.isnan(series['score'][:window - 1]).all()
+    for t in range(window - 1, len(data['close'])):
+        single = analyzer.detect(prefix(data, t + 1))
+        assert series['valid'][t]
+        assert series['phase'][t] == single['phase'], t
+        assert series['score'][t] == single['score']
+        assert series['support'][t] == single['support']
+        assert series['resistance'][t] == single['resistance']
+
+
+def test_detect_series_short_input():
+    series = WyckoffAnalyzer(window=30).detect_series(prefix(price_data(), 10))
+    assert len(series['phase']) == 10
+    assert not series['valid'].any()
+    assert np.isnan(series['support']).all()
+
+
+@pytest.mark.parametrize('strategy_cls,phase', [
+    (WyckoffAccumulationStrategy, 'accumulation'),
+    (WyckoffDistributionStrategy, 'distribution'),
+])
+def test_analyze_series_matches_analyze(strategy_cls, phase):
+    data = price_data(seed=21)
+    strategy = strategy_cls(window=20, band=10)
+    series = strategy.analyze_series(data)
+
+    assert series['signal'].any() and not series['signal'].all()
+    for t in range(len(data['close'])):
+        single = strategy.analyze(prefix(data, t + 1))
+        if single is None:
+            assert not series['signal'][t], t
+            assert np.isnan(series['entry'][t])
+            continue
+        assert series['signal'][t], t
+        for key in ('entry', 'sl', 'target', 'score'):
+            assert series[key][t] == pytest.approx(single[key])
+        if phase == 'distribution':
+            assert series['direction'][t] == single['direction'] == 'short'